@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Batch Ring Diagram Renderer
+Fans center projects out over a process pool; each worker loads the relationship data once
+"""
+
+import os
+import sys
+import time
+import argparse
+import matplotlib
+matplotlib.use('Agg')
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from link_matrix import open_link_matrix
+from link_windows import WINDOW_HELP, load_link_histogram, parse_window
+from ring_diagram_engine import DEFAULT_CSV_FILE, RingDiagramEngine
+from render_backends import DEFAULT_BACKEND, RENDER_BACKENDS, check_backend
+from render_cache import DEFAULT_CACHE_DIR, RenderCache
+from stage_trace import traced
+
+# Engine built once per worker process by init_worker()
+_engine = None
+
+def init_worker(csv_file, engine_kwargs, verbose=False, cache_dir=None):
+    """Load the relationship data once for this worker"""
+    global _engine
+    if not verbose:
+        # Keep the per-diagram progress output of every worker out of the timing report
+        sys.stdout = open(os.devnull, 'w')
+    cache = RenderCache(cache_dir) if cache_dir else None
+    _engine = RingDiagramEngine.load(csv_file, cache=cache, **engine_kwargs)
+
+def render_center(center):
+    """Render one center diagram in a worker and report how long it took"""
+    start = time.perf_counter()
+    filename = _engine.generate(center)
+    return center, filename, time.perf_counter() - start
+
+@traced()
+def render_all(centers, csv_file=DEFAULT_CSV_FILE, workers=None, verbose=False, cache_dir=None, **engine_kwargs):
+    """Render every center across a process pool and return per-project timings"""
+    workers = workers or os.cpu_count() or 1
+    timings = []
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(csv_file, engine_kwargs, verbose, cache_dir)) as executor:
+        futures = [executor.submit(render_center, center) for center in centers]
+        for i, future in enumerate(as_completed(futures), 1):
+            center, filename, seconds = future.result()
+            timings.append((center, filename, seconds))
+            print(f"[{i}/{len(centers)}] {center:8s} {seconds:6.2f}s  {filename or 'not found in data'}")
+
+    return timings
+
+def main():
+    """Render ring diagrams for many center projects in parallel"""
+    parser = argparse.ArgumentParser(description='Render project ring diagrams in parallel')
+    parser.add_argument('centers', nargs='*', help='Center project keys (default: every project)')
+    parser.add_argument('--csv', default=DEFAULT_CSV_FILE, help='Project-to-project links CSV')
+    parser.add_argument('--window', help=WINDOW_HELP)
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--verbose', action='store_true', help='Show each worker\'s diagram output')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Render cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Render every diagram even if unchanged')
+    parser.add_argument('--backend', choices=list(RENDER_BACKENDS), default=DEFAULT_BACKEND,
+                        help='Render backend (svg or pdf write vector files to rasterize later)')
+    args = parser.parse_args()
+
+    try:
+        check_backend(args.backend)
+        window = None if args.window is None else parse_window(args.window)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if window is not None:
+        # Each worker builds its own window matrix from the histogram; it takes milliseconds
+        centers = args.centers or load_link_histogram().link_matrix(window).projects
+    else:
+        # Build the memory-mapped matrix before the workers start, so they all map one shared file
+        centers = args.centers or open_link_matrix(args.csv).projects
+
+    start = time.perf_counter()
+    cache_dir = None if args.no_cache else args.cache_dir
+    timings = render_all(centers, args.csv, args.workers, args.verbose, cache_dir, backend=args.backend,
+                         window=window)
+    elapsed = time.perf_counter() - start
+
+    generated = [t for t in timings if t[1]]
+    render_seconds = sum(t[2] for t in timings)
+
+    print(f"\n{'='*60}")
+    print(f"BATCH RENDER COMPLETED!")
+    print(f"Files generated: {len(generated)}/{len(centers)}")
+    print(f"Wall time: {elapsed:.1f}s  (render time {render_seconds:.1f}s across workers)")
+    if render_seconds:
+        print(f"Throughput ({args.backend}): {len(timings) / render_seconds:.2f} diagrams/s per core")
+    if cache_dir:
+        cache = RenderCache(cache_dir)
+        print(f"Render cache: {len(cache.entries)} entries ({cache.total_bytes() / 1024**2:.1f} MB)")
+    print(f"{'='*60}")
+
+    print("\nSlowest projects:")
+    for center, filename, seconds in sorted(timings, key=lambda t: t[2], reverse=True)[:10]:
+        print(f"  {center:8s} {seconds:6.2f}s")
+
+if __name__ == "__main__":
+    main()
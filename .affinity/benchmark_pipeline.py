@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Affinity Pipeline Benchmark
+Times every pipeline stage on synthetic heavy-tailed link exports and writes the results as JSON
+"""
+
+import os
+import io
+import json
+import time
+import platform
+import argparse
+import tempfile
+from contextlib import redirect_stdout
+import pandas as pd
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+from heatmap_builder import build_heatmap_matrix, format_annotations
+from link_matrix import build_link_matrix
+from ring_classification import RingClassification
+from render_backends import RENDER_BACKENDS, available_backends, backend_extension
+from ring_diagram_engine import RingDiagramEngine
+from snapshot_store import LINK_COLUMNS, convert_export
+
+DEFAULT_PROJECT_COUNTS = (100, 1000, 10000)
+DEFAULT_LINK_COUNTS = (10000, 1000000)
+DEFAULT_OUTPUT_FILE = 'benchmark_results.json'
+DEFAULT_THROUGHPUT_QUANTILES = (0.5, 0.75, 0.9, 0.99)
+
+def project_keys(n_projects):
+    """Distinct upper-case project keys (AA, AB, ...), as long as needed for n_projects"""
+    length = 2
+    while 26 ** length < n_projects:
+        length += 1
+    codes = np.arange(n_projects)
+    letters = [np.char.mod('%c', 65 + codes // 26 ** power % 26) for power in range(length - 1, -1, -1)]
+    keys = letters[0]
+    for column in letters[1:]:
+        keys = np.char.add(keys, column)
+    return keys
+
+def synthetic_links(n_projects, n_links, alpha=1.1, self_link_share=0.05, seed=0):
+    """Project-to-project export for n_links issue links between n_projects projects.
+
+    Project popularity follows a Zipf-like law (a few hubs, a long tail of
+    projects with one or two links) and self_link_share of the issue links stay
+    inside their own project, like COR→COR. Issue links are aggregated into
+    one ProjectKey/ConnectedProject/LinkCount row per directed pair.
+    """
+    rng = np.random.default_rng(seed)
+    popularity = 1.0 / np.arange(1, n_projects + 1) ** alpha
+    popularity /= popularity.sum()
+
+    sources = rng.choice(n_projects, size=n_links, p=popularity)
+    targets = rng.choice(n_projects, size=n_links, p=popularity)
+    self_links = rng.random(n_links) < self_link_share
+    targets[self_links] = sources[self_links]
+
+    # Popularity rank should not follow the alphabet
+    keys = project_keys(n_projects)[rng.permutation(n_projects)]
+    pairs = pd.DataFrame({'ProjectKey': sources, 'ConnectedProject': targets}).value_counts(sort=False)
+    return pd.DataFrame({
+        'ProjectKey': keys[pairs.index.get_level_values(0)],
+        'ConnectedProject': keys[pairs.index.get_level_values(1)],
+        'LinkCount': pairs.to_numpy(),
+    })
+
+def render_center(link_matrix, quantile=0.9):
+    """A busy but typical center: the project at the given degree quantile"""
+    degrees = link_matrix.degrees()
+    order = np.argsort(degrees, kind='stable')
+    return link_matrix.projects[order[min(len(order) - 1, int(quantile * len(order)))]]
+
+def backend_throughput(engine, centers, work_dir, backends):
+    """Diagrams per second per core for each render backend, rendering the same centers in this process.
+
+    CPU time of this single process is the per-core cost; unavailable
+    backends are recorded with an error instead of numbers.
+    """
+    results, previous = {}, engine.backend
+    metrics = [engine.center_metrics(center) for center in centers]
+    for backend in backends:
+        if backend not in available_backends():
+            results[backend] = {'error': 'not available in this environment'}
+            print(f"  {'render/' + backend:16s} not available")
+            continue
+
+        engine.backend = backend
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        sizes = 0
+        with redirect_stdout(io.StringIO()):
+            for center_metrics in metrics:
+                name = os.path.splitext(center_metrics['filename'])[0]
+                output_file = os.path.join(work_dir, f'{name}.{backend_extension(backend)}')
+                engine.render(center_metrics, output_file)
+                sizes += os.path.getsize(output_file)
+                os.remove(output_file)
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+        results[backend] = {
+            'diagrams': len(metrics),
+            'seconds': round(wall, 6),
+            'cpu_seconds': round(cpu, 6),
+            'diagrams_per_sec_per_core': round(len(metrics) / cpu, 4) if cpu else None,
+            'mean_file_kb': round(sizes / len(metrics) / 1024, 1) if metrics else None,
+        }
+        print(f"  {'render/' + backend:16s} {len(metrics) / cpu if cpu else 0:10.4f} diagrams/s/core")
+    engine.backend = previous
+    return results
+
+class StageTimer:
+    """Best-of-N wall time per named stage, recording failures instead of stopping the run"""
+
+    def __init__(self, repeat=1):
+        self.repeat = repeat
+        self.stages = {}
+
+    def run(self, name, func, *args, **kwargs):
+        """Time func(*args, **kwargs) and return its last result (None if it failed)"""
+        best, result = None, None
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except MemoryError as e:
+                self.stages[name] = {'error': f'{type(e).__name__}: {e}'}
+                print(f"  {name:16s} failed: {type(e).__name__}")
+                return None
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        self.stages[name] = {'seconds': round(best, 6)}
+        print(f"  {name:16s} {best:10.4f} s")
+        return result
+
+def benchmark_case(n_projects, n_links, work_dir, repeat=1, render=True, seed=0, backends=()):
+    """Time every stage for one synthetic export; returns the case record"""
+    print(f"\n{n_projects:,} projects, {n_links:,} issue links")
+    df = synthetic_links(n_projects, n_links, seed=seed)
+    csv_file = os.path.join(work_dir, f'links_{n_projects}_{n_links}.csv')
+    df.to_csv(csv_file, index=False)
+
+    timer = StageTimer(repeat)
+    throughput = None
+    raw = timer.run('parse', pd.read_csv, csv_file)
+    typed = timer.run('snapshot_convert', convert_export, raw)[LINK_COLUMNS]
+    link_matrix = timer.run('matrix_build', build_link_matrix, typed)
+    if link_matrix is not None:
+        timer.run('classification', RingClassification, link_matrix)
+    heatmap = timer.run('heatmap_matrix', build_heatmap_matrix, typed, top_n=30)
+    if heatmap is not None:
+        timer.run('heatmap_annotate', format_annotations, heatmap[0])
+
+    if render and link_matrix is not None:
+        engine = timer.run('engine_build', RingDiagramEngine, typed, link_matrix=link_matrix)
+        if engine is not None:
+            center = render_center(link_matrix)
+            metrics = timer.run('ring_metrics', engine.center_metrics, center)
+            pos = timer.run('layout', engine.ring_layout, metrics)
+
+            # Drawing and saving consume the figure, so they are timed together per repeat
+            output_file = os.path.join(work_dir, f'{center}.png')
+            draw, save = [], []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                engine.draw_figure(metrics, pos)
+                middle = time.perf_counter()
+                engine.save_figure(output_file)
+                draw.append(middle - start)
+                save.append(time.perf_counter() - middle)
+            timer.stages['draw'] = {'seconds': round(min(draw), 6)}
+            timer.stages['savefig'] = {'seconds': round(min(save), 6)}
+            print(f"  {'draw':16s} {min(draw):10.4f} s  ({center}, {metrics['center_count']} neighbors)")
+            print(f"  {'savefig':16s} {min(save):10.4f} s")
+
+            if backends:
+                centers = sorted({render_center(link_matrix, q) for q in DEFAULT_THROUGHPUT_QUANTILES})
+                throughput = backend_throughput(engine, centers, work_dir, backends)
+
+    os.remove(csv_file)
+    case = {
+        'projects': n_projects,
+        'issue_links': n_links,
+        'rows': len(df),
+        'self_link_rows': int((df['ProjectKey'] == df['ConnectedProject']).sum()),
+        'stages': timer.stages,
+    }
+    if throughput is not None:
+        case['backends'] = throughput
+    return case
+
+def environment():
+    """Interpreter and library versions the numbers were measured with"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+        'render_backends': available_backends(),
+    }
+
+def main():
+    """Run the benchmark grid and write the JSON results"""
+    parser = argparse.ArgumentParser(description='Benchmark the affinity pipeline on synthetic link exports')
+    parser.add_argument('--projects', type=int, nargs='+', default=list(DEFAULT_PROJECT_COUNTS),
+                        help='Project counts to benchmark')
+    parser.add_argument('--links', type=int, nargs='+', default=list(DEFAULT_LINK_COUNTS),
+                        help='Issue link counts to benchmark')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per stage (best time is kept)')
+    parser.add_argument('--no-render', action='store_true', help='Skip the diagram stages')
+    parser.add_argument('--backends', nargs='*', choices=list(RENDER_BACKENDS), default=list(RENDER_BACKENDS),
+                        help='Render backends to measure diagram throughput for (none to skip)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic exports')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_FILE, help='JSON results file')
+    args = parser.parse_args()
+
+    results = {
+        'generated': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'environment': environment(),
+        'cases': [],
+    }
+    with tempfile.TemporaryDirectory() as work_dir:
+        for n_projects in args.projects:
+            for n_links in args.links:
+                results['cases'].append(benchmark_case(n_projects, n_links, work_dir, args.repeat,
+                                                       not args.no_render, args.seed, args.backends))
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nBenchmark results saved: {args.output}")
+
+if __name__ == "__main__":
+    main()
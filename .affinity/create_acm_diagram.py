@@ -4,23 +4,23 @@ Generate ACM-Centered Project Affinity Diagram
 Based on the working TOKR template
 """
 
-import pandas as pd
 import networkx as nx
 import matplotlib.pyplot as plt
 import numpy as np
 import os
 import sys
 from pathlib import Path
+from snapshot_store import LINK_COLUMNS, load_export
 
 def load_project_data(csv_file):
     """Load and process project relationship data"""
     print(f"Loading data from {csv_file}...")
     
     # Load the CSV data
-    df = pd.read_csv(csv_file)
+    df = load_export(csv_file, LINK_COLUMNS)
     
     # Group by ProjectKey and sum LinkCount for total connections
-    project_totals = df.groupby('ProjectKey')['LinkCount'].sum().reset_index()
+    project_totals = df.groupby('ProjectKey', observed=True)['LinkCount'].sum().reset_index()
     project_totals.columns = ['ProjectKey', 'TotalLinks']
     
     print(f"Found {len(project_totals)} unique projects")
@@ -11,18 +11,19 @@ import numpy as np
 from collections import defaultdict
 import seaborn as sns
 from matplotlib.patches import Circle
+from snapshot_store import LINK_COLUMNS, load_export
 import warnings
 warnings.filterwarnings('ignore')
 
 def load_project_data(csv_file):
     """Load and process the project relationship data"""
-    df = pd.read_csv(csv_file)
+    df = load_export(csv_file, LINK_COLUMNS)
     
     # Clean up the data
     df['LinkCount'] = pd.to_numeric(df['LinkCount'], errors='coerce').fillna(0)
     
     # Create project summary (group by ProjectKey and sum LinkCount)
-    project_summary = df.groupby('ProjectKey')['LinkCount'].sum().reset_index()
+    project_summary = df.groupby('ProjectKey', observed=True)['LinkCount'].sum().reset_index()
     project_summary = project_summary.sort_values('LinkCount', ascending=False)
     
     print(f"Found {len(project_summary)} unique projects")
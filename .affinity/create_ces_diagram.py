@@ -4,10 +4,11 @@ Create CES-Centered Diagram with Proper Naming Convention
 Based on the working TOKR script - EXACT COPY with CES substituted for TOKR
 """
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
+from link_matrix import build_pair_index
+from snapshot_store import LINK_COLUMNS, load_export
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -15,6 +16,7 @@ def create_ces_centered_diagram(relationships_df, output_file='ces_centered_diag
     """Create a CES-centered radial affinity diagram with ring layout and professional styling."""
 
     G = nx.Graph()
+    pair_index = build_pair_index(relationships_df)
 
     # First, calculate total link counts for each project
     project_totals = {}
@@ -96,6 +98,11 @@ def create_ces_centered_diagram(relationships_df, output_file='ces_centered_diag
     print(f"CES filtered connections: {len(center_hub_connections + center_high_connections + center_medium_connections + center_low_connections)}")
     print(f"  Hub (6+): {len(center_hub_connections)}, High (4-5): {len(center_high_connections)}, Medium (2-3): {len(center_medium_connections)}, Low (1): {len(center_low_connections)}")
 
+    # Metrics-only pass: ring counts for the filename and weighted sum, without rasterizing
+    if output_file is None:
+        plt.close()
+        return G, len(center_hub_connections), len(center_high_connections), len(center_medium_connections), len(center_low_connections), ces_connections
+
     # Create positioning with proper concentric rings
     pos = {}
 
@@ -283,12 +290,7 @@ def create_ces_centered_diagram(relationships_df, output_file='ces_centered_diag
         circle_number = project_connection_counts.get(project, 1)
         
         # Get CES links (column 3)
-        ces_links = 0
-        for _, row in relationships_df.iterrows():
-            if ((row['ProjectKey'] == 'CES' and row['ConnectedProject'] == project) or 
-                (row['ProjectKey'] == project and row['ConnectedProject'] == 'CES')):
-                ces_links = row['LinkCount']
-                break
+        ces_links = pair_index.weight('CES', project)
         
         return (circle_number, ces_links)  # Positive for ascending order, then reverse
     
@@ -299,18 +301,10 @@ def create_ces_centered_diagram(relationships_df, output_file='ces_centered_diag
     
     for project, connections in center_neighbors:
         # Get the specific link count between CES and this project
-        ces_to_project_links = 0
-        for _, row in relationships_df.iterrows():
-            if ((row['ProjectKey'] == 'CES' and row['ConnectedProject'] == project) or 
-                (row['ProjectKey'] == project and row['ConnectedProject'] == 'CES')):
-                ces_to_project_links = row['LinkCount']
-                break
+        ces_to_project_links = pair_index.weight('CES', project)
         
         # Get total project connections (sum of all links for this project)
-        total_project_connections = 0
-        for _, row in relationships_df.iterrows():
-            if row['ProjectKey'] == project or row['ConnectedProject'] == project:
-                total_project_connections += row['LinkCount']
+        total_project_connections = pair_index.total(project)
         
         # Determine ring color based on connections
         if connections >= 15:  # Hub
@@ -363,18 +357,10 @@ def create_ces_centered_diagram(relationships_df, output_file='ces_centered_diag
     
     for project, connections in center_neighbors:
         # Get the specific link count between CES and this project
-        ces_to_project_links = 0
-        for _, row in relationships_df.iterrows():
-            if ((row['ProjectKey'] == 'CES' and row['ConnectedProject'] == project) or 
-                (row['ProjectKey'] == project and row['ConnectedProject'] == 'CES')):
-                ces_to_project_links = row['LinkCount']
-                break
+        ces_to_project_links = pair_index.weight('CES', project)
         
         # Get total project connections (sum of all links for this project)
-        total_project_connections_for_this = 0
-        for _, row in relationships_df.iterrows():
-            if row['ProjectKey'] == project or row['ConnectedProject'] == project:
-                total_project_connections_for_this += row['LinkCount']
+        total_project_connections_for_this = pair_index.total(project)
         
         total_ces_links += ces_to_project_links
         total_project_connections += total_project_connections_for_this
@@ -396,6 +382,7 @@ def create_ces_centered_diagram(relationships_df, output_file='ces_centered_diag
         print(f"Error saving diagram: {e}")
         # Fallback save method
         plt.savefig(output_file, dpi=150, bbox_inches='tight')
+    plt.close()
 
     print(f"Diagram saved as: {output_file}")
 
@@ -406,7 +393,7 @@ def main():
     
     # Load data
     csv_file = '../.endpoints/Issue search/Issue Links - GET Project to Project Links - Filtered Unresolved 90Day - Anon - Official.csv'
-    relationships_df = pd.read_csv(csv_file)
+    relationships_df = load_export(csv_file, LINK_COLUMNS)
     
     print("Found", len(relationships_df), "project relationships")
     print("Total links:", relationships_df['LinkCount'].sum())
@@ -416,9 +403,8 @@ def main():
     print("="*60)
     
     # Create the diagram
-    temp_filename = 'ces_temp.png'
     G, hub_count, high_count, medium_count, low_count, ces_connections = create_ces_centered_diagram(
-        relationships_df, temp_filename)
+        relationships_df, None)
     
     if G is not None:
         # Calculate the actual direct connections shown in diagram
@@ -427,19 +413,12 @@ def main():
         # Calculate weighted sum based on ring counts: Hub*4 + High*3 + Medium*2 + Low*1
         weighted_sum = (hub_count * 4) + (high_count * 3) + (medium_count * 2) + (low_count * 1)
         
-        # Recreate the diagram with weighted_sum for the totals row
-        G, hub_count, high_count, medium_count, low_count, ces_connections = create_ces_centered_diagram(
-            relationships_df, temp_filename, weighted_sum)
-        
         # Create the enhanced filename with weighted sum at front, then ring counts
         proper_filename = f'{weighted_sum:04d}_{center_count:04d}_{hub_count:04d}_{high_count:04d}_{medium_count:04d}_{low_count:04d}_CES.png'
         
-        # Rename the file with error handling
-        import os
-        if os.path.exists(temp_filename):
-            if os.path.exists(proper_filename):
-                os.remove(proper_filename)  # Remove existing file
-            os.rename(temp_filename, proper_filename)
+        # Draw the diagram once, with weighted_sum for the totals row, under its final name
+        G, hub_count, high_count, medium_count, low_count, ces_connections = create_ces_centered_diagram(
+            relationships_df, proper_filename, weighted_sum)
         
         print(f"\nCES-CENTERED PROJECT AFFINITY ANALYSIS SUMMARY")
         center_connections = list(G.neighbors('CES'))
@@ -8,18 +8,20 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
+from link_matrix import build_pair_index
+from snapshot_store import LINK_COLUMNS, load_export
 import warnings
 warnings.filterwarnings('ignore')
 
 def load_project_data(csv_file):
     """Load and process the project relationship data"""
-    df = pd.read_csv(csv_file)
+    df = load_export(csv_file, LINK_COLUMNS)
     
     # Clean up the data
     df['LinkCount'] = pd.to_numeric(df['LinkCount'], errors='coerce').fillna(0)
     
     # Create project summary (group by ProjectKey and sum LinkCount)
-    project_summary = df.groupby('ProjectKey')['LinkCount'].sum().reset_index()
+    project_summary = df.groupby('ProjectKey', observed=True)['LinkCount'].sum().reset_index()
     project_summary = project_summary.sort_values('LinkCount', ascending=False)
     
     print(f"Found {len(project_summary)} unique projects")
@@ -31,6 +33,7 @@ def create_cia_centered_diagram(relationships_df, output_file='cia_centered_diag
     """Create a CIA-centered radial affinity diagram with ring layout and professional styling."""
 
     G = nx.Graph()
+    pair_index = build_pair_index(relationships_df)
 
     # First, calculate total link counts for each project
     project_totals = {}
@@ -282,25 +285,15 @@ def create_cia_centered_diagram(relationships_df, output_file='cia_centered_diag
     table_lines.append(header)
     
     # Sort projects by circle number (descending), then by CIA links (descending)
-    sorted_projects = sorted(cia_connections, key=lambda x: (project_connection_counts.get(x, 0), 
-                                                           sum(relationships_df[(relationships_df['ProjectKey'] == 'CIA') & 
-                                                                               (relationships_df['ConnectedProject'] == x)]['LinkCount'].tolist()) if len(relationships_df[(relationships_df['ProjectKey'] == 'CIA') & (relationships_df['ConnectedProject'] == x)]) > 0 else 
-                                                           sum(relationships_df[(relationships_df['ProjectKey'] == x) & 
-                                                                               (relationships_df['ConnectedProject'] == 'CIA')]['LinkCount'].tolist()) if len(relationships_df[(relationships_df['ProjectKey'] == x) & (relationships_df['ConnectedProject'] == 'CIA')]) > 0 else 0), reverse=True)
+    sorted_projects = sorted(cia_connections, key=lambda x: (project_connection_counts.get(x, 0),
+                                                           pair_index.weight('CIA', x)), reverse=True)
     
     for project in sorted_projects:
         # Get CIA to project links
-        cia_to_project_links = 0
-        for _, row in relationships_df.iterrows():
-            if (row['ProjectKey'] == 'CIA' and row['ConnectedProject'] == project) or \
-               (row['ProjectKey'] == project and row['ConnectedProject'] == 'CIA'):
-                cia_to_project_links += row['LinkCount']
+        cia_to_project_links = pair_index.weight('CIA', project)
         
         # Get total project connections
-        total_project_connections = 0
-        for _, row in relationships_df.iterrows():
-            if row['ProjectKey'] == project or row['ConnectedProject'] == project:
-                total_project_connections += row['LinkCount']
+        total_project_connections = pair_index.total(project)
         
         # Get the number that appears inside the circle (project_connection_counts)
         circle_number = project_connection_counts.get(project, 1)
@@ -356,7 +349,7 @@ def main():
     
     # Load data
     csv_file = '../.endpoints/Issue search/Issue Links - GET Project to Project Links - Final Filtered - Exclude ORL TOKR RC - Anon - Official.csv'
-    relationships_df = pd.read_csv(csv_file)
+    relationships_df = load_export(csv_file, LINK_COLUMNS)
     
     print("Found", len(relationships_df), "project relationships")
     print("Total links:", relationships_df['LinkCount'].sum())
@@ -405,15 +398,12 @@ def main():
             print(f"CIA Low Connections: {len([n for n in center_connections if project_connection_counts.get(n, 0) == 1])}")
             
             print(f"\nCIA's Top Connected Projects:")
+            pair_index = build_pair_index(relationships_df)
             center_neighbors = [(n, G.nodes[n]['link_count']) for n in center_connections]
             center_neighbors.sort(key=lambda x: x[1], reverse=True)
             for j, (project, count) in enumerate(center_neighbors[:15], 1):
                 # Get the specific link count between CIA and this project
-                cia_to_project_links = 0
-                for _, row in relationships_df.iterrows():
-                    if (row['ProjectKey'] == 'CIA' and row['ConnectedProject'] == project) or \
-                       (row['ProjectKey'] == project and row['ConnectedProject'] == 'CIA'):
-                        cia_to_project_links += row['LinkCount']
+                cia_to_project_links = pair_index.weight('CIA', project)
                 
                 print(f"{j:2d}. {project:8s} - {cia_to_project_links:3d} links to CIA, {count:4d} total links")
         else:
@@ -4,58 +4,60 @@ Create Project Connection Heatmap
 Generates interactive and static heatmap visualizations of project relationships
 """
 
-import pandas as pd
+import argparse
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from collections import defaultdict
+from heatmap_builder import format_annotations
+from link_matrix import open_link_matrix
+from link_windows import WINDOW_HELP, load_window, parse_window, window_scope
+from render_backends import DEFAULT_BACKEND, RENDER_BACKENDS, check_backend, save_figure, with_extension
+from render_cache import RenderCache
+from snapshot_store import LINK_COLUMNS, load_export
+from stage_trace import traced
 import warnings
 warnings.filterwarnings('ignore')
 
-def load_and_process_data():
-    """Load and process the connection data for heatmap creation"""
-    csv_file = '../.endpoints/Issue search/Issue Links - GET Project to Project Links - Filtered Unresolved 90Day - Anon - Official.csv'
-    df = pd.read_csv(csv_file)
+DEFAULT_CSV_FILE = '../.endpoints/Issue search/Issue Links - GET Project to Project Links - Filtered Unresolved 90Day - Anon - Official.csv'
+# Which links the default CSV holds, for the full heatmap's title
+DEFAULT_SCOPE = 'Unresolved Issues (90-Day Activity)'
 
-    print(f"Processing {len(df)} relationship records...")
-
-    # Get all unique projects
-    all_projects = set()
-    for _, row in df.iterrows():
-        all_projects.add(row['ProjectKey'])
-        all_projects.add(row['ConnectedProject'])
-
-    all_projects = sorted(list(all_projects))
-    print(f"Found {len(all_projects)} unique projects")
-
-    # Create connection matrix
-    connection_matrix = pd.DataFrame(0, index=all_projects, columns=all_projects)
-
-    for _, row in df.iterrows():
-        source = row['ProjectKey']
-        target = row['ConnectedProject']
-        links = row['LinkCount']
+@traced()
+def load_and_process_data(csv_file=DEFAULT_CSV_FILE, window=None):
+    """Load and process the connection data (or the detailed links inside a time window) for heatmap creation"""
+    if window is not None:
+        df, link_matrix, _ = load_window(window)
+    else:
+        df = load_export(csv_file, LINK_COLUMNS)
+        # Symmetric matrix from the memory-mapped artifact (built on first use)
+        link_matrix = open_link_matrix(csv_file)
 
-        # Fill both directions for symmetric matrix
-        connection_matrix.loc[source, target] = links
-        connection_matrix.loc[target, source] = links
-
-    # Calculate project totals for sorting
-    project_totals = {}
-    for project in all_projects:
-        project_totals[project] = connection_matrix.loc[project].sum()
+    print(f"Processing {len(df)} relationship records...")
+    print(f"Found {len(link_matrix)} unique projects")
+    connection_matrix = link_matrix.to_frame()
 
-    # Sort projects by total connections (descending)
-    sorted_projects = sorted(project_totals.items(), key=lambda x: x[1], reverse=True)
-    sorted_project_names = [p[0] for p in sorted_projects]
+    # Sort projects by total connections (descending), keeping alphabetical order for ties
+    row_totals = connection_matrix.sum(axis=1).sort_values(ascending=False, kind='stable')
+    project_totals = row_totals.to_dict()
+    sorted_projects = list(row_totals.items())
+    sorted_project_names = row_totals.index.tolist()
 
     # Reorder matrix by connectivity
     sorted_matrix = connection_matrix.reindex(index=sorted_project_names, columns=sorted_project_names)
 
     return sorted_matrix, project_totals, sorted_projects
 
-def create_full_heatmap(matrix, project_totals, output_file='project_connection_heatmap_full.png'):
+@traced()
+def create_full_heatmap(matrix, project_totals, output_file='project_connection_heatmap_full.png', cache=None, backend=DEFAULT_BACKEND,
+                        scope=DEFAULT_SCOPE):
     """Create full heatmap with all projects"""
+    output_file = with_extension(output_file, backend)
+
+    # Skip the render when the matrix is unchanged since the cached PNG
+    key = cache.key('full_heatmap', matrix, backend, scope) if cache else None
+    if key and cache.restore(key, output_file):
+        print(f"Full heatmap unchanged, reused cached: {output_file}")
+        return
 
     # Set up the plot
     plt.figure(figsize=(24, 20))
@@ -73,7 +75,7 @@ def create_full_heatmap(matrix, project_totals, output_file='project_connection_
                      linecolor='white')
 
     # Customize appearance
-    plt.title('OMF Project Connection Heatmap (All 98 Projects)\nLog Scale - Unresolved Issues (90-Day Activity)',
+    plt.title(f'OMF Project Connection Heatmap (All {len(matrix)} Projects)\nLog Scale - {scope}',
               fontsize=16, fontweight='bold', pad=20)
 
     # Rotate labels for better readability
@@ -85,12 +87,17 @@ def create_full_heatmap(matrix, project_totals, output_file='project_connection_
     ax.set_ylabel('Source Projects', fontsize=12, fontweight='bold')
 
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, backend, dpi=300, bbox_inches='tight', facecolor='white')
     print(f"Full heatmap saved: {output_file}")
     plt.close()
 
-def create_top_projects_heatmap(matrix, project_totals, top_n=30, output_file='project_connection_heatmap_top30.png'):
+    if cache:
+        cache.store(key, output_file)
+
+@traced()
+def create_top_projects_heatmap(matrix, project_totals, top_n=30, output_file='project_connection_heatmap_top30.png', cache=None, backend=DEFAULT_BACKEND):
     """Create focused heatmap with top N connected projects"""
+    output_file = with_extension(output_file, backend)
 
     # Get top N projects
     sorted_projects = sorted(project_totals.items(), key=lambda x: x[1], reverse=True)
@@ -99,6 +106,11 @@ def create_top_projects_heatmap(matrix, project_totals, top_n=30, output_file='p
     # Create subset matrix
     subset_matrix = matrix.loc[top_projects, top_projects]
 
+    key = cache.key('top_projects_heatmap', subset_matrix, top_n, backend) if cache else None
+    if key and cache.restore(key, output_file):
+        print(f"Top {top_n} heatmap unchanged, reused cached: {output_file}")
+        return
+
     # Set up the plot
     plt.figure(figsize=(16, 14))
 
@@ -106,19 +118,8 @@ def create_top_projects_heatmap(matrix, project_totals, top_n=30, output_file='p
     # Use log transform but show original values in annotations
     log_matrix = np.log1p(subset_matrix)
 
-    # Create annotations for non-zero values
-    annot_matrix = subset_matrix.copy()
-    annot_matrix = annot_matrix.astype(str)
-    annot_matrix[subset_matrix == 0] = ''
-
-    # For very large numbers, use abbreviated format
-    for i in range(len(subset_matrix)):
-        for j in range(len(subset_matrix.columns)):
-            val = subset_matrix.iloc[i, j]
-            if val >= 1000:
-                annot_matrix.iloc[i, j] = f'{val/1000:.1f}k'
-            elif val > 0:
-                annot_matrix.iloc[i, j] = str(int(val))
+    # Annotate non-zero values, abbreviating very large numbers
+    annot_matrix = format_annotations(subset_matrix)
 
     # Create heatmap with annotations
     ax = sns.heatmap(log_matrix,
@@ -143,20 +144,21 @@ def create_top_projects_heatmap(matrix, project_totals, top_n=30, output_file='p
     ax.set_ylabel('Source Projects', fontsize=12, fontweight='bold')
 
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+    save_figure(output_file, backend, dpi=300, bbox_inches='tight', facecolor='white')
     print(f"Top {top_n} heatmap saved: {output_file}")
     plt.close()
 
-def create_mega_connections_heatmap(matrix, project_totals, output_file='project_connection_heatmap_mega.png'):
+    if cache:
+        cache.store(key, output_file)
+
+@traced()
+def create_mega_connections_heatmap(matrix, project_totals, output_file='project_connection_heatmap_mega.png', cache=None, backend=DEFAULT_BACKEND):
     """Create heatmap focusing on mega-connections (100+ links)"""
+    output_file = with_extension(output_file, backend)
 
     # Find projects with connections >= 100
-    mega_projects = set()
-    for i in range(len(matrix)):
-        for j in range(len(matrix.columns)):
-            if matrix.iloc[i, j] >= 100:
-                mega_projects.add(matrix.index[i])
-                mega_projects.add(matrix.columns[j])
+    mega = matrix.to_numpy() >= 100
+    mega_projects = set(matrix.index[mega.any(axis=1)]) | set(matrix.columns[mega.any(axis=0)])
 
     mega_projects = sorted(list(mega_projects))
     print(f"Found {len(mega_projects)} projects with mega-connections (100+ links)")
@@ -165,25 +167,17 @@ def create_mega_connections_heatmap(matrix, project_totals, output_file='project
         # Create subset matrix
         mega_matrix = matrix.loc[mega_projects, mega_projects]
 
+        key = cache.key('mega_connections_heatmap', mega_matrix, backend) if cache else None
+        if key and cache.restore(key, output_file):
+            print(f"Mega-connections heatmap unchanged, reused cached: {output_file}")
+            return
+
         # Set up the plot
         plt.figure(figsize=(12, 10))
 
         # Use original values for mega connections
-        # Create annotations
-        annot_matrix = mega_matrix.copy()
-        annot_matrix = annot_matrix.astype(str)
-        annot_matrix[mega_matrix == 0] = ''
-
-        # Format large numbers
-        for i in range(len(mega_matrix)):
-            for j in range(len(mega_matrix.columns)):
-                val = mega_matrix.iloc[i, j]
-                if val >= 1000:
-                    annot_matrix.iloc[i, j] = f'{val/1000:.1f}k'
-                elif val >= 100:
-                    annot_matrix.iloc[i, j] = str(int(val))
-                elif val > 0:
-                    annot_matrix.iloc[i, j] = str(int(val))
+        # Create annotations, abbreviating large numbers
+        annot_matrix = format_annotations(mega_matrix)
 
         # Create heatmap
         ax = sns.heatmap(mega_matrix,
@@ -206,12 +200,17 @@ def create_mega_connections_heatmap(matrix, project_totals, output_file='project
         ax.set_ylabel('Source Projects', fontsize=12, fontweight='bold')
 
         plt.tight_layout()
-        plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+        save_figure(output_file, backend, dpi=300, bbox_inches='tight', facecolor='white')
         print(f"Mega-connections heatmap saved: {output_file}")
         plt.close()
 
-def create_summary_stats(matrix, project_totals):
+        if cache:
+            cache.store(key, output_file)
+
+@traced()
+def create_summary_stats(matrix, project_totals, output_file='project_network_summary_stats.png', backend=DEFAULT_BACKEND):
     """Create summary statistics visualization"""
+    output_file = with_extension(output_file, backend)
 
     plt.figure(figsize=(16, 12))
 
@@ -266,26 +265,41 @@ def create_summary_stats(matrix, project_totals):
 
     plt.suptitle('OMF Project Network Analysis - Summary Statistics', fontsize=16, fontweight='bold')
     plt.tight_layout()
-    plt.savefig('project_network_summary_stats.png', dpi=300, bbox_inches='tight', facecolor='white')
-    print("Summary statistics saved: project_network_summary_stats.png")
+    save_figure(output_file, backend, dpi=300, bbox_inches='tight', facecolor='white')
+    print(f"Summary statistics saved: {output_file}")
     plt.close()
 
 def main():
     """Generate all heatmap visualizations"""
+    parser = argparse.ArgumentParser(description='Generate the project connection heatmaps')
+    parser.add_argument('--csv', default=DEFAULT_CSV_FILE, help='Project-to-project links CSV')
+    parser.add_argument('--window', help=WINDOW_HELP)
+    parser.add_argument('--backend', choices=list(RENDER_BACKENDS), default=DEFAULT_BACKEND,
+                        help='Render backend (svg or pdf write vector files)')
+    args = parser.parse_args()
+
+    try:
+        backend = check_backend(args.backend)
+        window = None if args.window is None else parse_window(args.window)
+    except ValueError as e:
+        parser.error(str(e))
+
     print("Creating project connection heatmaps...")
 
     # Load and process data
-    matrix, project_totals, sorted_projects = load_and_process_data()
+    matrix, project_totals, sorted_projects = load_and_process_data(args.csv, window)
 
     print(f"Matrix shape: {matrix.shape}")
     print(f"Non-zero connections: {np.sum(matrix.values > 0):,}")
     print(f"Max connection: {matrix.values.max():,}")
 
-    # Create different heatmap views
-    create_full_heatmap(matrix, project_totals)
-    create_top_projects_heatmap(matrix, project_totals, top_n=30)
-    create_mega_connections_heatmap(matrix, project_totals)
-    create_summary_stats(matrix, project_totals)
+    # Create different heatmap views, reusing cached PNGs whose data has not changed
+    cache = RenderCache()
+    scope = DEFAULT_SCOPE if window is None else window_scope(window)
+    create_full_heatmap(matrix, project_totals, cache=cache, backend=backend, scope=scope)
+    create_top_projects_heatmap(matrix, project_totals, top_n=30, cache=cache, backend=backend)
+    create_mega_connections_heatmap(matrix, project_totals, cache=cache, backend=backend)
+    create_summary_stats(matrix, project_totals, backend=backend)
 
     # Print key insights
     print("\n" + "="*60)
@@ -293,10 +307,11 @@ def main():
     print("="*60)
 
     print(f"Generated 4 visualization files:")
-    print("1. project_connection_heatmap_full.png - All 98 projects")
-    print("2. project_connection_heatmap_top30.png - Top 30 projects with values")
-    print("3. project_connection_heatmap_mega.png - Mega-connections (100+ links)")
-    print("4. project_network_summary_stats.png - Statistical analysis")
+    print(f"1. {with_extension('project_connection_heatmap_full.png', backend)} - All {len(matrix)} projects")
+    print(f"2. {with_extension('project_connection_heatmap_top30.png', backend)} - Top 30 projects with values")
+    print(f"3. {with_extension('project_connection_heatmap_mega.png', backend)} - Mega-connections (100+ links)")
+    print(f"4. {with_extension('project_network_summary_stats.png', backend)} - Statistical analysis")
+    print(cache.summary())
 
     # Show top connections
     print(f"\nTop 10 Individual Connections:")
@@ -4,10 +4,11 @@ Create ENGOPS-Centered Diagram with Proper Naming Convention
 Based on the working TOKR script - EXACT COPY with ENGOPS substituted for TOKR
 """
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
+from link_matrix import build_pair_index
+from snapshot_store import LINK_COLUMNS, load_export
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -15,6 +16,7 @@ def create_cia_centered_diagram(relationships_df, output_file='cia_centered_diag
     """Create a ENGOPS-centered radial affinity diagram with ring layout and professional styling."""
 
     G = nx.Graph()
+    pair_index = build_pair_index(relationships_df)
 
     # First, calculate total link counts for each project
     project_totals = {}
@@ -85,6 +87,11 @@ def create_cia_centered_diagram(relationships_df, output_file='cia_centered_diag
     print(f"ENGOPS filtered connections: {len(center_hub_connections + center_high_connections + center_medium_connections + center_low_connections)}")
     print(f"  Hub (6+): {len(center_hub_connections)}, High (4-5): {len(center_high_connections)}, Medium (2-3): {len(center_medium_connections)}, Low (1): {len(center_low_connections)}")
 
+    # Metrics-only pass: ring counts for the filename and weighted sum, without rasterizing
+    if output_file is None:
+        plt.close()
+        return G, len(center_hub_connections), len(center_high_connections), len(center_medium_connections), len(center_low_connections), cia_connections
+
     pos = {}
     pos['ENGOPS'] = (0, 0)
 
@@ -237,12 +244,7 @@ def create_cia_centered_diagram(relationships_df, output_file='cia_centered_diag
         project = item[0]
         circle_number = project_connection_counts.get(project, 1)
         
-        cia_links = 0
-        for _, row in relationships_df.iterrows():
-            if ((row['ProjectKey'] == 'ENGOPS' and row['ConnectedProject'] == project) or 
-                (row['ProjectKey'] == project and row['ConnectedProject'] == 'ENGOPS')):
-                cia_links = row['LinkCount']
-                break
+        cia_links = pair_index.weight('ENGOPS', project)
         
         return (circle_number, cia_links)
     
@@ -251,17 +253,9 @@ def create_cia_centered_diagram(relationships_df, output_file='cia_centered_diag
     table_lines = []
     
     for project, connections in center_neighbors:
-        cia_to_project_links = 0
-        for _, row in relationships_df.iterrows():
-            if ((row['ProjectKey'] == 'ENGOPS' and row['ConnectedProject'] == project) or 
-                (row['ProjectKey'] == project and row['ConnectedProject'] == 'ENGOPS')):
-                cia_to_project_links = row['LinkCount']
-                break
+        cia_to_project_links = pair_index.weight('ENGOPS', project)
         
-        total_project_connections = 0
-        for _, row in relationships_df.iterrows():
-            if row['ProjectKey'] == project or row['ConnectedProject'] == project:
-                total_project_connections += row['LinkCount']
+        total_project_connections = pair_index.total(project)
         
         circle_number = project_connection_counts.get(project, 1)
         
@@ -297,17 +291,9 @@ def create_cia_centered_diagram(relationships_df, output_file='cia_centered_diag
     total_project_connections = 0
     
     for project, connections in center_neighbors:
-        cia_to_project_links = 0
-        for _, row in relationships_df.iterrows():
-            if ((row['ProjectKey'] == 'ENGOPS' and row['ConnectedProject'] == project) or 
-                (row['ProjectKey'] == project and row['ConnectedProject'] == 'ENGOPS')):
-                cia_to_project_links = row['LinkCount']
-                break
+        cia_to_project_links = pair_index.weight('ENGOPS', project)
         
-        total_project_connections_for_this = 0
-        for _, row in relationships_df.iterrows():
-            if row['ProjectKey'] == project or row['ConnectedProject'] == project:
-                total_project_connections_for_this += row['LinkCount']
+        total_project_connections_for_this = pair_index.total(project)
         
         total_cia_links += cia_to_project_links
         total_project_connections += total_project_connections_for_this
@@ -326,6 +312,7 @@ def create_cia_centered_diagram(relationships_df, output_file='cia_centered_diag
     except Exception as e:
         print(f"Error saving diagram: {e}")
         plt.savefig(output_file, dpi=150, bbox_inches='tight')
+    plt.close()
 
     print(f"Diagram saved as: {output_file}")
 
@@ -333,7 +320,7 @@ def create_cia_centered_diagram(relationships_df, output_file='cia_centered_diag
 
 def main():
     csv_file = '../.endpoints/Issue search/Issue Links - GET Project to Project Links - Filtered Unresolved 90Day - Anon - Official.csv'
-    relationships_df = pd.read_csv(csv_file)
+    relationships_df = load_export(csv_file, LINK_COLUMNS)
     
     print("Found", len(relationships_df), "project relationships")
     print("Total links:", relationships_df['LinkCount'].sum())
@@ -342,24 +329,17 @@ def main():
     print("Creating ENGOPS-Centered Project Affinity Diagram...")
     print("="*60)
     
-    temp_filename = 'cia_temp.png'
     G, hub_count, high_count, medium_count, low_count, cia_connections = create_cia_centered_diagram(
-        relationships_df, temp_filename)
+        relationships_df, None)
     
     if G is not None:
         center_count = hub_count + high_count + medium_count + low_count
         weighted_sum = (hub_count * 4) + (high_count * 3) + (medium_count * 2) + (low_count * 1)
         
-        G, hub_count, high_count, medium_count, low_count, cia_connections = create_cia_centered_diagram(
-            relationships_df, temp_filename, weighted_sum)
-        
         proper_filename = f'{weighted_sum:04d}_{center_count:04d}_{hub_count:04d}_{high_count:04d}_{medium_count:04d}_{low_count:04d}_ENGOPS.png'
         
-        import os
-        if os.path.exists(temp_filename):
-            if os.path.exists(proper_filename):
-                os.remove(proper_filename)
-            os.rename(temp_filename, proper_filename)
+        G, hub_count, high_count, medium_count, low_count, cia_connections = create_cia_centered_diagram(
+            relationships_df, proper_filename, weighted_sum)
         
         print(f"\nENGOPS-CENTERED PROJECT AFFINITY ANALYSIS SUMMARY")
         center_connections = list(G.neighbors('ENGOPS'))
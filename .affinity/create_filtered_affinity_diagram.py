@@ -9,18 +9,19 @@ import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
 import seaborn as sns
+from snapshot_store import LINK_COLUMNS, load_export
 import warnings
 warnings.filterwarnings('ignore')
 
 def load_project_data(csv_file):
     """Load and process the project relationship data"""
-    df = pd.read_csv(csv_file)
+    df = load_export(csv_file, LINK_COLUMNS)
     
     # Clean up the data
     df['LinkCount'] = pd.to_numeric(df['LinkCount'], errors='coerce').fillna(0)
     
     # Create project summary (group by ProjectKey and sum LinkCount)
-    project_summary = df.groupby('ProjectKey')['LinkCount'].sum().reset_index()
+    project_summary = df.groupby('ProjectKey', observed=True)['LinkCount'].sum().reset_index()
     project_summary = project_summary.sort_values('LinkCount', ascending=False)
     
     print(f"Found {len(project_summary)} unique projects")
@@ -143,7 +144,8 @@ def create_connectivity_heatmap(relationships_df, output_file='connectivity_heat
         values='LinkCount', 
         index='ProjectKey', 
         columns='ConnectedProject', 
-        fill_value=0
+        fill_value=0,
+        observed=True
     )
     
     # Sort by total connectivity
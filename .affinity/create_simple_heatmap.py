@@ -4,41 +4,26 @@ Create Simple Project Connection Heatmap
 Efficient version focusing on key connections
 """
 
-import pandas as pd
+import argparse
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+from heatmap_builder import format_annotations
+from link_matrix import open_link_matrix
+from link_windows import WINDOW_HELP, load_window, parse_window, window_scope
+from render_backends import DEFAULT_BACKEND, RENDER_BACKENDS, check_backend, save_figure, with_extension
+from render_cache import RenderCache
+from snapshot_store import LINK_COLUMNS, load_export
+from stage_trace import traced
 
-def create_focused_heatmap():
-    """Create focused heatmap for top projects only"""
-
-    # Load data
-    csv_file = '../.endpoints/Issue search/Issue Links - GET Project to Project Links - Filtered Unresolved 90Day - Anon - Official.csv'
-    df = pd.read_csv(csv_file)
-
-    print(f"Processing {len(df)} records...")
+DEFAULT_CSV_FILE = '../.endpoints/Issue search/Issue Links - GET Project to Project Links - Filtered Unresolved 90Day - Anon - Official.csv'
 
-    # Get project totals
-    project_totals = {}
-    for _, row in df.iterrows():
-        proj1, proj2, links = row['ProjectKey'], row['ConnectedProject'], row['LinkCount']
-        project_totals[proj1] = project_totals.get(proj1, 0) + links
-        project_totals[proj2] = project_totals.get(proj2, 0) + links
+# Which links the default CSV holds, for the heatmap title
+DEFAULT_SCOPE = 'Unresolved Issues, 90-Day Activity'
 
-    # Get top 20 projects
-    top_projects = sorted(project_totals.items(), key=lambda x: x[1], reverse=True)[:20]
-    top_project_names = [p[0] for p in top_projects]
-
-    print(f"Focusing on top 20 projects: {top_project_names}")
-
-    # Create connection matrix for top projects
-    matrix = pd.DataFrame(0, index=top_project_names, columns=top_project_names)
-
-    for _, row in df.iterrows():
-        proj1, proj2, links = row['ProjectKey'], row['ConnectedProject'], row['LinkCount']
-        if proj1 in top_project_names and proj2 in top_project_names:
-            matrix.loc[proj1, proj2] = links
-            matrix.loc[proj2, proj1] = links
+@traced()
+def render_heatmap(matrix, output_file, backend=DEFAULT_BACKEND, scope=DEFAULT_SCOPE):
+    """Draw the annotated log-scale heatmap for a project matrix"""
 
     # Create heatmap
     plt.figure(figsize=(14, 12))
@@ -47,16 +32,7 @@ def create_focused_heatmap():
     log_matrix = np.log1p(matrix)
 
     # Create annotations for actual values
-    annot_matrix = matrix.copy().astype(str)
-    for i in range(len(matrix)):
-        for j in range(len(matrix.columns)):
-            val = matrix.iloc[i, j]
-            if val >= 1000:
-                annot_matrix.iloc[i, j] = f'{val/1000:.1f}k'
-            elif val > 0:
-                annot_matrix.iloc[i, j] = str(int(val))
-            else:
-                annot_matrix.iloc[i, j] = ''
+    annot_matrix = format_annotations(matrix)
 
     # Create heatmap
     ax = sns.heatmap(log_matrix,
@@ -69,16 +45,52 @@ def create_focused_heatmap():
                      cbar_kws={'label': 'Log(Links + 1)'},
                      annot_kws={'size': 8})
 
-    plt.title('OMF Top 20 Projects Connection Heatmap\n(Unresolved Issues, 90-Day Activity)',
+    plt.title(f'OMF Top 20 Projects Connection Heatmap\n({scope})',
               fontsize=14, fontweight='bold', pad=20)
     plt.xticks(rotation=45, ha='right')
     plt.yticks(rotation=0)
 
     plt.tight_layout()
-    plt.savefig('OMF_Project_Heatmap_Top20.png', dpi=300, bbox_inches='tight')
-    print("Heatmap saved: OMF_Project_Heatmap_Top20.png")
+    save_figure(output_file, backend, dpi=300, bbox_inches='tight')
+    print(f"Heatmap saved: {output_file}")
     plt.close()
 
+@traced()
+def create_focused_heatmap(cache=None, csv_file=DEFAULT_CSV_FILE, backend=DEFAULT_BACKEND, window=None):
+    """Create focused heatmap for top projects only"""
+    output_file = with_extension('OMF_Project_Heatmap_Top20.png', backend)
+
+    # Load data (the detailed links inside the window when one is given)
+    if window is not None:
+        df, link_matrix, _ = load_window(window)
+    else:
+        df = load_export(csv_file, LINK_COLUMNS)
+        # Project totals and symmetric matrix from the memory-mapped artifact
+        link_matrix = open_link_matrix(csv_file)
+
+    print(f"Processing {len(df)} records...")
+
+    project_totals = link_matrix.totals_dict()
+
+    # Get top 20 projects
+    top_projects = sorted(project_totals.items(), key=lambda x: x[1], reverse=True)[:20]
+    top_project_names = [p[0] for p in top_projects]
+
+    print(f"Focusing on top 20 projects: {top_project_names}")
+
+    # Connection matrix for top projects
+    matrix = link_matrix.to_frame().loc[top_project_names, top_project_names]
+
+    # Skip the render when the top-20 matrix is unchanged since the cached PNG
+    scope = DEFAULT_SCOPE if window is None else window_scope(window)
+    key = cache.key('simple_heatmap', matrix, backend, scope) if cache else None
+    if key and cache.restore(key, output_file):
+        print(f"Heatmap unchanged, reused cached: {output_file}")
+    else:
+        render_heatmap(matrix, output_file, backend, scope)
+        if cache:
+            cache.store(key, output_file)
+
     # Print key connections
     print("\nTop 10 Connections:")
     connections = []
@@ -92,5 +104,22 @@ def create_focused_heatmap():
     for i, (p1, p2, links) in enumerate(connections[:10], 1):
         print(f"{i:2d}. {p1} ↔ {p2}: {links:,} links")
 
+def main():
+    """Generate the top-20 heatmap"""
+    parser = argparse.ArgumentParser(description='Generate the top-20 project connection heatmap')
+    parser.add_argument('--csv', default=DEFAULT_CSV_FILE, help='Project-to-project links CSV')
+    parser.add_argument('--window', help=WINDOW_HELP)
+    parser.add_argument('--backend', choices=list(RENDER_BACKENDS), default=DEFAULT_BACKEND,
+                        help='Render backend (svg or pdf write vector files)')
+    args = parser.parse_args()
+
+    try:
+        check_backend(args.backend)
+        window = None if args.window is None else parse_window(args.window)
+    except ValueError as e:
+        parser.error(str(e))
+
+    create_focused_heatmap(RenderCache(), args.csv, args.backend, window)
+
 if __name__ == "__main__":
-    create_focused_heatmap()
\ No newline at end of file
+    main()
\ No newline at end of file
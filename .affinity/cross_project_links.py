@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Cross-Project Issue Link Deduplication
+Collapses Detailed_Cross_Project_Links.csv to one row per issue link, keyed by its canonical (min key, max key) identity
+"""
+
+import csv
+import argparse
+import numpy as np
+import pandas as pd
+from link_table import frame_link_table
+from link_matrix import build_link_matrix
+from snapshot_store import load_export
+from stage_trace import traced
+
+DEFAULT_DETAILED_LINKS_FILE = 'Detailed_Cross_Project_Links.csv'
+DEFAULT_OUTPUT_FILE = 'Detailed_Cross_Project_Links_Deduplicated.csv'
+
+# Which ends of a link reported it, as bit flags in the Reported column
+REPORTED_OUTBOUND = 1   # listed among the source issue's outward links
+REPORTED_INBOUND = 2    # listed among the source issue's inward links (the other end's view)
+
+@traced()
+def dedupe_links(df):
+    """One row per issue link, with the direction kept as flags.
+
+    The exporter writes every link once from each end (FORMS-538 → INSO-2399
+    Outbound, INSO-2399 → FORMS-538 Inbound) and repeats rows for issues it
+    met more than once. Rows are grouped by their canonical (min key, max key)
+    identity in one hash pass; each link keeps its first Outbound report, so
+    SourceIssueKey → TargetIssueKey follows the link, or its first report when
+    only the inward end exported it. Reported holds the flags of every report
+    seen and Reports how many rows were collapsed.
+    """
+    low, high = frame_link_table(df).canonical()
+    link_ids, _ = pd.factorize(pd.MultiIndex.from_arrays([low, high]))
+    n_links = link_ids.max() + 1 if len(link_ids) else 0
+
+    outbound = (df['LinkDirection'].astype(str) == 'Outbound').to_numpy()
+    reported = np.zeros(n_links, dtype=np.int8)
+    np.bitwise_or.at(reported, link_ids, np.where(outbound, REPORTED_OUTBOUND, REPORTED_INBOUND).astype(np.int8))
+
+    # Links are numbered in order of first appearance, so the first report of each is where its id first occurs
+    first_report = np.unique(link_ids, return_index=True)[1]
+    first_outbound = np.full(n_links, len(df))
+    np.minimum.at(first_outbound, link_ids[outbound], np.flatnonzero(outbound))
+    kept = np.sort(np.where(first_outbound < len(df), first_outbound, first_report))
+
+    links = df.iloc[kept].reset_index(drop=True)
+    links['Reported'] = reported[link_ids[kept]]
+    links['Reports'] = np.bincount(link_ids, minlength=n_links)[link_ids[kept]].astype(np.int32)
+    return links
+
+def detailed_link_table(links, time_col=None):
+    """LinkTable of deduplicated links, with the Reported flags as its flag column (and days from time_col)"""
+    return frame_link_table(links, flags_col='Reported', time_col=time_col)
+
+def project_link_counts(table):
+    """SourceProject / TargetProject / TotalLinks per project pair, both orders on one alphabetical row"""
+    first, second, counts = table.project_pairs()
+    pairs = pd.DataFrame({
+        'SourceProject': table.project_names(first),
+        'TargetProject': table.project_names(second),
+        'TotalLinks': counts,
+    })
+    return pairs.sort_values(['TotalLinks', 'SourceProject', 'TargetProject'], ascending=[False, True, True],
+                             kind='stable', ignore_index=True)
+
+def load_detailed_links(csv_file=DEFAULT_DETAILED_LINKS_FILE):
+    """Deduplicated issue links of a detailed cross-project export"""
+    return dedupe_links(load_export(csv_file))
+
+def cross_project_matrix(csv_file=DEFAULT_DETAILED_LINKS_FILE):
+    """Symmetric project link matrix counting each deduplicated issue link once"""
+    return build_link_matrix(project_link_counts(detailed_link_table(load_detailed_links(csv_file))),
+                             'SourceProject', 'TargetProject', 'TotalLinks')
+
+def main():
+    """Write the deduplicated detailed cross-project links"""
+    parser = argparse.ArgumentParser(description='Deduplicate the detailed cross-project issue links')
+    parser.add_argument('--csv', default=DEFAULT_DETAILED_LINKS_FILE, help='Detailed cross-project links export')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_FILE, help='Deduplicated links CSV to write')
+    args = parser.parse_args()
+
+    rows = load_export(args.csv)
+    links = dedupe_links(rows)
+    links.to_csv(args.output, index=False, quoting=csv.QUOTE_ALL, date_format='%m/%d/%Y %H:%M:%S')
+
+    both_ends = int((links['Reported'] == REPORTED_OUTBOUND | REPORTED_INBOUND).sum())
+    print(f"{args.csv}: {len(rows):,} rows -> {len(links):,} issue links")
+    print(f"  Reported from both ends: {both_ends:,}")
+    print(f"  Repeated rows dropped: {int((links['Reports'] - 1).sum()) - both_ends:,}")
+    print(f"  Project pairs: {len(project_link_counts(detailed_link_table(links))):,}")
+    print(f"Saved: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Reusable Diagram Figure
+One figure and canvas kept across successive center renders; only the per-diagram artists are swapped
+"""
+
+import gc
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.transforms import Bbox
+
+class DiagramFigure:
+    """Figure template whose axes, title and legend persist while nodes, edges and texts change per diagram.
+
+    The figure is not registered with pyplot, so nothing accumulates in the
+    pyplot figure manager however many diagrams are drawn: memory holds at one
+    figure plus the raster buffer of the last save. close() (or leaving a with
+    block) releases both straight away.
+    """
+
+    def __init__(self, figsize):
+        self.figure = Figure(figsize=figsize)
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        sp = self.figure.subplotpars
+        self.subplot_params = dict(left=sp.left, bottom=sp.bottom, right=sp.right, top=sp.top)
+        self.ax.axis('off')
+        self.legend = None
+        self.diagrams = 0
+
+    def reset(self):
+        """Remove the previous diagram's artists and data limits, keeping title, legend and axis styling"""
+        ax = self.ax
+        for artist in [*ax.collections, *ax.lines, *ax.patches, *ax.texts, *self.figure.texts]:
+            artist.remove()
+        # Back to the position, limits and aspect of a fresh axes: equal-aspect autoscaling
+        # depends on them, and the diagram should come out exactly as from a new figure
+        self.figure.subplots_adjust(**self.subplot_params)
+        ax.dataLim.set(Bbox.null())
+        ax.ignore_existing_data_limits = True
+        ax.viewLim.set(Bbox.unit())
+        ax.set_aspect('auto', adjustable='box')
+        ax.set_autoscale_on(True)
+        return ax
+
+    def save(self, output_file, **kwargs):
+        """Save the current diagram; the figure stays open for the next one"""
+        self.figure.savefig(output_file, **kwargs)
+        self.diagrams += 1
+
+    def close(self):
+        """Drop the figure, its artists and the canvas renderer now instead of at some later collection"""
+        if self.figure is None:
+            return
+        self.figure.clear()
+        self.figure = self.ax = self.legend = None
+        # Artists and their figure reference each other, so only the cycle collector frees them
+        gc.collect()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
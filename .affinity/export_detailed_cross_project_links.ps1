@@ -5,6 +5,11 @@
 # Filters: Unresolved + Updated within 180 days + Excluded projects
 # =============================================================================
 
+param(
+    # Count the window back from the latest Updated date in the CSV (as filter_specs.py does) instead of today
+    [switch]$FromLatestUpdate
+)
+
 Write-Host "🔍 Exporting detailed cross-project links..." -ForegroundColor Cyan
 
 # Read the All Issues with Links CSV
@@ -13,14 +18,32 @@ $allData = Import-Csv $csvPath
 
 Write-Host "📊 Total records: $($allData.Count)" -ForegroundColor Green
 
-# Define resolved/closed statuses to exclude
-$resolvedStatuses = @('Done', 'Closed', 'Resolved', 'Cancelled', 'Complete', 'Completed')
+# Statuses, window and excluded projects come from the 'export' spec shared with the Python scripts
+$filterSpecs = Get-Content (Join-Path $PSScriptRoot 'filter_specs.json') -Raw -Encoding UTF8 | ConvertFrom-Json
+$exportSpec = $filterSpecs.export
+
+# Resolved/closed statuses to exclude
+$resolvedStatuses = @($exportSpec.exclude_statuses)
 
-# Calculate the cutoff date (180 days ago)
-$cutoffDate = (Get-Date).AddDays(-180)
+# Calculate the cutoff date (window days ago, or window days up to the latest update with -FromLatestUpdate)
+if ("$($exportSpec.window)" -notmatch '^\s*(\d+)d?\s*$') {
+    throw "filter_specs.json: the export window must be a day count like 180 or 180d (got '$($exportSpec.window)')"
+}
+$windowDays = [int]$Matches[1]
+if ($FromLatestUpdate) {
+    $lastUpdated = $allData | ForEach-Object { try { [DateTime]::Parse($_.Updated) } catch { } } | Sort-Object | Select-Object -Last 1
+    if ($null -eq $lastUpdated) {
+        throw "-FromLatestUpdate: no Updated date in $csvPath could be parsed"
+    }
+    $cutoffDate = $lastUpdated.Date.AddDays(1 - $windowDays)
+    $windowText = "in the $windowDays days up to $($lastUpdated.ToString('yyyy-MM-dd'))"
+} else {
+    $cutoffDate = (Get-Date).AddDays(-$windowDays)
+    $windowText = "in last $windowDays days"
+}
 Write-Host "📅 Filtering for issues updated after: $($cutoffDate.ToString('yyyy-MM-dd'))" -ForegroundColor Cyan
 
-# Filter to only unresolved issues updated within last 180 days
+# Filter to only unresolved issues updated within the window
 $unresolvedData = $allData | Where-Object { $resolvedStatuses -notcontains $_.Status }
 Write-Host "✅ Total unresolved issues: $($unresolvedData.Count)" -ForegroundColor Green
 
@@ -33,10 +56,10 @@ $data = $unresolvedData | Where-Object {
     }
 }
 
-Write-Host "✅ Unresolved issues updated in last 180 days: $($data.Count)" -ForegroundColor Green
+Write-Host "✅ Unresolved issues updated ${windowText}: $($data.Count)" -ForegroundColor Green
 
-# Define projects to exclude from analysis
-$excludedProjects = @('ORL', 'TOKR', 'RC', 'EOKR', 'OBSRV', 'EPMC', 'EDME', 'BOKR')
+# Projects to exclude from analysis
+$excludedProjects = @($exportSpec.exclude)
 Write-Host "🚫 Excluding projects: $($excludedProjects -join ', ')" -ForegroundColor Yellow
 
 Write-Host "🔄 Processing cross-project links..." -ForegroundColor Yellow
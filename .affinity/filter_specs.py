@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Declarative Link Filter Specs
+Named project, status, self-link and time-window filters compiled to boolean masks and materialized once per spec
+"""
+
+import os
+import json
+import time
+import hashlib
+import argparse
+import functools
+import numpy as np
+import pandas as pd
+from link_table import MISSING_DAY, epoch_days
+from link_windows import parse_window
+from snapshot_store import load_export
+from stage_trace import traced
+
+# Shared with the PowerShell exporters, which read their exclusions from the 'export' spec
+SPEC_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'filter_specs.json')
+EXPORT_SPEC = 'export'
+
+# keep: links within one project stay; drop: only cross-project links; only: only links within one project
+SELF_LINK_POLICIES = ('keep', 'drop', 'only')
+
+class FilterSpec:
+    """Which links to keep; every clause is optional and an empty spec keeps everything.
+
+    - exclude: drop links touching any of these projects
+    - include: keep only links with both ends among these projects
+    - statuses / exclude_statuses: keep only / drop links whose status is in the set
+    - self_links: one of SELF_LINK_POLICIES
+    - window: time window as accepted by link_windows.parse_window. Here a
+      day count is the last N days of the data, ending on the latest date in
+      the table. The PowerShell exporters read the 'export' spec's window as a
+      day count only (see export_window_days) and count it back from today,
+      or from the latest Updated date in their CSV when run with
+      -FromLatestUpdate, which matches this filter.
+    """
+
+    def __init__(self, exclude=(), include=(), statuses=(), exclude_statuses=(), self_links='keep', window=None,
+                 description=None):
+        if self_links not in SELF_LINK_POLICIES:
+            raise ValueError(f"Unknown self-link policy '{self_links}' (choose from {', '.join(SELF_LINK_POLICIES)})")
+        # Declared order is kept for titles; the key below does not depend on it
+        self.exclude = tuple(dict.fromkeys(exclude))
+        self.include = tuple(dict.fromkeys(include))
+        self.statuses = tuple(dict.fromkeys(statuses))
+        self.exclude_statuses = tuple(dict.fromkeys(exclude_statuses))
+        self.self_links = self_links
+        self.window = None if window is None else str(parse_window(window))
+        self.description = description
+
+    def as_dict(self):
+        """Canonical form of the clauses (sorted sets, no description)"""
+        return {
+            'exclude': sorted(self.exclude),
+            'include': sorted(self.include),
+            'statuses': sorted(self.statuses),
+            'exclude_statuses': sorted(self.exclude_statuses),
+            'self_links': self.self_links,
+            'window': self.window,
+        }
+
+    def key(self):
+        """Stable hash of the clauses, the memoization key of a materialized result"""
+        return hashlib.sha1(json.dumps(self.as_dict(), sort_keys=True).encode()).hexdigest()[:16]
+
+    def describe(self):
+        """Readable summary for titles, e.g. 'Excluding ORL, TOKR | No Self-Links'"""
+        parts = []
+        if self.exclude:
+            parts.append(f"Excluding {', '.join(self.exclude)}")
+        if self.include:
+            parts.append(f"Only {', '.join(self.include)}")
+        if self.statuses:
+            parts.append(f"Status {', '.join(self.statuses)}")
+        if self.exclude_statuses:
+            parts.append(f"Not {', '.join(self.exclude_statuses)}")
+        if self.self_links != 'keep':
+            parts.append('No Self-Links' if self.self_links == 'drop' else 'Self-Links Only')
+        if self.window is not None:
+            parts.append(f'Window {self.window}')
+        return ' | '.join(parts) or 'All Links'
+
+    def __eq__(self, other):
+        return isinstance(other, FilterSpec) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f'FilterSpec({self.describe()})'
+
+def export_window_days(spec):
+    """Day count of the export spec's window, the only window form the PowerShell exporters accept"""
+    window = None if spec.window is None else parse_window(spec.window)
+    if window is None or window.days is None:
+        found = f"got '{spec.window}'" if spec.window else 'it has none'
+        raise ValueError(f"The '{EXPORT_SPEC}' spec needs a day-count window like 180 or 180d ({found})")
+    return window.days
+
+def load_filter_specs(spec_file=SPEC_FILE):
+    """Named FilterSpecs from a JSON file of {name: {clause: value}}; the export spec's window is checked too"""
+    with open(spec_file, encoding='utf-8') as f:
+        specs = {name: FilterSpec(**clauses) for name, clauses in json.load(f).items()}
+    if EXPORT_SPEC in specs:
+        export_window_days(specs[EXPORT_SPEC])
+    return specs
+
+def filter_spec(spec, spec_file=SPEC_FILE):
+    """FilterSpec for a spec name in the spec file (a FilterSpec is returned as is)"""
+    if isinstance(spec, FilterSpec):
+        return spec
+    specs = load_filter_specs(spec_file)
+    if spec not in specs:
+        raise ValueError(f"Unknown filter spec '{spec}' (defined: {', '.join(specs)})")
+    return specs[spec]
+
+class FilterEngine:
+    """One loaded edge or link table whose filter masks and filtered results are memoized.
+
+    Project endpoints are integer-coded once, so each clause is an np.isin
+    over codes. Clause masks are cached by clause value and whole results by
+    FilterSpec.key(), so many variants over one table cost one load, a few
+    clause masks and one boolean selection per spec.
+    """
+
+    def __init__(self, df, source_col, target_col, count_col=None, status_col=None, time_col=None):
+        self.df = df
+        self.source_col, self.target_col, self.count_col = source_col, target_col, count_col
+
+        endpoints = pd.Categorical(pd.concat([df[source_col], df[target_col]], ignore_index=True).astype(str))
+        self.projects = endpoints.categories
+        codes = endpoints.codes.astype(np.int64)
+        self.sources, self.targets = codes[:len(df)], codes[len(df):]
+
+        self.statuses = None
+        if status_col is not None:
+            statuses = pd.Categorical(df[status_col].astype(str))
+            self.status_names, self.statuses = statuses.categories, statuses.codes.astype(np.int64)
+        self.days = None if time_col is None else epoch_days(df[time_col])
+
+        self._masks = {}
+        self._results = {}
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.df)
+
+    def _clause(self, name, value, build):
+        """Clause mask from the cache, built on first use"""
+        key = (name, value)
+        if key not in self._masks:
+            self._masks[key] = build()
+        return self._masks[key]
+
+    def _project_ids(self, projects):
+        return np.flatnonzero(self.projects.isin(list(projects)))
+
+    def _status_ids(self, statuses):
+        if self.statuses is None:
+            raise ValueError('Status filters need a table loaded with a status column')
+        return np.flatnonzero(self.status_names.isin(list(statuses)))
+
+    def _window_mask(self, window):
+        if self.days is None:
+            raise ValueError('Window filters need a table loaded with a time column')
+        dated = self.days != MISSING_DAY
+        first_day, last_day = (int(self.days[dated].min()), int(self.days[dated].max())) if dated.any() else (0, -1)
+        start, end = parse_window(window).resolve(first_day, last_day)
+        return dated & (self.days >= start) & (self.days <= end)
+
+    def mask(self, spec):
+        """Boolean row mask of a spec, combined from cached clause masks"""
+        spec = filter_spec(spec)
+        mask = np.ones(len(self.df), dtype=bool)
+        if spec.exclude:
+            mask &= self._clause('exclude', frozenset(spec.exclude), lambda: ~(
+                np.isin(self.sources, self._project_ids(spec.exclude)) |
+                np.isin(self.targets, self._project_ids(spec.exclude))))
+        if spec.include:
+            mask &= self._clause('include', frozenset(spec.include), lambda: (
+                np.isin(self.sources, self._project_ids(spec.include)) &
+                np.isin(self.targets, self._project_ids(spec.include))))
+        if spec.statuses:
+            mask &= self._clause('statuses', frozenset(spec.statuses),
+                                 lambda: np.isin(self.statuses, self._status_ids(spec.statuses)))
+        if spec.exclude_statuses:
+            mask &= self._clause('exclude_statuses', frozenset(spec.exclude_statuses),
+                                 lambda: ~np.isin(self.statuses, self._status_ids(spec.exclude_statuses)))
+        if spec.self_links != 'keep':
+            same = self._clause('self_links', None, lambda: self.sources == self.targets)
+            mask &= ~same if spec.self_links == 'drop' else same
+        if spec.window is not None:
+            mask &= self._clause('window', spec.window, lambda: self._window_mask(spec.window))
+        return mask
+
+    @traced()
+    def materialize(self, spec):
+        """Rows of the table that pass a spec, computed once per distinct spec"""
+        spec = filter_spec(spec)
+        key = spec.key()
+        if key in self._results:
+            self.hits += 1
+            return self._results[key]
+        result = self.df[self.mask(spec)]
+        self._results[key] = result
+        return result
+
+    def link_count(self, rows):
+        """Links in a materialized result (the count column summed, or rows for a per-link table)"""
+        return int(rows[self.count_col].sum()) if self.count_col else len(rows)
+
+@functools.lru_cache(maxsize=8)
+def load_filter_engine(csv_file, source_col, target_col, count_col=None, status_col=None, time_col=None):
+    """FilterEngine over an export's snapshot, loaded once per process for any number of specs"""
+    columns = [col for col in (source_col, target_col, count_col, status_col, time_col) if col is not None]
+    df = load_export(csv_file, list(dict.fromkeys(columns)))
+    return FilterEngine(df, source_col, target_col, count_col, status_col, time_col)
+
+def main():
+    """Apply named filter specs to one export and report what each keeps"""
+    parser = argparse.ArgumentParser(description='Apply declarative filter specs to a link export')
+    parser.add_argument('specs', nargs='*', help='Spec names (default: every spec in the spec file)')
+    parser.add_argument('--csv', default='Detailed_Cross_Project_Links.csv', help='Link or edge export')
+    parser.add_argument('--source-col', default='SourceProject', help='Source project column')
+    parser.add_argument('--target-col', default='TargetProject', help='Target project column')
+    parser.add_argument('--count-col', help='Link count column (omit for one row per link)')
+    parser.add_argument('--status-col', help='Status column, for status clauses')
+    parser.add_argument('--time-col', help='Timestamp column, for window clauses')
+    parser.add_argument('--spec-file', default=SPEC_FILE, help='JSON file of named filter specs')
+    args = parser.parse_args()
+
+    try:
+        specs = load_filter_specs(args.spec_file)
+    except ValueError as e:
+        parser.error(str(e))
+    names = args.specs or list(specs)
+    unknown = [name for name in names if name not in specs]
+    if unknown:
+        parser.error(f"Unknown filter spec(s): {', '.join(unknown)}")
+
+    start = time.perf_counter()
+    engine = load_filter_engine(args.csv, args.source_col, args.target_col, args.count_col, args.status_col,
+                                args.time_col)
+    loaded = time.perf_counter()
+    print(f"{args.csv}: {len(engine):,} rows, {len(engine.projects):,} projects ({(loaded - start) * 1000:.0f} ms)")
+
+    for name in names:
+        spec = specs[name]
+        try:
+            rows = engine.materialize(spec)
+        except ValueError as e:
+            print(f"  {name:28s} skipped: {e}")
+            continue
+        print(f"  {name:28s} {len(rows):7,} rows {engine.link_count(rows):8,} links  [{spec.key()}] {spec.describe()}")
+    print(f"Filtered {len(names)} specs in {(time.perf_counter() - loaded) * 1000:.1f} ms "
+          f"({len(engine._masks)} clause masks, {engine.hits} reused results)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Filtered Project Connection Heatmaps
+Renders every exclusion variant from its filter spec; variants over the same export share one load
+"""
+
+import argparse
+import matplotlib.pyplot as plt
+import seaborn as sns
+import numpy as np
+from filter_specs import SPEC_FILE, FilterSpec, load_filter_engine, load_filter_specs
+from heatmap_builder import build_heatmap_matrix, format_annotations
+from render_backends import DEFAULT_BACKEND, RENDER_BACKENDS, check_backend, save_figure, with_extension
+from render_cache import RenderCache
+from stage_trace import traced
+import warnings
+warnings.filterwarnings('ignore')
+
+DETAILED_CONNECTIONS_FILE = './Project_to_Project_Detailed_Connections.csv'
+FINAL_FILTERED_FILE = '../.endpoints/Issue search/Issue Links - GET Project to Project Links - Final Filtered - Exclude {} - Anon - Official.csv'
+
+# (csv, source, target, count) columns of each edge export
+DETAILED_CONNECTIONS = (DETAILED_CONNECTIONS_FILE, 'SourceProject', 'TargetProject', 'TotalLinks')
+
+# Console report of the final filtered exports (the same for both exclusion sets)
+FINAL_FILTERED_REPORT = dict(
+    header=(), load_stats=('Loaded {rows} project relationships', 'Total links: {links}'),
+    cross_project=False, count_width=4,
+    analyses=(('strongest_pairs', None), ('most_connected', 10), ('isolated', None)))
+
+# Rendering and console report of each variant; which links it shows comes from the spec of the same name in
+# filter_specs.json.
+# - symmetric / self_links / self_link_totals are passed to build_heatmap_matrix
+# - title takes {top_n}, {excluding} and {spec} (the spec's describe())
+# - header lines take {excluded} and {self_links} from the spec; load_stats lines take {rows} / {links} of the
+#   export, {kept} / {kept_links} passing the spec and {self_link_rows}
+# - cross_project words the report for cross-project links; count_width is the width of the ranking counts
+# - analyses are (kind, list size) pairs, printed in order (see ANALYSES)
+HEATMAP_VARIANTS = {
+    'no_7projects': dict(
+        source=DETAILED_CONNECTIONS, top_n=30, symmetric=False, self_links=True, self_link_totals=1,
+        figsize=(18, 14), fontsize=7, mask_diagonal=False, xlabel='Target Project',
+        title='OMF Top {top_n} Projects Connection Heatmap\n(Filtered Dataset - {excluding})',
+        output='project_connection_heatmap_filtered_no_7projects.png',
+        header=('Creating filtered project connection heatmap...', 'Excluded projects: {excluded}'),
+        load_stats=('Loaded {rows} project-to-project connections', 'Total links: {links}'),
+        cross_project=False, count_width=6, analyses=(('strongest', 10), ('most_connected', 10), ('self_links', 10))),
+    'cross_project_only': dict(
+        source=DETAILED_CONNECTIONS, top_n=10, symmetric=False, self_links=False, self_link_totals=0,
+        figsize=(12, 10), fontsize=9, mask_diagonal=True, xlabel='Target Project',
+        title='OMF Top {top_n} Projects - Cross-Project Connections Only\n(Filtered: {spec})',
+        output='project_connection_heatmap_cross_project_only.png',
+        header=('Creating CROSS-PROJECT connection heatmap...', 'Excluded projects: {excluded}',
+                'Self-links: {self_links}'),
+        load_stats=('Loaded {rows} total project-to-project connections', 'Cross-project connections: {kept}',
+                    'Self-links filtered out: {self_link_rows}', 'Total cross-project links: {kept_links}'),
+        cross_project=True, count_width=6, analyses=(('strongest', 20), ('most_connected', 20), ('bidirectional', 10))),
+    'no_orl_tokr_rc': dict(
+        source=(FINAL_FILTERED_FILE.format('ORL TOKR RC'), 'ProjectKey', 'ConnectedProject', 'LinkCount'),
+        top_n=20, symmetric=True, self_links=False, self_link_totals=2,
+        figsize=(16, 12), fontsize=8, mask_diagonal=False, xlabel='Connected Project',
+        title='OMF Top {top_n} Projects Connection Heatmap\n(Filtered Dataset - {excluding})',
+        output='project_connection_heatmap_filtered_no_orl_tokr_rc.png', **FINAL_FILTERED_REPORT),
+    'no_orl_tokr_rc_eokr_obsrv': dict(
+        source=(FINAL_FILTERED_FILE.format('ORL TOKR RC EOKR OBSRV'), 'ProjectKey', 'ConnectedProject', 'LinkCount'),
+        top_n=20, symmetric=True, self_links=False, self_link_totals=2,
+        figsize=(16, 12), fontsize=8, mask_diagonal=False, xlabel='Connected Project',
+        title='OMF Top {top_n} Projects Connection Heatmap\n(Filtered Dataset - {excluding})',
+        output='project_connection_heatmap_filtered_no_orl_tokr_rc_eokr_obsrv.png', **FINAL_FILTERED_REPORT),
+}
+
+# Header wording of each self-link policy
+SELF_LINK_HEADERS = {'keep': 'INCLUDED', 'drop': 'EXCLUDED', 'only': 'ONLY'}
+
+def variant_title(variant, spec):
+    """Heatmap title of a variant, with its exclusions spelled out from the spec"""
+    return variant['title'].format(top_n=variant['top_n'], spec=spec.describe(),
+                                   excluding=f"Excluding {', '.join(spec.exclude)}")
+
+def print_banner(text):
+    """Section heading of the console report"""
+    print(f"\n{'='*60}")
+    print(text)
+    print(f"{'='*60}")
+
+def print_header(variant, spec):
+    """What the variant leaves out, spelled from its spec"""
+    for line in variant['header']:
+        print(line.format(excluded=', '.join(spec.exclude), self_links=SELF_LINK_HEADERS[spec.self_links]))
+    if variant['header']:
+        print()
+
+@traced()
+def variant_rows(variant, spec):
+    """The spec's filtered rows of a variant's (shared) export, with the variant's load statistics"""
+    csv_file, source_col, target_col, count_col = variant['source']
+    engine = load_filter_engine(csv_file, source_col, target_col, count_col)
+    rows = engine.materialize(spec)
+    stats = dict(rows=len(engine), links=engine.link_count(engine.df), kept=len(rows),
+                 kept_links=engine.link_count(rows),
+                 self_link_rows=int(engine.mask(FilterSpec(self_links='only')).sum()))
+    for line in variant['load_stats']:
+        print(line.format(**stats))
+    return rows
+
+@traced()
+def variant_matrix(variant, rows):
+    """Top-N matrix of a variant from its filtered rows, printing the project ranking"""
+    _, source_col, target_col, count_col = variant['source']
+    top_n = variant['top_n']
+    matrix, top_projects, sorted_projects = build_heatmap_matrix(
+        rows, source_col, target_col, count_col, top_n=top_n, symmetric=variant['symmetric'],
+        self_links=variant['self_links'], self_link_totals=variant['self_link_totals'])
+    if not variant['cross_project']:
+        print(f"Total unique projects: {len(sorted_projects)}")
+
+    scope, unit = ('cross-project', 'cross-project links') if variant['cross_project'] else ('total', 'total links')
+    print(f"\nTop {top_n} projects by {scope} connections:")
+    for i, (project, total_links) in enumerate(sorted_projects[:top_n], 1):
+        print(f"{i:2d}. {project:8s}: {total_links:{variant['count_width']}d} {unit}")
+    return matrix, top_projects
+
+@traced()
+def render_variant_heatmap(matrix, top_projects, variant, title, output_file, backend=DEFAULT_BACKEND):
+    """Draw the log-scale heatmap with raw counts as annotations"""
+    plt.figure(figsize=variant['figsize'])
+
+    # log(1 + x) keeps zeros at zero and spreads the wide range of link counts
+    mask = None
+    if variant['mask_diagonal']:
+        mask = np.zeros_like(matrix, dtype=bool)
+        np.fill_diagonal(mask, True)
+
+    sns.heatmap(np.log1p(matrix),
+                xticklabels=top_projects,
+                yticklabels=top_projects,
+                annot=format_annotations(matrix, abbreviate=False, blank_zeros=False),
+                fmt='',
+                cmap='YlOrRd',
+                cbar_kws={'label': 'Log(Links + 1)'},
+                square=True,
+                linewidths=0.5,
+                annot_kws={'fontsize': variant['fontsize']},
+                mask=mask)
+
+    plt.title(title, fontsize=16, fontweight='bold', pad=20)
+    plt.xlabel(variant['xlabel'], fontsize=12, fontweight='bold')
+    plt.ylabel('Source Project', fontsize=12, fontweight='bold')
+    plt.xticks(rotation=45, ha='right')
+    plt.yticks(rotation=0)
+    plt.tight_layout()
+
+    save_figure(output_file, backend, dpi=300, bbox_inches='tight')
+    plt.close()
+
+def connection_totals(matrix):
+    """Links of each project to the other projects in the heatmap, both directions, self-links left out"""
+    return matrix.sum(axis=1) + matrix.sum(axis=0) - 2 * np.diag(matrix)
+
+def print_strongest(matrix, top_projects, variant, n):
+    """The n strongest connections between different projects"""
+    rows, cols = np.nonzero(matrix)
+    # A symmetric matrix holds each pair twice; list it once
+    pairs = (rows < cols) if variant['symmetric'] else (rows != cols)
+    rows, cols = rows[pairs], cols[pairs]
+    arrow = '↔' if variant['symmetric'] else '->'
+    print(f"\nTop {n} strongest {'cross-project' if variant['cross_project'] else 'project'} connections:")
+    for idx, k in enumerate(np.argsort(-matrix[rows, cols], kind='stable')[:n], 1):
+        i, j = rows[k], cols[k]
+        print(f"{idx:2d}. {top_projects[i]:8s} {arrow} {top_projects[j]:8s}: {int(matrix[i, j]):5d} links")
+
+def print_strongest_pairs(matrix, top_projects, variant, n=None):
+    """Every pair sharing the single strongest connection"""
+    upper = np.triu(matrix, 1)
+    strongest = upper.max() if upper.size else 0
+    print("Strongest project connections:")
+    if strongest > 0:
+        for i, j in zip(*np.nonzero(upper == strongest)):
+            print(f"  {top_projects[i]} ↔ {top_projects[j]}: {int(strongest)} links")
+
+def print_most_connected(matrix, top_projects, variant, n):
+    """The n projects with the most links to the rest of the heatmap"""
+    totals = connection_totals(matrix)
+    if variant['cross_project']:
+        title, unit = 'projects (cross-project only)', 'total cross-project links'
+    else:
+        title, unit = 'projects in heatmap', 'total connections'
+    print(f"\nTop {n} most connected {title}:")
+    for idx, i in enumerate(np.argsort(-totals, kind='stable')[:n], 1):
+        print(f"{idx:2d}. {top_projects[i]:8s}: {int(totals[i]):{variant['count_width']}d} {unit}")
+
+def print_isolated(matrix, top_projects, variant, n=None):
+    """Projects with no link to any other project in the heatmap"""
+    totals = connection_totals(matrix)
+    isolated = [top_projects[i] for i in np.flatnonzero(totals == 0)]
+    if isolated:
+        print(f"\nIsolated projects (no connections to other top {len(top_projects)}): {', '.join(isolated)}")
+    else:
+        print(f"\nAll top {len(top_projects)} projects have connections to other projects in the set")
+
+def print_self_links(matrix, top_projects, variant, n):
+    """The n projects with the most self-links"""
+    diagonal = np.diag(matrix)
+    self_linkers = np.flatnonzero(diagonal)
+    if len(self_linkers):
+        print(f"\nTop {n} projects with most self-links:")
+        for idx, i in enumerate(self_linkers[np.argsort(-diagonal[self_linkers], kind='stable')][:n], 1):
+            print(f"{idx:2d}. {top_projects[i]:8s}: {int(diagonal[i]):5d} self-links")
+
+def print_bidirectional(matrix, top_projects, variant, n):
+    """The n strongest pairs linked in both directions"""
+    rows, cols = np.nonzero(np.triu((matrix > 0) & (matrix.T > 0), 1))
+    totals = matrix[rows, cols] + matrix[cols, rows]
+    print(f"\nTop {n} strongest bidirectional relationships:")
+    for idx, k in enumerate(np.argsort(-totals, kind='stable')[:n], 1):
+        i, j = rows[k], cols[k]
+        print(f"{idx:2d}. {top_projects[i]:8s} <-> {top_projects[j]:8s}: {int(totals[k]):5d} total "
+              f"({int(matrix[i, j])} / {int(matrix[j, i])})")
+
+# Analyses a variant can list in its report
+ANALYSES = {
+    'strongest': print_strongest,
+    'strongest_pairs': print_strongest_pairs,
+    'most_connected': print_most_connected,
+    'isolated': print_isolated,
+    'self_links': print_self_links,
+    'bidirectional': print_bidirectional,
+}
+
+def analyze_connections(matrix, top_projects, variant):
+    """Print the variant's connection analyses"""
+    print_banner(f"{'CROSS-PROJECT ' if variant['cross_project'] else ''}CONNECTION ANALYSIS")
+    for kind, n in variant['analyses']:
+        ANALYSES[kind](matrix, top_projects, variant, n)
+
+def create_variant_heatmap(name, specs=None, cache=None, backend=DEFAULT_BACKEND):
+    """Render one named variant (reusing the cached file when its matrix and title are unchanged)"""
+    variant = HEATMAP_VARIANTS[name]
+    spec = (specs or load_filter_specs())[name]
+    output_file = with_extension(variant['output'], backend)
+
+    print_header(variant, spec)
+    rows = variant_rows(variant, spec)
+    print_banner(f"CREATING {'CROSS-PROJECT' if variant['cross_project'] else 'FILTERED PROJECT'} CONNECTION HEATMAP")
+    matrix, top_projects = variant_matrix(variant, rows)
+    title = variant_title(variant, spec)
+
+    key = cache.key('filtered_heatmap', name, matrix, top_projects, title, backend) if cache else None
+    if key and cache.restore(key, output_file):
+        print(f"Heatmap unchanged, reused cached: {output_file}")
+    else:
+        render_variant_heatmap(matrix, top_projects, variant, title, output_file, backend)
+        print(f"Heatmap saved as: {output_file}")
+        if cache:
+            cache.store(key, output_file)
+
+    analyze_connections(matrix, top_projects, variant)
+
+    print_banner("HEATMAP CREATION COMPLETE")
+    print(f"Output file: {output_file}")
+    print(f"Projects analyzed: {len(top_projects)}")
+    print(f"Matrix size: {matrix.shape}")
+    print(f"Total {'cross-project ' if variant['cross_project'] else ''}connections in heatmap: {int(np.sum(matrix))}")
+    return output_file
+
+def variant_main(name):
+    """Command line of the single-variant heatmap scripts"""
+    parser = argparse.ArgumentParser(description=f'Generate the {name} project connection heatmap')
+    parser.add_argument('--backend', choices=list(RENDER_BACKENDS), default=DEFAULT_BACKEND,
+                        help='Render backend (svg or pdf write vector files)')
+    parser.add_argument('--spec-file', default=SPEC_FILE, help='JSON file of named filter specs')
+    args = parser.parse_args()
+
+    try:
+        check_backend(args.backend)
+        specs = load_filter_specs(args.spec_file)
+    except ValueError as e:
+        parser.error(str(e))
+
+    create_variant_heatmap(name, specs, RenderCache(), args.backend)
+
+def main():
+    """Render several (default: all) filtered heatmap variants, loading each export once"""
+    parser = argparse.ArgumentParser(description='Generate the filtered project connection heatmaps')
+    parser.add_argument('variants', nargs='*', help=f"Variants (default: all of {', '.join(HEATMAP_VARIANTS)})")
+    parser.add_argument('--backend', choices=list(RENDER_BACKENDS), default=DEFAULT_BACKEND,
+                        help='Render backend (svg or pdf write vector files)')
+    parser.add_argument('--spec-file', default=SPEC_FILE, help='JSON file of named filter specs')
+    args = parser.parse_args()
+
+    try:
+        specs = load_filter_specs(args.spec_file)
+    except ValueError as e:
+        parser.error(str(e))
+    names = args.variants or list(HEATMAP_VARIANTS)
+    unknown = [name for name in names if name not in HEATMAP_VARIANTS or name not in specs]
+    if unknown:
+        parser.error(f"Unknown variant(s) or missing spec(s): {', '.join(unknown)}")
+    try:
+        check_backend(args.backend)
+    except ValueError as e:
+        parser.error(str(e))
+
+    cache = RenderCache()
+    outputs = [create_variant_heatmap(name, specs, cache, args.backend) for name in names]
+
+    print(f"\n{'='*60}")
+    print("FILTERED HEATMAPS COMPLETE")
+    print(f"{'='*60}")
+    for output_file in outputs:
+        print(f"  {output_file}")
+
+if __name__ == "__main__":
+    main()
@@ -4,93 +4,46 @@ Generate Complete Project Connection Tables for All Projects
 Creates individual perspective tables for every project in the dataset
 """
 
+import re
+import argparse
 import pandas as pd
 import numpy as np
 from collections import defaultdict
+from link_matrix import open_link_matrix
+from report_writer import ordered_map, write_report
+from ring_classification import RingClassification
+from snapshot_store import LINK_COLUMNS, load_export
+from stage_trace import traced
 
-def load_and_analyze_connections():
+DEFAULT_CSV_FILE = '../.endpoints/Issue search/Issue Links - GET Project to Project Links - Filtered Unresolved 90Day - Anon - Official.csv'
+DEFAULT_OUTPUT_FILE = 'ALL_PROJECT_CONNECTION_TABLES.md'
+
+@traced()
+def load_and_analyze_connections(csv_file=DEFAULT_CSV_FILE):
     """Load the main CSV and create comprehensive connection matrix"""
-    csv_file = '../.endpoints/Issue search/Issue Links - GET Project to Project Links - Filtered Unresolved 90Day - Anon - Official.csv'
-    df = pd.read_csv(csv_file)
+    df = load_export(csv_file, LINK_COLUMNS)
 
     print(f"Loaded {len(df)} relationship records")
     print(f"Total link count: {df['LinkCount'].sum():,}")
 
-    # Get unique projects
-    all_projects = set()
-    for _, row in df.iterrows():
-        all_projects.add(row['ProjectKey'])
-        all_projects.add(row['ConnectedProject'])
-
-    all_projects = sorted(list(all_projects))
+    # Project index, totals and symmetric matrix from the memory-mapped artifact
+    link_matrix = open_link_matrix(csv_file)
+    all_projects = link_matrix.projects
     print(f"Found {len(all_projects)} unique projects")
 
-    # Create project totals
-    project_totals = defaultdict(int)
-    for _, row in df.iterrows():
-        project_totals[row['ProjectKey']] += row['LinkCount']
-        project_totals[row['ConnectedProject']] += row['LinkCount']
+    project_totals = defaultdict(int, link_matrix.totals_dict())
 
-    # Create direct connection matrix
-    connection_matrix = defaultdict(lambda: defaultdict(int))
-    for _, row in df.iterrows():
-        project1 = row['ProjectKey']
-        project2 = row['ConnectedProject']
-        links = row['LinkCount']
+    # Network connections and rings of every neighbor for every center in one sparse product
+    classification = RingClassification(link_matrix)
 
-        connection_matrix[project1][project2] = links
-        connection_matrix[project2][project1] = links
+    return df, link_matrix, project_totals, classification
 
-    return df, all_projects, project_totals, connection_matrix
-
-def analyze_project_perspective(project, df, all_projects, project_totals, connection_matrix):
+def analyze_project_perspective(project, project_totals, classification):
     """Analyze connections from a specific project's perspective"""
     if project not in project_totals:
         return None, []
 
-    # Get all projects that connect to this project
-    connected_projects = []
-    for other_project in all_projects:
-        if other_project != project and connection_matrix[project][other_project] > 0:
-            connected_projects.append(other_project)
-
-    # Calculate network connections for each connected project
-    project_connections = []
-    for other_project in connected_projects:
-        # Count how many projects in this network the other_project connects to
-        network_connections = 0
-
-        # Check connections to other projects in this project's network (including central project)
-        for third_project in connected_projects + [project]:
-            if third_project != other_project and connection_matrix[other_project][third_project] > 0:
-                network_connections += 1
-
-        # Get direct link count and total links
-        direct_links = connection_matrix[project][other_project]
-        total_links = project_totals[other_project]
-
-        # Classify ring
-        if network_connections >= 6:
-            ring = "Hub Ring (6+ connections)"
-        elif network_connections >= 4:
-            ring = "High Ring (4-5 connections)"
-        elif network_connections >= 2:
-            ring = "Medium Ring (2-3 connections)"
-        else:
-            ring = "Low Ring (1 connection)"
-
-        project_connections.append({
-            'connected_project': other_project,
-            'network_connections': network_connections,
-            'direct_links': direct_links,
-            'total_links': total_links,
-            'ring_classification': ring
-        })
-
-    # Sort by network connections desc, then direct links desc
-    project_connections.sort(key=lambda x: (x['network_connections'], x['direct_links']), reverse=True)
-
-    return project_totals[project], project_connections
+    return project_totals[project], classification.perspective(project)
 
 def generate_project_name_expansions():
     """Generate expanded names for project codes"""
@@ -185,15 +138,84 @@ def generate_project_name_expansions():
     }
     return expansions
 
-def generate_all_project_tables():
-    """Generate tables for all projects"""
-    df, all_projects, project_totals, connection_matrix = load_and_analyze_connections()
+def project_section(project_code, total_links, connections, expansions):
+    """Markdown table section for one project's perspective"""
+    project_name = expansions.get(project_code, 'Unknown')
+    parts = [f"## {project_code} ({project_name}) - {len(connections)} Direct Connections\n\n"]
+
+    parts.append(f"**Total Links**: {total_links:,}\n\n")
+
+    parts.append("| Source→Target | Network Connections | Direct Links | Total Links | Ring Classification |\n")
+    parts.append("|---------------|---------------------|--------------|-------------|--------------------|\n")
+
+    # Generate table rows
+    for conn in connections:
+        parts.append(f"| {project_code}→{conn['connected_project']} | {conn['network_connections']} | {conn['direct_links']:,} | {conn['total_links']:,} | {conn['ring_classification']} |\n")
+
+    # Add ring distribution summary
+    ring_counts = defaultdict(int)
+    for conn in connections:
+        ring_counts[conn['ring_classification']] += 1
+
+    parts.append(f"\n**Ring Distribution**: "
+                 f"Hub: {ring_counts['Hub Ring (6+ connections)']}, "
+                 f"High: {ring_counts['High Ring (4-5 connections)']}, "
+                 f"Medium: {ring_counts['Medium Ring (2-3 connections)']}, "
+                 f"Low: {ring_counts['Low Ring (1 connection)']}\n\n")
+
+    # Add top connections summary
+    if len(connections) > 0:
+        top_3 = connections[:3]
+        top_descriptions = []
+        for conn in top_3:
+            if conn['direct_links'] >= 100:
+                top_descriptions.append(f"{conn['connected_project']} ({conn['direct_links']:,} links)")
+            else:
+                top_descriptions.append(f"{conn['connected_project']} ({conn['direct_links']} links)")
+        parts.append("**Top Connections**: " + ", ".join(top_descriptions) + "\n\n")
+
+    parts.append("---\n\n")
+    return ''.join(parts)
+
+# Analysis state shared with section workers (set by init_section_worker)
+_section_state = None
+
+def init_section_worker(project_totals, classification, expansions):
+    """Keep the analysis state in this process for build_project_section"""
+    global _section_state
+    _section_state = (project_totals, classification, expansions)
+
+def build_project_section(project_code):
+    """Section text for one project ('' when it has no connections)"""
+    project_totals, classification, expansions = _section_state
+    total_links, connections = analyze_project_perspective(project_code, project_totals, classification)
+    return project_section(project_code, total_links, connections, expansions) if connections else ''
+
+def split_project_sections(md_content):
+    """{project code: section text} from a previously generated report"""
+    sections = {}
+    for chunk in re.split(r'(?m)^(?=## )', md_content):
+        match = re.match(r'## (\S+) \(.*\) - \d+ Direct Connections\n', chunk)
+        if match and '---\n\n' in chunk:
+            sections[match.group(1)] = chunk[:chunk.rindex('---\n\n') + len('---\n\n')]
+    return sections
+
+def iter_project_tables(csv_file=DEFAULT_CSV_FILE, previous_sections=None, affected=None, workers=1):
+    """Yield the report for all projects chunk by chunk, project sections in rank order.
+
+    With previous_sections and a set of affected projects, only the affected
+    sections are recomputed; every other section is copied from the old report.
+    Sections are built by a pool of `workers` processes when workers > 1.
+    """
+    df, link_matrix, project_totals, classification = load_and_analyze_connections(csv_file)
+    all_projects = link_matrix.projects
     expansions = generate_project_name_expansions()
+    previous_sections = previous_sections or {}
 
     # Sort projects by total links (descending)
     sorted_projects = sorted(project_totals.items(), key=lambda x: x[1], reverse=True)
 
-    md_content = """# Complete Project Connection Tables - All 98 Projects
+    yield """# Complete Project Connection Tables - All 98 Projects
 ## Individual Project Perspectives (Unresolved Issues, 90-Day Activity)
 
 Generated from project relationship data showing each project's perspective with connection tables matching the affinity diagram format.
@@ -201,89 +223,75 @@ Generated from project relationship data showing each project's perspective with
 ### Summary Statistics
 """
 
-    md_content += f"- **Total Projects Analyzed**: {len(all_projects)}\n"
-    md_content += f"- **Total Relationship Records**: {len(df):,}\n"
-    md_content += f"- **Total Link Count**: {df['LinkCount'].sum():,}\n"
-    md_content += f"- **Average Links per Project**: {df['LinkCount'].sum() / len(all_projects):.1f}\n\n"
+    yield (f"- **Total Projects Analyzed**: {len(all_projects)}\n"
+           f"- **Total Relationship Records**: {len(df):,}\n"
+           f"- **Total Link Count**: {df['LinkCount'].sum():,}\n"
+           f"- **Average Links per Project**: {df['LinkCount'].sum() / len(all_projects):.1f}\n\n")
 
-    md_content += "### Project Rankings by Total Links\n\n"
-    md_content += "| Rank | Project Code | Project Name | Total Links | Direct Connections |\n"
-    md_content += "|------|--------------|--------------|-------------|-------------------|\n"
+    yield "### Project Rankings by Total Links\n\n"
+    yield "| Rank | Project Code | Project Name | Total Links | Direct Connections |\n"
+    yield "|------|--------------|--------------|-------------|-------------------|\n"
 
     for rank, (project, total_links) in enumerate(sorted_projects[:20], 1):
         project_name = expansions.get(project, 'Unknown')
-        direct_count = len([p for p in all_projects if connection_matrix[project][p] > 0])
-        md_content += f"| {rank:2d} | **{project}** | {project_name} | {total_links:,} | {direct_count} |\n"
-
-    md_content += "\n---\n\n"
-
-    # Generate tables for all projects
-    for project_code, total_links in sorted_projects:
-        if total_links > 0:  # Only include projects with connections
-            total_links, connections = analyze_project_perspective(project_code, df, all_projects, project_totals, connection_matrix)
-
-            if connections:
-                project_name = expansions.get(project_code, 'Unknown')
-                md_content += f"## {project_code} ({project_name}) - {len(connections)} Direct Connections\n\n"
-
-                md_content += f"**Total Links**: {total_links:,}\n\n"
-
-                md_content += "| Source→Target | Network Connections | Direct Links | Total Links | Ring Classification |\n"
-                md_content += "|---------------|---------------------|--------------|-------------|--------------------|\n"
-
-                # Generate table rows
-                for conn in connections:
-                    target_name = expansions.get(conn['connected_project'], conn['connected_project'])
-                    md_content += f"| {project_code}→{conn['connected_project']} | {conn['network_connections']} | {conn['direct_links']:,} | {conn['total_links']:,} | {conn['ring_classification']} |\n"
-
-                # Add ring distribution summary
-                ring_counts = defaultdict(int)
-                for conn in connections:
-                    ring_counts[conn['ring_classification']] += 1
-
-                md_content += f"\n**Ring Distribution**: "
-                md_content += f"Hub: {ring_counts['Hub Ring (6+ connections)']}, "
-                md_content += f"High: {ring_counts['High Ring (4-5 connections)']}, "
-                md_content += f"Medium: {ring_counts['Medium Ring (2-3 connections)']}, "
-                md_content += f"Low: {ring_counts['Low Ring (1 connection)']}\n\n"
-
-                # Add top connections summary
-                if len(connections) > 0:
-                    md_content += "**Top Connections**: "
-                    top_3 = connections[:3]
-                    top_descriptions = []
-                    for conn in top_3:
-                        if conn['direct_links'] >= 100:
-                            top_descriptions.append(f"{conn['connected_project']} ({conn['direct_links']:,} links)")
-                        else:
-                            top_descriptions.append(f"{conn['connected_project']} ({conn['direct_links']} links)")
-                    md_content += ", ".join(top_descriptions) + "\n\n"
-
-                md_content += "---\n\n"
-
-    md_content += f"\n## Analysis Notes\n\n"
-    md_content += f"- **Network Connections**: Number of other projects this project connects to within the central project's network\n"
-    md_content += f"- **Direct Links**: Actual Jira issue link count between the two projects\n"
-    md_content += f"- **Total Links**: Sum of all links for the target project across the entire network\n"
-    md_content += f"- **Ring Classification**: Hub (6+), High (4-5), Medium (2-3), Low (1) network connections\n\n"
-
-    md_content += f"**Data Source**: Issue Links - GET Project to Project Links - Filtered Unresolved 90Day\n"
-    md_content += f"**Generated**: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-
-    return md_content
+        direct_count = np.count_nonzero(link_matrix.row(project))
+        yield f"| {rank:2d} | **{project}** | {project_name} | {total_links:,} | {direct_count} |\n"
+
+    yield "\n---\n\n"
+
+    # Generate tables for all projects (only those with connections), reusing unaffected sections
+    ranked = [project for project, total_links in sorted_projects if total_links > 0]
+    reused = {project for project in ranked
+              if affected is not None and project not in affected and project in previous_sections}
+    sections = ordered_map(build_project_section, [p for p in ranked if p not in reused], workers,
+                           init_section_worker, (project_totals, classification, expansions))
+
+    for project_code in ranked:
+        yield previous_sections[project_code] if project_code in reused else next(sections)
+
+    if affected is not None:
+        print(f"Reused {len(reused)} unchanged project sections")
+
+    yield (f"\n## Analysis Notes\n\n"
+           f"- **Network Connections**: Number of other projects this project connects to within the central project's network\n"
+           f"- **Direct Links**: Actual Jira issue link count between the two projects\n"
+           f"- **Total Links**: Sum of all links for the target project across the entire network\n"
+           f"- **Ring Classification**: Hub (6+), High (4-5), Medium (2-3), Low (1) network connections\n\n")
+
+    yield f"**Data Source**: Issue Links - GET Project to Project Links - Filtered Unresolved 90Day\n"
+    yield f"**Generated**: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+
+def generate_all_project_tables(csv_file=DEFAULT_CSV_FILE, previous_sections=None, affected=None, workers=1):
+    """Generate tables for all projects as one string"""
+    return ''.join(iter_project_tables(csv_file, previous_sections, affected, workers))
+
+def update_project_tables(affected, csv_file=DEFAULT_CSV_FILE, output_file=DEFAULT_OUTPUT_FILE, workers=1):
+    """Rewrite the report, recomputing only the sections of the affected projects"""
+    try:
+        with open(output_file, encoding='utf-8') as f:
+            previous_sections = split_project_sections(f.read())
+    except OSError:
+        previous_sections = {}
+
+    write_report(iter_project_tables(csv_file, previous_sections, affected, workers), output_file)
+
+    print(f"Project tables updated: {output_file}")
 
 def main():
     """Generate comprehensive project tables for all projects"""
-    print("Generating tables for all projects...")
+    parser = argparse.ArgumentParser(description='Generate connection tables for every project')
+    parser.add_argument('--csv', default=DEFAULT_CSV_FILE, help='Project-to-project links CSV')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_FILE, help='Markdown report to write')
+    parser.add_argument('--workers', type=int, default=1, help='Processes building project sections')
+    args = parser.parse_args()
 
-    md_content = generate_all_project_tables()
+    print("Generating tables for all projects...")
 
-    output_file = 'ALL_PROJECT_CONNECTION_TABLES.md'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(md_content)
+    # Sections are streamed to the file in rank order as they are built
+    write_report(iter_project_tables(args.csv, workers=args.workers), args.output)
 
-    print(f"Complete project tables generated: {output_file}")
+    print(f"Complete project tables generated: {args.output}")
     print("Ready for heatmap generation!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
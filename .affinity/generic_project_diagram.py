@@ -8,18 +8,28 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
+from edge_batches import draw_edge_batches
+from snapshot_store import LINK_COLUMNS, load_export
+from stage_trace import traced
 import warnings
 warnings.filterwarnings('ignore')
 
+# Edge styles by class, in drawing order: ring-to-ring edges (low_to_low .. hub_to_hub)
+# are light gray dashed hairlines, lines to the center project are medium blue
+RING_EDGE_STYLE = dict(alpha=1.0, width=0.1, edge_color='lightgray', style='dashed')
+CENTER_EDGE_STYLE = dict(alpha=0.5, width=0.2, edge_color='mediumblue', style='solid')
+EDGE_CLASS_STYLES = [RING_EDGE_STYLE] * 10 + [CENTER_EDGE_STYLE]
+
+@traced()
 def load_project_data(csv_file):
     """Load and process the project relationship data"""
-    df = pd.read_csv(csv_file)
+    df = load_export(csv_file, LINK_COLUMNS)
     
     # Clean up the data
     df['LinkCount'] = pd.to_numeric(df['LinkCount'], errors='coerce').fillna(0)
     
     # Create project summary (group by ProjectKey and sum LinkCount)
-    project_summary = df.groupby('ProjectKey')['LinkCount'].sum().reset_index()
+    project_summary = df.groupby('ProjectKey', observed=True)['LinkCount'].sum().reset_index()
     project_summary = project_summary.sort_values('LinkCount', ascending=False)
     
     print(f"Found {len(project_summary)} unique projects")
@@ -27,6 +37,7 @@ def load_project_data(csv_file):
     
     return project_summary
 
+@traced()
 def create_network_graph(df):
     """Create a network graph from the project data"""
     G = nx.Graph()
@@ -60,6 +71,7 @@ def create_network_graph(df):
     
     return G
 
+@traced()
 def create_generic_project_diagram(df, center_project, output_file='generic_project_diagram.png'):
     """Create a generic project-centered diagram with custom styling"""
     
@@ -160,140 +172,28 @@ def create_generic_project_diagram(df, center_project, output_file='generic_proj
     medium_nodes = [n for n in center_medium_connections if n in pos]
     low_nodes = [n for n in center_low_connections if n in pos]
     
-    # Categorize edges with custom styling (no hub connections shown)
-    center_edges = []           # Center to all layers (no lines)
-    high_to_high = []          # High to High (blue lines)
-    high_to_medium = []        # High to Medium (blue lines)
-    high_to_low = []           # High to Low (blue lines)
-    medium_to_medium = []      # Medium to Medium (green lines)
-    medium_to_low = []         # Medium to Low (green lines)
-    low_to_low = []            # Low to Low (gray lines)
-    # Add missing edge categories
-    hub_to_high = []           # Hub to High (orange lines)
-    hub_to_medium = []         # Hub to Medium (orange lines)
-    hub_to_low = []            # Hub to Low (orange lines)
-    hub_to_hub = []            # Hub to Hub (orange lines)
-    
-    for edge in G.edges():
-        source, target = edge
-        
-        # Only include edges where both nodes are in center project's direct network
-        if source not in center_network_nodes or target not in center_network_nodes:
-            continue
-        
-        # Skip edges where nodes are not in our position dictionary
-        if source not in pos or target not in pos:
-            continue
-        
-        # Check if edge involves center project (no lines to center)
-        if source == center_project or target == center_project:
-            center_edges.append(edge)
-            continue
-        
-        # Determine layer categories for connections between center project's direct connections
-        source_is_hub = source in center_hub_connections
-        source_is_high = source in center_high_connections
-        source_is_medium = source in center_medium_connections
-        source_is_low = source in center_low_connections
-        
-        target_is_hub = target in center_hub_connections
-        target_is_high = target in center_high_connections
-        target_is_medium = target in center_medium_connections
-        target_is_low = target in center_low_connections
-        
-        # Categorize edges with custom styling (include all connections)
-        if source_is_hub or target_is_hub:
-            if source_is_hub and target_is_hub:
-                hub_to_hub.append(edge)
-            elif source_is_hub and target_is_high:
-                hub_to_high.append(edge)
-            elif source_is_hub and target_is_medium:
-                hub_to_medium.append(edge)
-            elif source_is_hub and target_is_low:
-                hub_to_low.append(edge)
-            elif target_is_hub and source_is_high:
-                hub_to_high.append(edge)
-            elif target_is_hub and source_is_medium:
-                hub_to_medium.append(edge)
-            elif target_is_hub and source_is_low:
-                hub_to_low.append(edge)
-        elif source_is_high or target_is_high:
-            if source_is_high and target_is_high:
-                high_to_high.append(edge)
-            elif source_is_high and target_is_medium:
-                high_to_medium.append(edge)
-            elif source_is_high and target_is_low:
-                high_to_low.append(edge)
-            elif target_is_high and source_is_medium:
-                high_to_medium.append(edge)
-            elif target_is_high and source_is_low:
-                high_to_low.append(edge)
-        elif source_is_medium or target_is_medium:
-            if source_is_medium and target_is_medium:
-                medium_to_medium.append(edge)
-            elif source_is_medium and target_is_low:
-                medium_to_low.append(edge)
-            elif target_is_medium and source_is_low:
-                medium_to_low.append(edge)
-        elif source_is_low and target_is_low:
-            low_to_low.append(edge)
-    
-    # Draw edges in order (inner to outer for proper layering - hub over high over medium over low)
-    
-    # Draw low to low connections (light gray dashed lines) - bottom layer
-    if low_to_low:
-        nx.draw_networkx_edges(G, pos, edgelist=low_to_low, alpha=1.0, width=0.1, 
-                              edge_color='lightgray', style='dashed')
-    
-    # Draw medium to low connections (light gray dashed lines)
-    if medium_to_low:
-        nx.draw_networkx_edges(G, pos, edgelist=medium_to_low, alpha=1.0, width=0.1, 
-                              edge_color='lightgray', style='dashed')
-    
-    # Draw medium to medium connections (light gray dashed lines)
-    if medium_to_medium:
-        nx.draw_networkx_edges(G, pos, edgelist=medium_to_medium, alpha=1.0, width=0.1, 
-                              edge_color='lightgray', style='dashed')
-    
-    # Draw high to low connections (light gray dashed lines)
-    if high_to_low:
-        nx.draw_networkx_edges(G, pos, edgelist=high_to_low, alpha=1.0, width=0.1, 
-                              edge_color='lightgray', style='dashed')
-    
-    # Draw high to medium connections (light gray dashed lines)
-    if high_to_medium:
-        nx.draw_networkx_edges(G, pos, edgelist=high_to_medium, alpha=1.0, width=0.1, 
-                              edge_color='lightgray', style='dashed')
-    
-    # Draw high to high connections (light gray dashed lines)
-    if high_to_high:
-        nx.draw_networkx_edges(G, pos, edgelist=high_to_high, alpha=1.0, width=0.1, 
-                              edge_color='lightgray', style='dashed')
-    
-    # Draw hub to low connections (light gray dashed lines)
-    if hub_to_low:
-        nx.draw_networkx_edges(G, pos, edgelist=hub_to_low, alpha=1.0, width=0.1, 
-                              edge_color='lightgray', style='dashed')
-    
-    # Draw hub to medium connections (light gray dashed lines)
-    if hub_to_medium:
-        nx.draw_networkx_edges(G, pos, edgelist=hub_to_medium, alpha=1.0, width=0.1, 
-                              edge_color='lightgray', style='dashed')
-    
-    # Draw hub to high connections (light gray dashed lines)
-    if hub_to_high:
-        nx.draw_networkx_edges(G, pos, edgelist=hub_to_high, alpha=1.0, width=0.1, 
-                              edge_color='lightgray', style='dashed')
-    
-    # Draw hub to hub connections (light gray dashed lines)
-    if hub_to_hub:
-        nx.draw_networkx_edges(G, pos, edgelist=hub_to_hub, alpha=1.0, width=0.1, 
-                              edge_color='lightgray', style='dashed')
-    
-    # Draw center edges - lines to center project (medium blue, 50% transparent)
-    if center_edges:
-        nx.draw_networkx_edges(G, pos, edgelist=center_edges, alpha=0.5, width=0.2, 
-                              edge_color='mediumblue', style='solid')
+    # Ring of every node in the diagram: 1=Low .. 4=Hub, 5=center
+    ring_of = {center_project: 5}
+    for code, ring_projects in ((4, center_hub_connections), (3, center_high_connections),
+                                (2, center_medium_connections), (1, center_low_connections)):
+        ring_of.update(dict.fromkeys(ring_projects, code))
+
+    # Only edges where both nodes are in center project's direct network (and positioned)
+    edges = [(source, target) for source, target in G.edges()
+             if source in center_network_nodes and target in center_network_nodes
+             and source in pos and target in pos]
+    source_ring = np.array([ring_of[source] for source, _ in edges], dtype=np.intp)
+    target_ring = np.array([ring_of[target] for _, target in edges], dtype=np.intp)
+
+    # Edge class from the (outer, inner) ring pair: low_to_low=0, medium_to_low=1, ..., hub_to_hub=9;
+    # every edge touching the center project is class 10
+    outer = np.maximum(source_ring, target_ring)
+    inner = np.minimum(source_ring, target_ring)
+    edge_classes = np.where(outer == 5, 10, outer * (outer - 1) // 2 + inner - 1)
+
+    # Draw edges in class order (low to low at the bottom, center lines on top); the ten
+    # ring-to-ring classes share one style and so are drawn as a single LineCollection
+    draw_edge_batches(G, pos, edges, edge_classes, EDGE_CLASS_STYLES)
     
     # Draw nodes by category with different sizes and colors
     node_sizes = {}
@@ -576,6 +476,7 @@ def create_generic_project_diagram(df, center_project, output_file='generic_proj
     except:
         # Fallback save method
         plt.savefig(output_file, dpi=150, bbox_inches='tight')
+    plt.close()
     
     # plt.show()  # Removed to allow batch processing without pausing
     
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Shared Heatmap Matrix Builder
+Builds the top-N project connection matrix and its cell labels for any edge table in vectorized passes
+"""
+
+import pandas as pd
+import numpy as np
+from stage_trace import traced
+
+# Beyond this many cells the labels overlap and take longer to lay out than they are worth
+MAX_ANNOTATED_CELLS = 50 * 50
+
+@traced()
+def build_heatmap_matrix(df, source_col='ProjectKey', target_col='ConnectedProject', count_col='LinkCount',
+                         top_n=20, exclude=(), symmetric=True, self_links=False, self_link_totals=2):
+    """Top-N connection matrix, ranked project list and every project's total.
+
+    - exclude: projects dropped (with all their rows) before ranking
+    - symmetric: cell [i, j] sums both directions; otherwise it is the i->j count only
+    - self_links: keep self-link counts on the diagonal instead of zeroing it
+    - self_link_totals: how many times a self-link row counts towards its project's total
+
+    Ties in the ranking keep the order in which projects first appear in the
+    edge table, as the row-by-row totals dictionaries did.
+    Returns (matrix, top_projects, sorted_totals) where sorted_totals is a list
+    of (project, total) pairs in rank order.
+    """
+    if len(exclude):
+        excluded = list(exclude)
+        df = df[~df[source_col].isin(excluded) & ~df[target_col].isin(excluded)]
+
+    counts = pd.to_numeric(df[count_col], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+    endpoints = pd.Categorical(pd.concat([df[source_col], df[target_col]], ignore_index=True).astype(str))
+    projects = endpoints.categories
+    codes = endpoints.codes.astype(np.intp)
+    sources, targets = codes[:len(df)], codes[len(df):]
+    cross = sources != targets
+    n = len(projects)
+
+    # Every row counts once for its source and target; self-link rows count self_link_totals times
+    totals = np.bincount(sources, weights=np.where(cross, counts, counts * (self_link_totals > 0)), minlength=n)
+    totals += np.bincount(targets, weights=np.where(cross, counts, counts * (self_link_totals > 1)), minlength=n)
+    totals = totals.astype(np.int64)
+
+    # Rank by total (descending), stable over first-seen order
+    first_seen = pd.unique(np.column_stack([sources, targets]).ravel())
+    ranked = first_seen[np.argsort(-totals[first_seen], kind='stable')]
+    top = ranked[:top_n]
+
+    # Scatter-add every row whose endpoints are both in the top N
+    position = np.full(n, -1, dtype=np.intp)
+    position[top] = np.arange(len(top))
+    rows, cols = position[sources], position[targets]
+    keep = (rows >= 0) & (cols >= 0)
+
+    matrix = np.zeros((len(top), len(top)))
+    np.add.at(matrix, (rows[keep], cols[keep]), counts[keep])
+    if symmetric:
+        mirror = keep & cross
+        np.add.at(matrix, (cols[mirror], rows[mirror]), counts[mirror])
+    if not self_links:
+        np.fill_diagonal(matrix, 0)
+
+    sorted_totals = [(projects[i], int(totals[i])) for i in ranked.tolist()]
+    return matrix, [projects[i] for i in top.tolist()], sorted_totals
+
+@traced()
+def format_annotations(values, abbreviate=True, blank_zeros=True, max_cells=MAX_ANNOTATED_CELLS):
+    """Cell labels for a heatmap as one string array, or False when the matrix is too dense to label.
+
+    - abbreviate: values of 1000 and over are shown as '1.2k'
+    - blank_zeros: cells without links get an empty label instead of '0'
+    - max_cells: largest matrix that is still annotated (None for no limit)
+
+    Pass the result as annot= with fmt='' to seaborn.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if max_cells is not None and values.size > max_cells:
+        return False
+
+    labels = np.char.mod('%d', np.nan_to_num(values).astype(np.int64))
+    if abbreviate:
+        labels = np.where(values >= 1000, np.char.mod('%.1fk', values / 1000), labels)
+    if blank_zeros:
+        labels = np.where(values > 0, labels, '')
+    return labels
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tiled Full-Portfolio Heatmap
+Renders the all-projects heatmap as XYZ zoom-level tiles built from link matrix blocks, rewriting only tiles whose block changed
+"""
+
+import os
+import json
+import argparse
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.image import imsave
+from link_matrix import DEFAULT_CSV_FILE, open_link_matrix
+from render_cache import fingerprint
+from stage_trace import traced
+
+try:
+    import scipy.sparse as sparse
+except ImportError:  # Link matrices are all dense then
+    sparse = None
+
+DEFAULT_TILE_DIR = 'project_connection_heatmap_tiles'
+MANIFEST_NAME = 'tiles.json'
+TILE_SIZE = 256
+CELL_PIXELS = 16      # size of one project cell at the deepest zoom level
+STRIP_CELLS = 1024    # matrix rows read per strip when a tile has to be reduced
+
+def project_order(matrix):
+    """Row order of the full heatmap: most-linked projects first, keeping index order for ties"""
+    return np.argsort(-np.asarray(matrix.sum(axis=1)).ravel(), kind='stable')
+
+def max_zoom_level(n, tile_size=TILE_SIZE, cell_pixels=CELL_PIXELS):
+    """Deepest zoom level, at which every cell is cell_pixels wide; level 0 is one tile for the whole matrix"""
+    cells_per_tile = tile_size // cell_pixels
+    tiles = max(1, -(-n // cells_per_tile))
+    return int(np.ceil(np.log2(tiles)))
+
+def matrix_block(matrix, rows, cols):
+    """Dense block of the given rows and columns of a dense or scipy.sparse matrix"""
+    if sparse is not None and sparse.issparse(matrix):
+        return matrix[rows][:, cols].toarray()
+    return matrix[np.ix_(rows, cols)]
+
+def tile_values(matrix, order, z, x, y, max_zoom, tile_size=TILE_SIZE, cell_pixels=CELL_PIXELS):
+    """Log-scaled cell values one tile shows, one value per drawn block (-1 outside the matrix).
+
+    Below the deepest level a tile spans more cells than it has pixels; each
+    pixel then shows the strongest link among the cells it covers, so single
+    heavy links stay visible when zoomed out. The matrix is read in row strips,
+    never as a whole.
+    """
+    span = (tile_size // cell_pixels) << (max_zoom - z)
+    rows = order[y * span:(y + 1) * span]
+    cols = order[x * span:(x + 1) * span]
+    factor = max(1, span // tile_size)
+    size = span // factor
+
+    values = np.full((size, size), -1.0)
+    strip = max(factor, STRIP_CELLS // factor * factor)
+    for start in range(0, len(rows), strip):
+        block = np.full((min(strip, span - start), span), -1.0)
+        block[:min(strip, len(rows) - start), :len(cols)] = np.log1p(
+            np.asarray(matrix_block(matrix, rows[start:start + strip], cols), dtype=np.float64))
+        reduced = block.reshape(-1, factor, size, factor).max(axis=(1, 3))
+        values[start // factor:start // factor + len(reduced)] = reduced
+    return values
+
+def tile_image(values, vmax, tile_size=TILE_SIZE, cmap='YlOrRd'):
+    """RGBA tile for a block of log values, cells outside the matrix left transparent"""
+    rgba = colormaps[cmap](values / vmax if vmax > 0 else np.zeros_like(values))
+    rgba[values < 0] = 0
+    scale = tile_size // len(values)
+    return rgba.repeat(scale, axis=0).repeat(scale, axis=1)
+
+def read_manifest(output_dir):
+    """Tile fingerprints from the previous run ({} when there is none)"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f).get('tiles', {})
+    except (OSError, ValueError):
+        return {}
+
+@traced()
+def render_tiles(link_matrix, output_dir=DEFAULT_TILE_DIR, tile_size=TILE_SIZE, cell_pixels=CELL_PIXELS, cmap='YlOrRd'):
+    """Write {z}/{x}/{y}.png tiles for every zoom level and return (written, unchanged, removed).
+
+    Each tile is fingerprinted from the values it shows plus the colour scale;
+    tiles whose fingerprint matches the previous run are left on disk as-is.
+    """
+    matrix = link_matrix.matrix
+    order = project_order(matrix)
+    n = len(order)
+    max_zoom = max_zoom_level(n, tile_size, cell_pixels)
+    vmax = float(np.log1p(matrix.max())) if n else 0.0
+
+    previous = read_manifest(output_dir)
+    tiles = {}
+    written = unchanged = 0
+
+    for z in range(max_zoom + 1):
+        span = (tile_size // cell_pixels) << (max_zoom - z)
+        count = max(1, -(-n // span))
+        for y in range(count):
+            for x in range(count):
+                values = tile_values(matrix, order, z, x, y, max_zoom, tile_size, cell_pixels)
+                name = f'{z}/{x}/{y}'
+                path = os.path.join(output_dir, str(z), str(x), f'{y}.png')
+                tiles[name] = fingerprint(name, values, vmax, tile_size, cmap)
+
+                if previous.get(name) == tiles[name] and os.path.exists(path):
+                    unchanged += 1
+                    continue
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                imsave(path, tile_image(values, vmax, tile_size, cmap))
+                written += 1
+
+    # Tiles of a larger previous matrix no longer exist at this size
+    removed = 0
+    for name in set(previous) - set(tiles):
+        path = os.path.join(output_dir, f'{name}.png')
+        if os.path.exists(path):
+            os.remove(path)
+            removed += 1
+
+    # Axis labels and geometry for a viewer, plus fingerprints for the next run
+    manifest = {
+        'tile_size': tile_size,
+        'cell_pixels': cell_pixels,
+        'max_zoom': max_zoom,
+        'vmax': vmax,
+        'projects': [link_matrix.projects[i] for i in order.tolist()],
+        'tiles': tiles,
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    temp_file = os.path.join(output_dir, f'{MANIFEST_NAME}.{os.getpid()}.tmp')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(temp_file, os.path.join(output_dir, MANIFEST_NAME))
+
+    return written, unchanged, removed
+
+def create_tiled_heatmap(csv_file=DEFAULT_CSV_FILE, output_dir=DEFAULT_TILE_DIR, **options):
+    """Render or refresh the tiled full heatmap for an export"""
+    link_matrix = open_link_matrix(csv_file)
+    written, unchanged, removed = render_tiles(link_matrix, output_dir, **options)
+    print(f"Tiled heatmap ({len(link_matrix)} projects): {written} tiles written, "
+          f"{unchanged} unchanged, {removed} removed -> {output_dir}")
+    return written, unchanged, removed
+
+def main():
+    """Generate the tiled full-portfolio heatmap"""
+    parser = argparse.ArgumentParser(description='Render the full project heatmap as XYZ zoom-level tiles')
+    parser.add_argument('--csv', default=DEFAULT_CSV_FILE, help='Project-to-project links CSV')
+    parser.add_argument('--output-dir', default=DEFAULT_TILE_DIR, help='Tile directory ({z}/{x}/{y}.png)')
+    parser.add_argument('--tile-size', type=int, default=TILE_SIZE, help='Tile width and height in pixels')
+    parser.add_argument('--cell-pixels', type=int, default=CELL_PIXELS, help='Cell size at the deepest zoom level')
+    args = parser.parse_args()
+
+    if args.cell_pixels & (args.cell_pixels - 1) or args.tile_size % args.cell_pixels:
+        parser.error('--cell-pixels must be a power of two that divides --tile-size')
+
+    create_tiled_heatmap(args.csv, args.output_dir, tile_size=args.tile_size, cell_pixels=args.cell_pixels)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Incremental Link Export Update
+Diffs a new project-to-project export against the previous snapshot and regenerates only what changed
+"""
+
+import os
+import re
+import glob
+import shutil
+import argparse
+import pandas as pd
+from link_matrix import build_pair_index
+from render_cache import RenderCache
+from ring_diagram_engine import DEFAULT_CSV_FILE, RingDiagramEngine
+from generate_all_project_tables import DEFAULT_OUTPUT_FILE, update_project_tables
+import create_connection_heatmap
+import create_simple_heatmap
+from heatmap_tiles import create_tiled_heatmap
+from snapshot_store import LINK_COLUMNS, load_export
+from stage_trace import traced
+
+DEFAULT_SNAPSHOT_FILE = '.link_snapshot/previous_links.csv'
+
+# Why a center has to be regenerated, strongest first
+REASON_DIRECT = 'direct'   # one of its own links changed
+REASON_RING = 'ring'       # a link between two of its neighbors appeared or disappeared
+REASON_TOTALS = 'totals'   # a neighbor's total link count changed
+
+@traced()
+def diff_link_tables(old_df, new_df):
+    """Project pairs whose link count differs between two exports (direction ignored)"""
+    old_weights = build_pair_index(old_df).pair_weights
+    new_weights = build_pair_index(new_df).pair_weights
+
+    changes = []
+    for pair in sorted(set(old_weights) | set(new_weights)):
+        old_links = old_weights.get(pair, 0)
+        new_links = new_weights.get(pair, 0)
+        if old_links != new_links:
+            changes.append((pair[0], pair[1], old_links, new_links))
+
+    return pd.DataFrame(changes, columns=['Project1', 'Project2', 'OldLinks', 'NewLinks'])
+
+def neighbor_sets(*dfs):
+    """{project: neighbors} over the union of the given edge tables, without self-links"""
+    neighbors = {}
+    for df in dfs:
+        for source, target in zip(df['ProjectKey'], df['ConnectedProject']):
+            neighbors.setdefault(source, set())
+            neighbors.setdefault(target, set())
+            if source != target:
+                neighbors[source].add(target)
+                neighbors[target].add(source)
+    return neighbors
+
+@traced()
+def affected_centers(old_df, new_df, changes):
+    """{center: reason} for every center whose diagram or table section can differ.
+
+    A changed pair touches its two endpoints directly and changes both
+    endpoints' totals, which every neighbor shows in its legend table. When the
+    pair's link appears or disappears, centers linked to both endpoints also
+    see a different network connection count (second-hop ring change).
+    """
+    neighbors = neighbor_sets(old_df, new_df)
+    strength = {REASON_TOTALS: 0, REASON_RING: 1, REASON_DIRECT: 2}
+    affected = {}
+
+    def mark(center, reason):
+        if strength[reason] > strength.get(affected.get(center), -1):
+            affected[center] = reason
+
+    for project1, project2, old_links, new_links in changes.itertuples(index=False):
+        neighbors1 = neighbors.get(project1, set())
+        neighbors2 = neighbors.get(project2, set())
+        for center in neighbors1 | neighbors2:
+            mark(center, REASON_TOTALS)
+        if project1 != project2 and (old_links == 0 or new_links == 0):
+            for center in neighbors1 & neighbors2:
+                mark(center, REASON_RING)
+        mark(project1, REASON_DIRECT)
+        mark(project2, REASON_DIRECT)
+
+    return affected
+
+def existing_diagrams(center, output_dir='.'):
+    """Weighted-sum named PNGs already written for a center"""
+    pattern = re.compile(r'^\d{4}_\d{4}_\d{4}_\d{4}_\d{4}_\d{4}_' + re.escape(center) + r'\.png$')
+    return [path for path in glob.glob(os.path.join(output_dir, f'*_{center}.png'))
+            if pattern.match(os.path.basename(path))]
+
+@traced()
+def regenerate_diagrams(new_df, centers, cache=None):
+    """Render the affected centers and drop their diagrams named after the old counts"""
+    engine = RingDiagramEngine(new_df, cache=cache)
+    generated = []
+
+    for center in sorted(centers):
+        stale = existing_diagrams(center)
+        filename = engine.generate(center) if center in engine.G else None
+        for path in stale:
+            if os.path.basename(path) != filename:
+                os.remove(path)
+                print(f"Removed outdated diagram: {path}")
+        if filename:
+            generated.append(filename)
+
+    return generated
+
+@traced()
+def regenerate_heatmaps(csv_file, cache, tiles=False):
+    """Re-run the heatmaps; the render cache skips every view whose matrix slice is unchanged"""
+    matrix, project_totals, _ = create_connection_heatmap.load_and_process_data(csv_file)
+    create_connection_heatmap.create_full_heatmap(matrix, project_totals, cache=cache)
+    create_connection_heatmap.create_top_projects_heatmap(matrix, project_totals, top_n=30, cache=cache)
+    create_connection_heatmap.create_mega_connections_heatmap(matrix, project_totals, cache=cache)
+    create_simple_heatmap.create_focused_heatmap(cache, csv_file)
+    if tiles:
+        # Only tiles whose matrix block changed are rewritten
+        create_tiled_heatmap(csv_file)
+
+def save_snapshot(csv_file, snapshot_file):
+    """Keep a copy of this export for the next diff"""
+    os.makedirs(os.path.dirname(snapshot_file) or '.', exist_ok=True)
+    shutil.copyfile(csv_file, snapshot_file)
+
+def main():
+    """Regenerate only the diagrams, table sections and heatmaps a new export affects"""
+    parser = argparse.ArgumentParser(description='Incrementally update outputs for a new link export')
+    parser.add_argument('--csv', default=DEFAULT_CSV_FILE, help='New project-to-project links CSV')
+    parser.add_argument('--snapshot', default=DEFAULT_SNAPSHOT_FILE, help='Snapshot of the previous export')
+    parser.add_argument('--tables', default=DEFAULT_OUTPUT_FILE, help='Project tables report to update')
+    parser.add_argument('--no-heatmaps', action='store_true', help='Skip the heatmap refresh')
+    parser.add_argument('--tiles', action='store_true', help='Also refresh the tiled full heatmap')
+    parser.add_argument('--dry-run', action='store_true', help='Only report what would be regenerated')
+    args = parser.parse_args()
+
+    new_df = load_export(args.csv, LINK_COLUMNS)
+    print(f"New export: {len(new_df)} relationship records")
+
+    if os.path.exists(args.snapshot):
+        old_df = load_export(args.snapshot, LINK_COLUMNS)
+        changes = diff_link_tables(old_df, new_df)
+        affected = affected_centers(old_df, new_df, changes)
+        print(f"Previous snapshot: {len(old_df)} relationship records")
+        print(f"Changed project pairs: {len(changes)}")
+        for project1, project2, old_links, new_links in changes.itertuples(index=False):
+            print(f"  {project1} ↔ {project2}: {old_links} -> {new_links}")
+    else:
+        # First run: nothing to diff against, so everything is affected
+        print(f"No snapshot at {args.snapshot}; regenerating every project")
+        affected = {center: REASON_DIRECT for center in neighbor_sets(new_df)}
+
+    print(f"\nAffected centers: {len(affected)}")
+    for reason in (REASON_DIRECT, REASON_RING, REASON_TOTALS):
+        centers = sorted(c for c, r in affected.items() if r == reason)
+        if centers:
+            print(f"  {reason:7s} ({len(centers)}): {', '.join(centers)}")
+
+    if args.dry_run:
+        return
+
+    cache = RenderCache()
+    generated = []
+    if affected:
+        generated = regenerate_diagrams(new_df, affected, cache)
+        update_project_tables(set(affected), args.csv, args.tables)
+        if not args.no_heatmaps:
+            regenerate_heatmaps(args.csv, cache, args.tiles)
+
+    save_snapshot(args.csv, args.snapshot)
+
+    print(f"\n{'='*60}")
+    print(f"INCREMENTAL UPDATE COMPLETED!")
+    print(f"Diagrams regenerated: {len(generated)}")
+    print(cache.summary())
+    print(f"{'='*60}")
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,19 @@ Creates a visual representation of OMF Jira project relationships centered on IN
 (Since ORL is excluded, INI is now the most connected project)
 """
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
+from snapshot_store import load_export
 import warnings
 warnings.filterwarnings('ignore')
 
+# This export lists each project's linked projects in one column instead of one row per pair
+PROJECT_LINK_COLUMNS = ['ProjectKey', 'LinkedProjectKeys', 'LinkCount']
+
 def load_project_data(csv_file):
     """Load and process the project relationship data"""
-    df = pd.read_csv(csv_file)
+    df = load_export(csv_file, PROJECT_LINK_COLUMNS)
     
     # Clean up the data
     df['LinkedProjectKeys'] = df['LinkedProjectKeys'].fillna('')
@@ -291,6 +294,7 @@ def create_ini_centered_diagram(df, output_file='project_affinity_diagram.png'):
         plt.savefig(output_file, dpi=150, bbox_inches='tight')
     
     plt.show()
+    plt.close()
     
     return G
 
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Integer Issue Keys
+Encodes issue keys like DBEAN-2900 as one int64 (project id from a sorted dictionary, issue number) for hashing and joins
+"""
+
+import numpy as np
+import pandas as pd
+
+# PROJECT-123
+ISSUE_KEY_PATTERN = r'(?P<Project>[A-Za-z][A-Za-z0-9_]*)-(?P<Number>\d+)'
+
+# Low bits hold the issue number, the bits above it the project id
+ISSUE_NUMBER_BITS = 32
+MISSING_KEY = -1
+
+def split_issue_keys(keys):
+    """Project prefixes and issue numbers of issue keys (NaN / -1 where a key does not parse).
+
+    Keys repeat heavily in link exports, so the regex only runs over the
+    distinct keys and the results are broadcast back by their factor codes.
+    """
+    positions, uniques = pd.factorize(pd.Series(keys, dtype=object), use_na_sentinel=False)
+    parsed = pd.Series(uniques, dtype=object).astype(str).str.extract(f'^{ISSUE_KEY_PATTERN}$')
+    numbers = pd.to_numeric(parsed['Number'], errors='coerce').fillna(-1).to_numpy(dtype=np.int64)
+    return parsed['Project'].take(positions).reset_index(drop=True), numbers[positions]
+
+def encode_issue_keys(keys, projects=None):
+    """(int64 codes, sorted project dictionary) for issue keys; -1 for keys that do not parse.
+
+    Codes compare like the keys themselves: by project alphabetically, then by
+    issue number, so min/max of two codes picks the same key every time.
+    """
+    prefixes, numbers = split_issue_keys(keys)
+    if projects is None:
+        projects = sorted(prefixes.dropna().unique())
+    project_ids = pd.Categorical(prefixes, categories=projects).codes.astype(np.int64)
+
+    codes = (project_ids << ISSUE_NUMBER_BITS) | numbers
+    codes[(project_ids < 0) | (numbers < 0)] = MISSING_KEY
+    return codes, list(projects)
+
+def decode_issue_keys(codes, projects):
+    """Issue key strings back from codes and their project dictionary ('' for missing keys)"""
+    codes = np.asarray(codes, dtype=np.int64)
+    names = np.asarray(projects, dtype=str)[np.maximum(codes >> ISSUE_NUMBER_BITS, 0)]
+    numbers = (codes & ((1 << ISSUE_NUMBER_BITS) - 1)).astype(str)
+    return np.where(codes < 0, '', np.char.add(np.char.add(names, '-'), numbers))
+
+def issue_projects(codes):
+    """Project ids of issue codes"""
+    return np.asarray(codes, dtype=np.int64) >> ISSUE_NUMBER_BITS
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Shared Project Link Matrix Loader
+Builds the project index, symmetric link matrix and per-project totals in one vectorized pass
+"""
+
+import os
+import pandas as pd
+import numpy as np
+from collections import defaultdict
+from snapshot_store import load_export, snapshot_path
+from stage_trace import traced
+
+try:
+    import scipy.sparse as sparse
+except ImportError:  # Every link matrix stays dense
+    sparse = None
+
+DEFAULT_CSV_FILE = '../.endpoints/Issue search/Issue Links - GET Project to Project Links - Filtered Unresolved 90Day - Anon - Official.csv'
+
+# From this many projects on the link matrix is built as scipy.sparse CSR instead of a dense N x N array
+SPARSE_MIN_PROJECTS = 2000
+
+class LinkMatrix:
+    """Sorted project index with its symmetric link matrix (dense, or CSR when large) and per-project link totals"""
+
+    def __init__(self, projects, matrix, totals, first_seen=None):
+        self.projects = list(projects)
+        self.index = {project: i for i, project in enumerate(self.projects)}
+        self.matrix = matrix
+        self.totals = totals
+        # Project positions in the order they first appear in the edge table
+        self.first_seen = np.arange(len(self.projects)) if first_seen is None else first_seen
+
+    def __len__(self):
+        return len(self.projects)
+
+    def __contains__(self, project):
+        return project in self.index
+
+    def links(self, project1, project2):
+        """Link count between two projects (0 when either is unknown)"""
+        i = self.index.get(project1)
+        j = self.index.get(project2)
+        if i is None or j is None:
+            return 0
+        return int(self.matrix[i, j])
+
+    @property
+    def is_sparse(self):
+        """Whether the matrix is a scipy.sparse matrix"""
+        return sparse is not None and sparse.issparse(self.matrix)
+
+    def row(self, project):
+        """Links of one project to every project as a dense 1-D array (zeros when unknown)"""
+        i = self.index.get(project)
+        if i is None:
+            return np.zeros(len(self), dtype=np.int64)
+        if self.is_sparse:
+            return self.matrix[[i]].toarray().ravel()
+        return np.asarray(self.matrix[i])
+
+    def degrees(self):
+        """Number of projects each project is linked to (a self-link counts as one)"""
+        if self.is_sparse:
+            return np.diff(self.matrix.indptr)
+        return np.count_nonzero(self.matrix, axis=1)
+
+    def dense(self):
+        """The matrix as a dense array (the matrix itself when it already is one)"""
+        return self.matrix.toarray() if self.is_sparse else self.matrix
+
+    def total(self, project):
+        """Sum of all links for a project (0 when unknown)"""
+        i = self.index.get(project)
+        return 0 if i is None else int(self.totals[i])
+
+    def totals_dict(self):
+        """Per-project totals in first-seen order, so ranking ties keep the input order"""
+        return {self.projects[i]: int(self.totals[i]) for i in self.first_seen.tolist()}
+
+    def to_frame(self):
+        """Labelled copy of the matrix as a DataFrame"""
+        return pd.DataFrame(self.dense(), index=self.projects, columns=self.projects)
+
+    def to_nested_dict(self):
+        """defaultdict-of-defaultdict view of the non-zero cells, for the older report code"""
+        nested = defaultdict(lambda: defaultdict(int))
+        if self.is_sparse:
+            cells = self.matrix.tocoo()
+            rows, cols, values = cells.row, cells.col, cells.data
+        else:
+            rows, cols = np.nonzero(self.matrix)
+            values = self.matrix[rows, cols]
+        for i, j, links in zip(rows.tolist(), cols.tolist(), values.tolist()):
+            nested[self.projects[i]][self.projects[j]] = links
+        return nested
+
+@traced()
+def build_link_matrix(df, source_col='ProjectKey', target_col='ConnectedProject', count_col='LinkCount',
+                      sparse_min_projects=SPARSE_MIN_PROJECTS):
+    """Build a LinkMatrix from an edge table without any Python-level row loop.
+
+    Rows for the same pair (in either direction) are summed. A self-link lands
+    once on the diagonal but counts twice towards the project's total, as in
+    the original iterrows() loaders. With sparse_min_projects or more projects
+    (and scipy installed) the matrix is CSR built straight from the coded
+    (row, col, count) arrays, so memory follows the links rather than N².
+    """
+    counts = pd.to_numeric(df[count_col], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+
+    # Categorical codes over both endpoint columns give the sorted project index in one step
+    # (snapshot key columns already share one dictionary; keep only the projects present)
+    endpoints = pd.Categorical(pd.concat([df[source_col], df[target_col]], ignore_index=True))
+    endpoints = endpoints.remove_unused_categories()
+    projects = endpoints.categories
+    codes = endpoints.codes.astype(np.intp)
+    sources, targets = codes[:len(df)], codes[len(df):]
+
+    n = len(projects)
+    cross = sources != targets
+    rows = np.concatenate([sources, targets[cross]])
+    cols = np.concatenate([targets, sources[cross]])
+    values = np.concatenate([counts, counts[cross]])
+    if sparse is not None and n >= sparse_min_projects:
+        # Repeated (row, col) cells are summed when the COO triplets are compressed
+        matrix = sparse.csr_matrix((values, (rows, cols)), shape=(n, n), dtype=np.int64)
+        matrix.eliminate_zeros()
+        matrix.sort_indices()
+    else:
+        matrix = np.zeros((n, n), dtype=np.int64)
+        np.add.at(matrix, (rows, cols), values)
+
+    totals = np.bincount(codes, weights=np.concatenate([counts, counts]), minlength=n).astype(np.int64)
+    first_seen = pd.unique(np.column_stack([sources, targets]).ravel())
+
+    return LinkMatrix(projects, matrix, totals, first_seen)
+
+class PairIndex:
+    """O(1) lookups of the link count between two projects and of each project's total"""
+
+    def __init__(self, pair_weights, projects, totals):
+        self.pair_weights = pair_weights
+        self.projects = list(projects)
+        self.index = {project: i for i, project in enumerate(self.projects)}
+        self.totals = totals
+
+    def weight(self, project1, project2):
+        """Links between two projects regardless of direction (0 when not linked)"""
+        key = (project1, project2) if project1 <= project2 else (project2, project1)
+        return self.pair_weights.get(key, 0)
+
+    def total(self, project):
+        """Sum of LinkCount over every row the project appears in (0 when unknown)"""
+        i = self.index.get(project)
+        return 0 if i is None else int(self.totals[i])
+
+@traced()
+def build_pair_index(df, source_col='ProjectKey', target_col='ConnectedProject', count_col='LinkCount'):
+    """Build a PairIndex from an edge table in one vectorized pass"""
+    sources = df[source_col].to_numpy(dtype=object)
+    targets = df[target_col].to_numpy(dtype=object)
+    counts = pd.to_numeric(df[count_col], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+
+    # Canonical (min key, max key) pair so both directions share one entry
+    swap = sources > targets
+    low = np.where(swap, targets, sources)
+    high = np.where(swap, sources, targets)
+    pair_sums = pd.Series(counts).groupby([low, high], sort=False).sum()
+    pair_weights = {pair: int(links) for pair, links in pair_sums.items()}
+
+    # A self-link row counts once towards its project's total
+    cross = sources != targets
+    endpoints = np.concatenate([sources, targets[cross]])
+    project_totals = pd.Series(np.concatenate([counts, counts[cross]])).groupby(endpoints).sum()
+
+    return PairIndex(pair_weights, project_totals.index, project_totals.to_numpy())
+
+def load_link_matrix(csv_file=DEFAULT_CSV_FILE, **columns):
+    """Read an edge export (through its columnar snapshot) and return it along with its LinkMatrix"""
+    names = [columns.get('source_col', 'ProjectKey'), columns.get('target_col', 'ConnectedProject'),
+             columns.get('count_col', 'LinkCount')]
+    df = load_export(csv_file, names)
+    return df, build_link_matrix(df, **columns)
+
+def matrix_artifact_paths(csv_file):
+    """Memory-mappable matrix (.npy) and project index (.npz) kept with the export's snapshot"""
+    prefix = os.path.splitext(snapshot_path(csv_file))[0]
+    return f'{prefix}.matrix.npy', f'{prefix}.index.npz'
+
+def save_link_matrix(link_matrix, matrix_file, index_file, columns=()):
+    """Persist a LinkMatrix; files are swapped in atomically so concurrent readers never see a partial one.
+
+    A dense matrix is saved as is. A CSR matrix is saved as its indptr,
+    indices and data back to back in one int64 array, so a single memory map
+    still holds the whole matrix.
+    """
+    os.makedirs(os.path.dirname(matrix_file) or '.', exist_ok=True)
+    temp_matrix = f'{matrix_file}.{os.getpid()}.tmp.npy'
+    temp_index = f'{index_file}.{os.getpid()}.tmp.npz'
+
+    if link_matrix.is_sparse:
+        matrix = link_matrix.matrix
+        np.save(temp_matrix, np.concatenate([matrix.indptr, matrix.indices, matrix.data]).astype(np.int64))
+    else:
+        np.save(temp_matrix, np.ascontiguousarray(link_matrix.matrix))
+    np.savez(temp_index, projects=np.array(link_matrix.projects, dtype=str), totals=link_matrix.totals,
+             first_seen=link_matrix.first_seen, columns=np.array(columns, dtype=str),
+             layout=np.array('csr' if link_matrix.is_sparse else 'dense'))
+
+    # Index last: a fresh index always describes the matrix next to it
+    os.replace(temp_matrix, matrix_file)
+    os.replace(temp_index, index_file)
+
+def map_link_matrix(matrix_file, index):
+    """Read-only memory map of a saved matrix (CSR values stay in the map; scipy may narrow the indices)"""
+    mapped = np.load(matrix_file, mmap_mode='r')
+    if 'layout' not in index.files or str(index['layout']) == 'dense':
+        return mapped
+    n = len(index['projects'])
+    nnz = (len(mapped) - n - 1) // 2
+    indptr, indices, data = mapped[:n + 1], mapped[n + 1:n + 1 + nnz], mapped[n + 1 + nnz:]
+    return sparse.csr_matrix((data, indices, indptr), shape=(n, n), copy=False)
+
+def _artifact_is_fresh(csv_file, matrix_file, index_file):
+    if not (os.path.exists(matrix_file) and os.path.exists(index_file)):
+        return False
+    csv_mtime = os.path.getmtime(csv_file)
+    return os.path.getmtime(matrix_file) >= csv_mtime and os.path.getmtime(index_file) >= csv_mtime
+
+@traced()
+def open_link_matrix(csv_file=DEFAULT_CSV_FILE, **columns):
+    """LinkMatrix backed by a read-only memory map of the persisted matrix.
+
+    The artifact is built from the export on first use (or when the CSV is
+    newer). Later opens only map the file, and every process opening it shares
+    the same physical pages.
+    """
+    names = [columns.get('source_col', 'ProjectKey'), columns.get('target_col', 'ConnectedProject'),
+             columns.get('count_col', 'LinkCount')]
+    matrix_file, index_file = matrix_artifact_paths(csv_file)
+
+    if _artifact_is_fresh(csv_file, matrix_file, index_file):
+        with np.load(index_file) as index:
+            if index['columns'].tolist() == names:
+                return LinkMatrix(index['projects'].tolist(), map_link_matrix(matrix_file, index),
+                                  index['totals'], index['first_seen'])
+
+    link_matrix = build_link_matrix(load_export(csv_file, names), **columns)
+    try:
+        save_link_matrix(link_matrix, matrix_file, index_file, names)
+    except OSError as e:
+        print(f"Warning: could not write link matrix {matrix_file}: {e}")
+        return link_matrix
+    with np.load(index_file) as index:
+        return LinkMatrix(link_matrix.projects, map_link_matrix(matrix_file, index),
+                          link_matrix.totals, link_matrix.first_seen)
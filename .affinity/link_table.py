@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Array-Backed Issue Link Table
+Issue links held as two int64 issue-code columns plus small flag columns, with project names only in a shared dictionary
+"""
+
+import numpy as np
+import pandas as pd
+from issue_keys import encode_issue_keys, decode_issue_keys, issue_projects, MISSING_KEY
+
+MISSING_DAY = -2**31
+
+class LinkTable:
+    """Parallel arrays of issue links: source and target issue codes, flags, days, and the project dictionary.
+
+    Every issue key is one int64 (see issue_keys), so a link costs 21 bytes
+    instead of two Python strings plus their project prefixes, and grouping,
+    joining or deduplicating links is integer work. Strings only come back
+    through to_frame() or project_names(). days holds each link's date as days
+    since 1970-01-01 (MISSING_DAY when the export has no timestamp for it).
+    """
+
+    def __init__(self, sources, targets, projects, flags=None, days=None):
+        self.sources = np.asarray(sources, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int64)
+        self.projects = list(projects)
+        self.flags = np.zeros(len(self.sources), dtype=np.int8) if flags is None else np.asarray(flags, dtype=np.int8)
+        self.days = (np.full(len(self.sources), MISSING_DAY, dtype=np.int32) if days is None
+                     else np.asarray(days, dtype=np.int32))
+
+    def __len__(self):
+        return len(self.sources)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the link columns"""
+        return self.sources.nbytes + self.targets.nbytes + self.flags.nbytes + self.days.nbytes
+
+    def source_projects(self):
+        """Project id of each link's source issue"""
+        return issue_projects(self.sources)
+
+    def target_projects(self):
+        """Project id of each link's target issue"""
+        return issue_projects(self.targets)
+
+    def project_names(self, ids):
+        """Project names for project ids"""
+        return np.asarray(self.projects, dtype=object)[ids]
+
+    def valid(self):
+        """Links whose two issue keys both parsed"""
+        return (self.sources != MISSING_KEY) & (self.targets != MISSING_KEY)
+
+    def cross_project(self):
+        """Links between two different projects"""
+        return self.source_projects() != self.target_projects()
+
+    def take(self, rows):
+        """LinkTable of the selected rows (boolean mask or positions), sharing the project dictionary"""
+        return LinkTable(self.sources[rows], self.targets[rows], self.projects, self.flags[rows], self.days[rows])
+
+    def canonical(self):
+        """(low, high) issue codes per link, the same for A → B and B → A"""
+        return np.minimum(self.sources, self.targets), np.maximum(self.sources, self.targets)
+
+    def project_pairs(self):
+        """Unique (low id, high id) project pairs and the number of links between each.
+
+        Project ids index the sorted dictionary, so low/high orders each pair
+        alphabetically and both directions land on one pair.
+        """
+        sources, targets = self.source_projects(), self.target_projects()
+        low, high = np.minimum(sources, targets), np.maximum(sources, targets)
+        n = max(len(self.projects), 1)
+        pairs, counts = np.unique(low * n + high, return_counts=True)
+        return pairs // n, pairs % n, counts.astype(np.int64)
+
+    def to_frame(self, source_col='SourceIssueKey', target_col='TargetIssueKey', flags_col='Flags'):
+        """Decoded DataFrame view with issue key and project strings"""
+        return pd.DataFrame({
+            source_col: decode_issue_keys(self.sources, self.projects),
+            target_col: decode_issue_keys(self.targets, self.projects),
+            'SourceProject': self.project_names(np.maximum(self.source_projects(), 0)),
+            'TargetProject': self.project_names(np.maximum(self.target_projects(), 0)),
+            flags_col: self.flags,
+            'Day': pd.to_datetime(pd.Series(self.days, dtype=float).where(self.days != MISSING_DAY), unit='D'),
+        })
+
+def epoch_days(timestamps):
+    """Days since 1970-01-01 of timestamps (MISSING_DAY for NaT)"""
+    timestamps = pd.to_datetime(pd.Series(timestamps), errors='coerce')
+    days = timestamps.to_numpy(dtype='datetime64[D]').astype(np.int64)
+    return np.where(timestamps.isna().to_numpy(), MISSING_DAY, days).astype(np.int32)
+
+def link_table(source_keys, target_keys, flags=None, days=None):
+    """LinkTable from two issue-key sequences, encoded against one shared project dictionary"""
+    codes, projects = encode_issue_keys(pd.concat([pd.Series(source_keys, dtype=object),
+                                                   pd.Series(target_keys, dtype=object)], ignore_index=True))
+    n = len(codes) // 2
+    return LinkTable(codes[:n], codes[n:], projects, flags, days)
+
+def frame_link_table(df, source_col='SourceIssueKey', target_col='TargetIssueKey', flags_col=None, time_col=None):
+    """LinkTable from the issue-key columns (and optionally a flag and a timestamp column) of a link export frame"""
+    flags = None if flags_col is None else df[flags_col].to_numpy()
+    days = None if time_col is None else epoch_days(df[time_col])
+    return link_table(df[source_col].to_numpy(dtype=object), df[target_col].to_numpy(dtype=object), flags, days)
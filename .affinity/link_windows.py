@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Time-Window Link Engine
+Keeps per-(project pair, day) link counts with prefix sums so any date window becomes a project matrix without a re-export
+"""
+
+import csv
+import time
+import functools
+import argparse
+import numpy as np
+import pandas as pd
+from cross_project_links import DEFAULT_DETAILED_LINKS_FILE, detailed_link_table, load_detailed_links
+from link_matrix import build_link_matrix
+from link_table import MISSING_DAY
+from stage_trace import traced
+
+DEFAULT_WINDOW = '90'
+DEFAULT_OUTPUT_FILE = 'Project_to_Project_Links_Window.csv'
+
+# Day each link is dated by in the detailed export
+TIME_COLUMN = 'SourceUpdated'
+
+# --window help shared by the diagram and heatmap scripts
+WINDOW_HELP = ("Use the detailed cross-project links dated in a window instead of --csv: "
+               "last N days of the data (e.g. 90), 'all', or START:END dates (e.g. 2025-07-01:2025-09-30)")
+
+class TimeWindow:
+    """Inclusive date range: the last N days of the data, or explicit start/end dates (either may be open)"""
+
+    def __init__(self, days=None, start=None, end=None):
+        self.days = days
+        self.start = None if start is None else np.datetime64(start, 'D')
+        self.end = None if end is None else np.datetime64(end, 'D')
+
+    def resolve(self, first_day, last_day):
+        """(start, end) epoch days of the window for data spanning first_day..last_day"""
+        if self.days is not None:
+            return last_day - self.days + 1, last_day
+        start = first_day if self.start is None else int(self.start.astype(np.int64))
+        end = last_day if self.end is None else int(self.end.astype(np.int64))
+        return start, end
+
+    def __str__(self):
+        if self.days is not None:
+            return f'{self.days}d'
+        if self.start is None and self.end is None:
+            return 'all'
+        return f"{self.start or ''}:{self.end or ''}"
+
+def parse_window(text):
+    """TimeWindow from '90' / '90d' (last 90 days), 'all', or 'START:END' with ISO dates and either side open"""
+    if isinstance(text, TimeWindow):
+        return text
+    text = str(text).strip().lower()
+    if text == 'all':
+        return TimeWindow()
+    if ':' in text:
+        start, end = (part.strip() or None for part in text.split(':', 1))
+        try:
+            window = TimeWindow(start=start, end=end)
+        except ValueError:
+            raise ValueError(f"Invalid window dates '{text}' (expected YYYY-MM-DD:YYYY-MM-DD)")
+        if window.start is not None and window.end is not None and window.start > window.end:
+            raise ValueError(f"Window '{text}' ends before it starts")
+        return window
+    days = text[:-1] if text.endswith('d') else text
+    if not days.isdigit() or int(days) < 1:
+        raise ValueError(f"Invalid window '{text}' (use a day count like 90, 'all', or START:END dates)")
+    return TimeWindow(days=int(days))
+
+def day_string(day):
+    """ISO date of an epoch day"""
+    return str(np.datetime64(int(day), 'D'))
+
+class LinkHistogram:
+    """Link counts per (project pair, day) with running totals along the day axis.
+
+    Project pairs are ordered alphabetically, so both directions of a link
+    count towards one pair. prefix[:, d] holds the links of each pair dated
+    before day first_day + d, so the links inside any window are one column
+    subtraction however long the window is.
+    """
+
+    def __init__(self, table):
+        dated = table.valid() & (table.days != MISSING_DAY)
+        self.undated = int(len(table) - dated.sum())
+        table = table.take(dated)
+        self.projects = table.projects
+
+        sources, targets = table.source_projects(), table.target_projects()
+        n = max(len(self.projects), 1)
+        pairs, pair_index = np.unique(np.minimum(sources, targets) * n + np.maximum(sources, targets),
+                                      return_inverse=True)
+        self.low, self.high = pairs // n, pairs % n
+
+        self.first_day = int(table.days.min()) if len(table) else 0
+        self.last_day = int(table.days.max()) if len(table) else -1
+        counts = np.zeros((len(pairs), self.last_day - self.first_day + 1), dtype=np.int64)
+        np.add.at(counts, (pair_index, table.days - self.first_day), 1)
+
+        self.prefix = np.zeros((len(pairs), counts.shape[1] + 1), dtype=np.int64)
+        np.cumsum(counts, axis=1, out=self.prefix[:, 1:])
+
+    def __len__(self):
+        return len(self.low)
+
+    def window_days(self, window=None):
+        """(start, end) epoch days of a window, clipped to the days the data covers"""
+        if window is None:
+            return self.first_day, self.last_day
+        start, end = parse_window(window).resolve(self.first_day, self.last_day)
+        return max(start, self.first_day), min(end, self.last_day)
+
+    def pair_counts(self, window=None):
+        """Links per project pair inside the window, from two prefix-sum columns"""
+        start, end = self.window_days(window)
+        if start > end:
+            return np.zeros(len(self), dtype=np.int64)
+        return self.prefix[:, end - self.first_day + 1] - self.prefix[:, start - self.first_day]
+
+    def edge_table(self, window=None):
+        """ProjectKey / ConnectedProject / LinkCount edge table of the pairs linked inside the window"""
+        counts = self.pair_counts(window)
+        linked = counts > 0
+        names = np.asarray(self.projects, dtype=object)
+        edges = pd.DataFrame({
+            'ProjectKey': names[self.low[linked]],
+            'ConnectedProject': names[self.high[linked]],
+            'LinkCount': counts[linked],
+        })
+        # Same row order as the exporters' Sort-Object ProjectKey, LinkCount -Descending
+        return edges.sort_values(['ProjectKey', 'LinkCount'], ascending=False, kind='stable', ignore_index=True)
+
+    def link_matrix(self, window=None):
+        """LinkMatrix of the links inside the window"""
+        return build_link_matrix(self.edge_table(window))
+
+    def describe(self, window=None):
+        """Readable date range of a window, e.g. '2025-07-02 to 2025-09-29 (90 days)'"""
+        start, end = self.window_days(window)
+        if start > end:
+            return f'{window} (no data)'
+        return f'{day_string(start)} to {day_string(end)} ({end - start + 1} days)'
+
+@functools.lru_cache(maxsize=4)
+@traced()
+def load_link_histogram(csv_file=DEFAULT_DETAILED_LINKS_FILE):
+    """LinkHistogram of the deduplicated links in a detailed cross-project export (built once per process)"""
+    return LinkHistogram(detailed_link_table(load_detailed_links(csv_file), time_col=TIME_COLUMN))
+
+def window_scope(window, csv_file=DEFAULT_DETAILED_LINKS_FILE):
+    """Title text naming the links a windowed diagram or heatmap shows"""
+    return f'Cross-Project Links Updated {load_link_histogram(csv_file).describe(window)}'
+
+def load_window(window, csv_file=DEFAULT_DETAILED_LINKS_FILE):
+    """(edge table, LinkMatrix, description) of the detailed links inside a window"""
+    histogram = load_link_histogram(csv_file)
+    edges = histogram.edge_table(window)
+    print(f"Window {histogram.describe(window)}: {len(edges)} project relationships, "
+          f"{edges['LinkCount'].sum()} links")
+    return edges, build_link_matrix(edges), histogram.describe(window)
+
+def main():
+    """Write the project-to-project edge table of one time window"""
+    parser = argparse.ArgumentParser(description='Project-to-project links inside a time window')
+    parser.add_argument('--csv', default=DEFAULT_DETAILED_LINKS_FILE, help='Detailed cross-project links export')
+    parser.add_argument('--window', default=DEFAULT_WINDOW,
+                        help="Last N days of the data (e.g. 90), 'all', or START:END dates (e.g. 2025-07-01:2025-09-30)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_FILE, help='Project-to-project links CSV to write')
+    args = parser.parse_args()
+
+    try:
+        window = parse_window(args.window)
+    except ValueError as e:
+        parser.error(str(e))
+
+    histogram = load_link_histogram(args.csv)
+    print(f"{args.csv}: {histogram.prefix[:, -1].sum():,} dated links over {len(histogram):,} project pairs, "
+          f"{histogram.describe()}")
+    if histogram.undated:
+        print(f"  Links without a date (left out of every window): {histogram.undated:,}")
+
+    start = time.perf_counter()
+    edges = histogram.edge_table(window)
+    elapsed = time.perf_counter() - start
+    edges.to_csv(args.output, index=False, quoting=csv.QUOTE_ALL)
+
+    print(f"Window {histogram.describe(window)}: {len(edges):,} pairs, {edges['LinkCount'].sum():,} links "
+          f"({elapsed * 1000:.1f} ms)")
+    print(f"Saved: {args.output}")
+
+if __name__ == "__main__":
+    main()
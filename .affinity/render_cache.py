@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Render Cache
+Skips diagram and heatmap renders whose input slice and style are unchanged since a previous run
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import filecmp
+import numpy as np
+import pandas as pd
+from stage_trace import traced
+
+DEFAULT_CACHE_DIR = '.render_cache'
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+# Bump when drawing code changes in a way that should invalidate every cached PNG
+RENDER_VERSION = 1
+
+def _feed(digest, part):
+    """Feed one key part into a hash, with arrays and frames hashed by their raw bytes"""
+    if isinstance(part, pd.DataFrame):
+        _feed(digest, [list(map(str, part.index)), list(map(str, part.columns))])
+        _feed(digest, part.to_numpy())
+    elif isinstance(part, np.ndarray):
+        array = np.ascontiguousarray(part)
+        digest.update(f'{array.dtype.str}{array.shape}'.encode())
+        digest.update(array.tobytes())
+    else:
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+    digest.update(b'\0')
+
+def fingerprint(*parts):
+    """Hex digest of the render inputs (JSON-like values, NumPy arrays or DataFrames)"""
+    digest = hashlib.sha256()
+    _feed(digest, RENDER_VERSION)
+    for part in parts:
+        _feed(digest, part)
+    return digest.hexdigest()
+
+class RenderCache:
+    """PNG store keyed by input fingerprint, with a JSON manifest and least-recently-used eviction"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.manifest_file = os.path.join(cache_dir, 'manifest.json')
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self.entries = self._read_manifest()
+
+    def _read_manifest(self):
+        """Manifest entries on disk, dropping any whose PNG has gone missing"""
+        try:
+            with open(self.manifest_file, encoding='utf-8') as f:
+                entries = json.load(f)['entries']
+        except (OSError, ValueError, KeyError):
+            return {}
+        return {key: entry for key, entry in entries.items()
+                if os.path.exists(os.path.join(self.cache_dir, entry['file']))}
+
+    def key(self, *parts):
+        """Cache key for a render's inputs"""
+        return fingerprint(*parts)
+
+    @traced()
+    def restore(self, key, output_file):
+        """Put the cached PNG for key at output_file; False when it has to be rendered"""
+        entry = self.entries.get(key)
+        cached_file = os.path.join(self.cache_dir, entry['file']) if entry else None
+        if cached_file is None or not os.path.exists(cached_file):
+            self.misses += 1
+            return False
+
+        # An identical PNG already in place costs nothing more than the comparison
+        if not (os.path.exists(output_file) and filecmp.cmp(cached_file, output_file, shallow=False)):
+            shutil.copyfile(cached_file, output_file)
+
+        entry['last_used'] = time.time()
+        self.hits += 1
+        self.save()
+        return True
+
+    @traced()
+    def store(self, key, output_file):
+        """Copy a freshly rendered PNG into the cache and evict old entries beyond max_bytes"""
+        if not os.path.exists(output_file):
+            return
+
+        cached_name = f'{key}{os.path.splitext(output_file)[1]}'
+        shutil.copyfile(output_file, os.path.join(self.cache_dir, cached_name))
+        self.entries[key] = {
+            'file': cached_name,
+            'output': os.path.basename(output_file),
+            'bytes': os.path.getsize(output_file),
+            'last_used': time.time(),
+        }
+        self.evict()
+        self.save()
+
+    def total_bytes(self):
+        """Size of every cached PNG"""
+        return sum(entry['bytes'] for entry in self.entries.values())
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits in max_bytes"""
+        total = self.total_bytes()
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]['last_used']):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, entry['file']))
+            except OSError:
+                pass
+            total -= entry['bytes']
+            del self.entries[key]
+
+    def save(self):
+        """Write the manifest, merging entries other processes added since it was read"""
+        entries = self._read_manifest()
+        entries.update(self.entries)
+        self.entries = entries
+
+        temp_file = f'{self.manifest_file}.{os.getpid()}.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': RENDER_VERSION, 'entries': self.entries}, f, indent=1)
+        os.replace(temp_file, self.manifest_file)
+
+    def summary(self):
+        """One-line hit/miss report"""
+        return (f"Render cache: {self.hits} hits, {self.misses} misses, "
+                f"{len(self.entries)} entries ({self.total_bytes() / 1024**2:.1f} MB)")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Streaming Markdown Report Writer
+Writes report chunks straight to their destinations as they are produced, with per-project sections built in parallel
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from stage_trace import traced
+
+def ordered_map(func, items, workers=1, initializer=None, initargs=()):
+    """Yield func(item) for each item in input order, computed by a process pool when workers > 1.
+
+    Results stream out as soon as every earlier item is done, so a writer
+    consuming them keeps rank order without waiting for the whole batch.
+    """
+    items = list(items)
+    if workers <= 1 or len(items) <= 1:
+        if initializer:
+            initializer(*initargs)
+        yield from map(func, items)
+        return
+
+    chunksize = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        yield from executor.map(func, items, chunksize=chunksize)
+
+@traced()
+def write_report(chunks, *destinations):
+    """Stream text chunks to every destination and return the number of characters written.
+
+    A destination is either an open text stream or a file path; files are
+    written under a temporary name and swapped in at the end, so an
+    interrupted run never leaves a truncated report behind.
+    """
+    streams, owned = [], []
+    try:
+        for destination in destinations:
+            if isinstance(destination, (str, os.PathLike)):
+                temp_file = f'{destination}.{os.getpid()}.tmp'
+                stream = open(temp_file, 'w', encoding='utf-8')
+                owned.append((stream, temp_file, destination))
+                streams.append(stream)
+            else:
+                streams.append(destination)
+
+        written = 0
+        for chunk in chunks:
+            for stream in streams:
+                stream.write(chunk)
+            written += len(chunk)
+    except BaseException:
+        for stream, temp_file, _ in owned:
+            stream.close()
+            os.remove(temp_file)
+        raise
+
+    for stream, temp_file, destination in owned:
+        stream.close()
+        os.replace(temp_file, destination)
+    return written
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Ring Classification Engine
+Computes every project's network connections and ring for every center in one sparse matrix product
+"""
+
+import argparse
+import numpy as np
+from link_matrix import DEFAULT_CSV_FILE, LinkMatrix, load_link_matrix
+from stage_trace import traced
+
+try:
+    import scipy.sparse as sparse
+except ImportError:  # Fall back to dense NumPy products
+    sparse = None
+
+# Minimum network connections for the Hub, High and Medium rings (anything lower is Low)
+DEFAULT_RING_THRESHOLDS = (6, 4, 2)
+
+# Rows of A @ A formed at a time; the full product is far denser than A once hubs link most projects
+PRODUCT_BLOCK_ROWS = 1024
+
+# Ring codes returned by ring_codes()
+RING_NAMES = {1: 'low', 2: 'medium', 3: 'high', 4: 'hub'}
+
+def ring_labels(ring_thresholds=DEFAULT_RING_THRESHOLDS):
+    """Build the legend labels for the given ring thresholds"""
+    hub, high, medium = ring_thresholds
+
+    def span(low, high_bound):
+        if high_bound > low:
+            return f"{low}-{high_bound} connections"
+        return f"{low} connection" if low == 1 else f"{low} connections"
+
+    return {
+        'hub': f"Hub Ring ({hub}+ connections)",
+        'high': f"High Ring ({span(high, hub - 1)})",
+        'medium': f"Medium Ring ({span(medium, high - 1)})",
+        'low': f"Low Ring ({span(1, medium - 1)})",
+    }
+
+def ring_codes(values, ring_thresholds=DEFAULT_RING_THRESHOLDS):
+    """Vectorized ring code (1=Low .. 4=Hub) for an array of network connection counts"""
+    hub, high, medium = ring_thresholds
+    values = np.asarray(values)
+    return (1 + (values >= medium) + (values >= high) + (values >= hub)).astype(np.int8)
+
+def network_connection_matrix(matrix):
+    """N[c, o] for every linked pair: projects in c's network (including c) that o links to.
+
+    With A the boolean adjacency (no self-links) this is (A @ A + 1) masked by A,
+    i.e. the common neighbors of c and o plus the link to c itself. Accepts a
+    dense array or a scipy.sparse matrix and returns CSR when scipy is installed.
+    """
+    if sparse is not None and sparse.issparse(matrix):
+        A = sparse.csr_matrix(matrix != 0, dtype=np.int32)
+        A.setdiag(0)
+        A.eliminate_zeros()
+        return _sorted_csr(_masked_square(A) + A)
+
+    A = (np.asarray(matrix) != 0).astype(np.int32)
+    np.fill_diagonal(A, 0)
+    if sparse is not None:
+        A = sparse.csr_matrix(A)
+        return _sorted_csr(_masked_square(A) + A)
+    return (A @ A + 1) * A
+
+def matrix_row(matrix, i):
+    """Row i of a dense array or scipy.sparse matrix as a 1-D array"""
+    if sparse is not None and sparse.issparse(matrix):
+        return matrix[[i]].toarray().ravel()
+    return np.asarray(matrix[i])
+
+def _masked_square(A, block_rows=PRODUCT_BLOCK_ROWS):
+    """A.multiply(A @ A) for a CSR matrix, one block of rows at a time"""
+    blocks = [A[start:start + block_rows].multiply(A[start:start + block_rows] @ A)
+              for start in range(0, A.shape[0], block_rows)]
+    return sparse.vstack(blocks, format='csr') if blocks else A.copy()
+
+def _sorted_csr(matrix):
+    """CSR copy with column indices sorted, so row slices come out in project order"""
+    matrix = matrix.tocsr()
+    matrix.sort_indices()
+    return matrix
+
+class RingClassification:
+    """Network connections and ring codes of every neighbor, for every center project"""
+
+    @traced('RingClassification')
+    def __init__(self, link_matrix, ring_thresholds=DEFAULT_RING_THRESHOLDS):
+        self.link_matrix = link_matrix
+        self.ring_thresholds = ring_thresholds
+        self.network_connections = network_connection_matrix(link_matrix.matrix)
+
+    def row(self, center):
+        """Neighbor positions and network connection counts for one center"""
+        i = self.link_matrix.index.get(center)
+        if i is None:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.int32)
+        if sparse is not None:
+            start, end = self.network_connections.indptr[i], self.network_connections.indptr[i + 1]
+            return self.network_connections.indices[start:end], self.network_connections.data[start:end]
+        row = matrix_row(self.network_connections, i)
+        cols = np.nonzero(row)[0]
+        return cols, row[cols]
+
+    def connections(self, center):
+        """{neighbor: network connections} for one center"""
+        cols, counts = self.row(center)
+        projects = self.link_matrix.projects
+        return {projects[j]: int(c) for j, c in zip(cols.tolist(), counts.tolist())}
+
+    def rings(self, center):
+        """{neighbor: ring name} for one center"""
+        cols, counts = self.row(center)
+        projects = self.link_matrix.projects
+        codes = ring_codes(counts, self.ring_thresholds)
+        return {projects[j]: RING_NAMES[code] for j, code in zip(cols.tolist(), codes.tolist())}
+
+    def ring_counts(self, center):
+        """Number of neighbors in each ring for one center"""
+        _, counts = self.row(center)
+        tally = np.bincount(ring_codes(counts, self.ring_thresholds), minlength=5)
+        return {name: int(tally[code]) for code, name in RING_NAMES.items()}
+
+    def perspective(self, center):
+        """Table rows for one center, sorted by network connections then direct links (descending)"""
+        cols, counts = self.row(center)
+        if len(cols) == 0:
+            return []
+        i = self.link_matrix.index[center]
+        projects = self.link_matrix.projects
+        labels = ring_labels(self.ring_thresholds)
+        direct_links = matrix_row(self.link_matrix.matrix, i)[cols]
+        total_links = self.link_matrix.totals[cols]
+        codes = ring_codes(counts, self.ring_thresholds)
+
+        rows = [{
+            'connected_project': projects[j],
+            'direct_links': links,
+            'total_links': total,
+            'network_connections': network,
+            'ring_classification': labels[RING_NAMES[code]],
+        } for j, links, total, network, code in zip(cols.tolist(), direct_links.tolist(), total_links.tolist(),
+                                                     counts.tolist(), codes.tolist())]
+        rows.sort(key=lambda x: (x['network_connections'], x['direct_links']), reverse=True)
+        return rows
+
+def layout_mismatches(link_matrix, ring_thresholds=DEFAULT_RING_THRESHOLDS):
+    """Centers whose perspective differs between a dense and a scipy.sparse copy of the link matrix"""
+    matrix = link_matrix.matrix
+    dense = matrix.toarray() if sparse.issparse(matrix) else np.asarray(matrix)
+    classifications = [RingClassification(LinkMatrix(link_matrix.projects, layout, link_matrix.totals,
+                                                     link_matrix.first_seen), ring_thresholds)
+                       for layout in (dense, sparse.csr_matrix(dense))]
+    return [center for center in link_matrix.projects
+            if classifications[0].perspective(center) != classifications[1].perspective(center)]
+
+def main():
+    """Check that dense and sparse link matrices classify every center the same way"""
+    parser = argparse.ArgumentParser(description='Compare ring classification of dense and sparse link matrices')
+    parser.add_argument('--csv', default=DEFAULT_CSV_FILE, help='Project-to-project links export')
+    args = parser.parse_args()
+
+    if sparse is None:
+        parser.error('scipy is not installed; only the dense classification is available')
+
+    _, link_matrix = load_link_matrix(args.csv)
+    mismatches = layout_mismatches(link_matrix)
+    print(f"{len(link_matrix)} centers classified from dense and sparse matrices: "
+          f"{len(link_matrix) - len(mismatches)} identical")
+    if mismatches:
+        print(f"Differing centers: {', '.join(mismatches)}")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
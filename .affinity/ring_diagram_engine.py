@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""
+Ring Diagram Engine
+Loads the project relationships once and renders the ring diagram for any center project
+"""
+
+import os
+import argparse
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+import networkx as nx
+import numpy as np
+from diagram_figure import DiagramFigure
+from edge_batches import draw_edge_batches
+from link_matrix import build_link_matrix, build_pair_index, open_link_matrix
+from link_windows import WINDOW_HELP, load_window, parse_window, window_scope
+from ring_classification import DEFAULT_RING_THRESHOLDS, RingClassification, ring_codes, ring_labels, RING_NAMES
+from render_backends import (DEFAULT_BACKEND, RENDER_BACKENDS, backend_extension, check_backend, render_context,
+                             savefig_options, with_extension)
+from render_cache import DEFAULT_CACHE_DIR, RenderCache
+from snapshot_store import LINK_COLUMNS, load_export
+from stage_trace import span, traced
+import warnings
+warnings.filterwarnings('ignore')
+
+DEFAULT_CSV_FILE = '../.endpoints/Issue search/Issue Links - GET Project to Project Links - Filtered Unresolved 90Day - Anon - Official.csv'
+FIGURE_SIZE = (24, 20)
+DEFAULT_THUMBNAIL_DIR = 'thumbnails'
+THUMBNAIL_DPI = 30     # about 700 px wide for the 24-inch figure
+
+RING_COLORS = {
+    'center': '#1f4e79',
+    'hub': '#ff8c00',
+    'high': '#4682b4',
+    'medium': '#90ee90',
+    'low': '#d3d3d3',
+}
+
+# Edge styles in drawing order: every other edge, then center-to-hub edges
+EDGE_STYLES = [
+    dict(alpha=0.25, edge_color='lightgray', width=0.5),
+    dict(alpha=1.0, edge_color=RING_COLORS['hub'], width=1.0),
+]
+
+# Centers whose diagrams show a full name instead of the project key
+CENTER_DISPLAY_NAMES = {
+    'PAY': 'Payment Services',
+    'TOKR': 'Token Services',
+}
+
+class RingDiagramEngine:
+    """Shared relationship graph that can render a ring diagram for any center project"""
+
+    def __init__(self, relationships_df, ring_thresholds=DEFAULT_RING_THRESHOLDS,
+                 display_names=None, subtitle='Filtered: Unresolved Issues, 90-Day Activity', cache=None,
+                 link_matrix=None, backend=DEFAULT_BACKEND):
+        self.relationships_df = relationships_df
+        self.cache = cache
+        self.backend = check_backend(backend)
+        self.ring_thresholds = ring_thresholds
+        self.display_names = CENTER_DISPLAY_NAMES if display_names is None else display_names
+        self.subtitle = subtitle
+        self.diagram = None
+
+        sources = relationships_df['ProjectKey'].to_numpy()
+        targets = relationships_df['ConnectedProject'].to_numpy()
+        link_counts = relationships_df['LinkCount'].to_numpy()
+
+        # Total link counts for each project (both ends of every relationship), in first-seen order
+        endpoints = np.column_stack([sources, targets]).ravel()
+        totals = pd.Series(np.repeat(link_counts, 2), index=endpoints).groupby(level=0, sort=False).sum()
+
+        with span('graph_build', edges=len(relationships_df)):
+            self.G = nx.Graph()
+            for project_key, total_link_count in totals.items():
+                self.G.add_node(project_key, label=project_key, link_count=total_link_count)
+            for source, target, link_count in zip(sources, targets, link_counts):
+                self.G.add_edge(source, target, weight=link_count)
+
+        # O(1) center-to-neighbor link counts and per-project totals for the legend table
+        self.pair_index = build_pair_index(relationships_df)
+
+        # Circle numbers of every neighbor for every center, from one sparse matrix product
+        if link_matrix is None:
+            link_matrix = build_link_matrix(relationships_df)
+        self.classification = RingClassification(link_matrix, ring_thresholds)
+
+    @classmethod
+    def from_csv(cls, csv_file=DEFAULT_CSV_FILE, **kwargs):
+        """Load the relationship CSV once and build an engine from it"""
+        relationships_df = load_export(csv_file, LINK_COLUMNS)
+        print("Found", len(relationships_df), "project relationships")
+        print("Total links:", relationships_df['LinkCount'].sum())
+        kwargs.setdefault('link_matrix', open_link_matrix(csv_file))
+        return cls(relationships_df, **kwargs)
+
+    @classmethod
+    def from_window(cls, window, **kwargs):
+        """Build an engine from the detailed cross-project links dated inside a time window"""
+        relationships_df, link_matrix, _ = load_window(window)
+        kwargs.setdefault('link_matrix', link_matrix)
+        kwargs.setdefault('subtitle', window_scope(window))
+        return cls(relationships_df, **kwargs)
+
+    @classmethod
+    def load(cls, csv_file=DEFAULT_CSV_FILE, window=None, **kwargs):
+        """Engine over a time window of the detailed links when one is given, else over the CSV"""
+        if window is not None:
+            return cls.from_window(window, **kwargs)
+        return cls.from_csv(csv_file, **kwargs)
+
+    def center_connections(self, center):
+        """Direct connections of the center project"""
+        return [n for n in self.G.neighbors(center) if n != center]
+
+    def classify(self, center):
+        """Split the center's direct connections into Hub/High/Medium/Low rings"""
+        connections_list = self.center_connections(center)
+        network_connections = self.classification.connections(center)
+        project_connection_counts = {conn: network_connections.get(conn, 1) for conn in connections_list}
+
+        # Keep graph neighbor order within each ring; it fixes the positions around the ring
+        rings = {'hub': [], 'high': [], 'medium': [], 'low': []}
+        codes = ring_codes(list(project_connection_counts.values()), self.ring_thresholds)
+        for conn, code in zip(connections_list, codes.tolist()):
+            rings[RING_NAMES[code]].append(conn)
+
+        return rings, project_connection_counts
+
+    def ring_for(self, circle_number):
+        """Ring name for a circle number"""
+        return RING_NAMES[int(ring_codes(circle_number, self.ring_thresholds))]
+
+    @traced()
+    def center_metrics(self, center):
+        """Ring counts, weighted sum and output filename for a center, without drawing anything"""
+        if center not in self.G:
+            return None
+
+        center_connections = self.center_connections(center)
+        rings, project_connection_counts = self.classify(center)
+        hub_count, high_count = len(rings['hub']), len(rings['high'])
+        medium_count, low_count = len(rings['medium']), len(rings['low'])
+        center_count = hub_count + high_count + medium_count + low_count
+
+        # Weighted sum based on ring counts: Hub*4 + High*3 + Medium*2 + Low*1
+        weighted_sum = (hub_count * 4) + (high_count * 3) + (medium_count * 2) + (low_count * 1)
+
+        return {
+            'center': center,
+            'center_connections': center_connections,
+            'rings': rings,
+            'project_connection_counts': project_connection_counts,
+            'hub_count': hub_count,
+            'high_count': high_count,
+            'medium_count': medium_count,
+            'low_count': low_count,
+            'center_count': center_count,
+            'weighted_sum': weighted_sum,
+            'filename': f'{weighted_sum:04d}_{center_count:04d}_{hub_count:04d}_{high_count:04d}_{medium_count:04d}_{low_count:04d}_{center}.{backend_extension(self.backend)}',
+        }
+
+    def render_key(self, metrics):
+        """Cache key for a center: its ego network, the legend table inputs and the style parameters"""
+        center = metrics['center']
+        ego = set(metrics['center_connections'])
+        ego.add(center)
+
+        # Edges in drawing order, since that order decides which lines end up on top
+        edges = [(u, v, int(w)) for u, v, w in self.G.edges(data='weight') if u in ego and v in ego]
+        neighbors = [(n, metrics['project_connection_counts'][n], self.pair_index.weight(center, n),
+                      self.pair_index.total(n)) for n in metrics['center_connections']]
+
+        return self.cache.key('ring_diagram', center, self.display_names.get(center), self.subtitle,
+                              list(self.ring_thresholds), metrics['weighted_sum'], neighbors, edges, self.backend)
+
+    def create_centered_diagram(self, center, output_file=None, weighted_sum=None):
+        """Create a center-project radial affinity diagram with ring layout and professional styling."""
+        if output_file is None:
+            output_file = f'{center.lower()}_centered_diagram.png'
+
+        metrics = self.center_metrics(center)
+        if metrics is None:
+            print(f"Warning: {center} project not found in data. Cannot create {center}-centered diagram.")
+            return None, 0, 0, 0, 0, []
+        if weighted_sum is not None:
+            metrics['weighted_sum'] = weighted_sum
+
+        self.draw_diagram(metrics, output_file)
+
+        return (self.G, metrics['hub_count'], metrics['high_count'],
+                metrics['medium_count'], metrics['low_count'], metrics['center_connections'])
+
+    def draw_diagram(self, metrics, output_file):
+        """Rasterize the ring diagram for precomputed center metrics, once"""
+        center = metrics['center']
+        center_connections = metrics['center_connections']
+        rings = metrics['rings']
+
+        print(f"{center} has {len(center_connections)} direct connections")
+        labels = ring_labels(self.ring_thresholds)
+        print(f"{center} filtered connections: {len(center_connections)}")
+        print(f"  {labels['hub']}: {len(rings['hub'])}, {labels['high']}: {len(rings['high'])}, "
+              f"{labels['medium']}: {len(rings['medium'])}, {labels['low']}: {len(rings['low'])}")
+
+        self.render(metrics, output_file)
+
+    def render(self, metrics, output_file):
+        """Lay out, draw and save one diagram with the engine's render backend"""
+        with span('diagram', center=metrics['center'], neighbors=len(metrics['center_connections']),
+                  backend=self.backend):
+            pos = self.ring_layout(metrics)
+            with render_context(self.backend):
+                self.draw_figure(metrics, pos)
+                self.save_figure(output_file)
+
+    @traced()
+    def ring_layout(self, metrics):
+        """Node positions on concentric rings around the center at (0, 0)"""
+        center = metrics['center']
+        rings = metrics['rings']
+        center_hub_connections = rings['hub']
+        center_high_connections = rings['high']
+        center_medium_connections = rings['medium']
+        center_low_connections = rings['low']
+
+        # Create positioning with proper concentric rings
+        pos = {center: (0, 0)}
+
+        # Hub, High and Medium rings are evenly spaced starting at 3 o'clock
+        for ring_projects, radius in ((center_hub_connections, 0.15),
+                                      (center_high_connections, 0.3),
+                                      (center_medium_connections, 0.45)):
+            if ring_projects:
+                angles = np.linspace(0, 2*np.pi, len(ring_projects), endpoint=False)
+                for i, project in enumerate(ring_projects):
+                    pos[project] = (radius * np.cos(angles[i]), radius * np.sin(angles[i]))
+
+        # Low ring (grey) - outermost, offset to start at 12 o'clock for better balance
+        if center_low_connections:
+            angles = np.linspace(0, 2*np.pi, len(center_low_connections), endpoint=False) + np.pi/2
+            radius = 0.6
+            for i, project in enumerate(center_low_connections):
+                pos[project] = (radius * np.cos(angles[i]), radius * np.sin(angles[i]))
+
+        return pos
+
+    def diagram_figure(self):
+        """The engine's reusable figure, created with its static legend on first use"""
+        if self.diagram is None:
+            self.diagram = DiagramFigure(FIGURE_SIZE)
+            labels = ring_labels(self.ring_thresholds)
+
+            # Legend: the center entry's label is filled in per diagram
+            legend_elements = [
+                plt.Line2D([0], [0], marker='o', color='w', label='(Center)',
+                           markerfacecolor=RING_COLORS['center'], markersize=12),
+            ]
+            for ring_name in ('hub', 'high', 'medium', 'low'):
+                legend_elements.append(
+                    plt.Line2D([0], [0], marker='o', color='w', label=labels[ring_name],
+                               markerfacecolor=RING_COLORS[ring_name], markersize=10))
+
+            self.diagram.legend = self.diagram.ax.legend(handles=legend_elements, loc='upper left',
+                                                         bbox_to_anchor=(0.02, 0.98), fontsize=18, frameon=False)
+        return self.diagram
+
+    def close(self):
+        """Release the reusable figure (it is recreated if another diagram is drawn)"""
+        if self.diagram is not None:
+            self.diagram.close()
+            self.diagram = None
+
+    @traced()
+    def draw_figure(self, metrics, pos):
+        """Swap the center's edges, nodes, labels and neighbor table into the reusable figure"""
+        G = self.G
+        pair_index = self.pair_index
+        center = metrics['center']
+        weighted_sum = metrics['weighted_sum']
+        center_connections = metrics['center_connections']
+        rings = metrics['rings']
+        project_connection_counts = metrics['project_connection_counts']
+
+        # Reuse the figure, dropping the previous center's artists
+        diagram = self.diagram_figure()
+        ax = diagram.reset()
+        fig = diagram.figure
+
+        # Draw edges with simplified coloring - only center-to-hub edges are orange
+        edges_to_draw = [(u, v) for u, v in G.edges() if u in pos and v in pos]
+        if edges_to_draw:
+            sources, targets = np.array(edges_to_draw, dtype=object).T
+            touches_center = (sources == center) | (targets == center)
+            other_ends = np.where(sources == center, targets, sources)
+            circle_numbers = np.array([project_connection_counts.get(n, 1) for n in other_ends])
+            is_hub_edge = touches_center & (ring_codes(circle_numbers, self.ring_thresholds) == 4)  # 4 = Hub
+
+            # Non-hub edges first (light gray, thin, 25% transparent), hub edges on top (orange, thick)
+            draw_edge_batches(G, pos, edges_to_draw, is_hub_edge.astype(np.intp), EDGE_STYLES, ax=ax)
+
+        # Center - Fixed size 4000, 10% transparent
+        nx.draw_networkx_nodes(G, pos, nodelist=[center],
+                               node_color=RING_COLORS['center'], node_size=4000, alpha=0.9, ax=ax)
+
+        # Ring nodes sized by circle number within each ring's bounds
+        ring_sizes = {
+            'hub': (2000, 3600, 60),
+            'high': (1200, 1900, 50),
+            'medium': (600, 1100, 40),
+            'low': (400, 500, 30),
+        }
+        for ring_name, (min_size, max_size, scale) in ring_sizes.items():
+            ring_nodes = [n for n in rings[ring_name] if n in pos]
+            if ring_nodes:
+                sizes = [max(min_size, min(max_size, project_connection_counts[n] * scale)) for n in ring_nodes]
+                nx.draw_networkx_nodes(G, pos, nodelist=ring_nodes,
+                                       node_color=RING_COLORS[ring_name], node_size=sizes, alpha=0.9, ax=ax)
+
+        # Draw node labels (project keys ABOVE circles) and counts INSIDE circles
+        center_label = self.display_names.get(center, center)
+        for node, (x, y) in pos.items():
+            if node == center:
+                ax.text(x, y+0.05, center_label, ha='center', va='center', fontsize=16, weight='bold', color='black')
+                count = str(len(center_connections))
+            else:
+                ax.text(x, y+0.03, node, ha='center', va='center', fontsize=14, weight='bold', color='black')
+                count = str(project_connection_counts.get(node, 1))
+            ax.text(x, y, count, ha='center', va='center', fontsize=10, weight='bold', color='white')
+
+        # Add title
+        title_name = f'{self.display_names[center]} ({center})' if center in self.display_names else center
+        ax.set_title(f'{title_name} - {len(center_connections)} Links\n({self.subtitle})',
+                     fontsize=20, fontweight='bold', pad=20)
+
+        # Legend entries are fixed; only the center's name changes
+        diagram.legend.get_texts()[0].set_text(f'{center} (Center)')
+
+        # Add data table below the legend (styled like legend)
+        center_neighbors = [(n, G.nodes[n]['link_count']) for n in center_connections]
+
+        # Sort by column 2 (circle number) descending, then by column 3 (center links) descending
+        center_neighbors.sort(key=lambda item: (project_connection_counts.get(item[0], 1),
+                                                pair_index.weight(center, item[0])), reverse=True)
+
+        # Create table text lines
+        table_lines = []
+        total_center_links = 0
+        total_project_connections = 0
+
+        for project, connections in center_neighbors:
+            center_to_project_links = pair_index.weight(center, project)
+            total_project_connections_for_this = pair_index.total(project)
+
+            total_center_links += center_to_project_links
+            total_project_connections += total_project_connections_for_this
+
+            circle_number = project_connection_counts.get(project, 1)
+            line_text = f"{project:<6s}{circle_number:>6d}{center_to_project_links:>6d}{total_project_connections_for_this:>6d}"
+            table_lines.append((line_text, RING_COLORS[self.ring_for(circle_number)]))
+
+        # Display each line with color filled background (like legend) instead of table
+        y_position = 0.02
+        line_height = 0.02
+
+        for line, bg_color in table_lines:
+            fig.text(0.02, y_position, line, fontsize=18, fontfamily='monospace',
+                        verticalalignment='bottom', color='black',
+                        bbox=dict(boxstyle='round,pad=0.1', facecolor=bg_color, alpha=0.5))
+            y_position += line_height
+
+        # Totals row directly above the table: row count, weighted sum, center links, project connections
+        totals_line = f"{len(table_lines):<6d}{weighted_sum:>6d}{total_center_links:>6d}{total_project_connections:>6d}"
+        fig.text(0.02, y_position, totals_line, fontsize=18, fontfamily='monospace',
+                    verticalalignment='bottom', color='black')
+
+        ax.axis('equal')
+        fig.tight_layout()
+
+    @traced()
+    def save_figure(self, output_file):
+        """Save the drawn diagram at 300 dpi (150 dpi if that fails) with the render backend"""
+        options = savefig_options(self.backend)
+        # Save with high quality
+        try:
+            self.diagram.save(output_file, dpi=300, bbox_inches='tight', facecolor='white', **options)
+        except Exception as e:
+            print(f"Error saving diagram: {e}")
+            # Fallback save method
+            self.diagram.save(output_file, dpi=150, bbox_inches='tight', **options)
+
+        print(f"Diagram saved as: {output_file}")
+
+    @traced()
+    def write_portfolio(self, centers, pdf_file):
+        """Draw every center's diagram as one page of a single vector PDF and return the page count"""
+        pages = 0
+        with PdfPages(pdf_file, metadata={'CreationDate': None}) as pdf, render_context('pdf'):
+            for center in centers:
+                metrics = self.center_metrics(center)
+                if metrics is None:
+                    print(f"Warning: {center} project not found in data, left out of the portfolio")
+                    continue
+                with span('portfolio_page', center=center, neighbors=len(metrics['center_connections'])):
+                    self.draw_figure(metrics, self.ring_layout(metrics))
+                    pdf.savefig(self.diagram.figure, bbox_inches='tight', facecolor='white')
+                pages += 1
+
+        print(f"Portfolio saved as: {pdf_file} ({pages} pages)")
+        return pages
+
+    def write_thumbnail(self, center, thumbnail_dir=DEFAULT_THUMBNAIL_DIR, dpi=THUMBNAIL_DPI):
+        """Render a small PNG preview of a center's diagram on request and return its path"""
+        metrics = self.center_metrics(center)
+        if metrics is None:
+            print(f"Warning: {center} project not found in data. Cannot create a thumbnail.")
+            return None
+
+        os.makedirs(thumbnail_dir, exist_ok=True)
+        output_file = os.path.join(thumbnail_dir, with_extension(metrics['filename'], DEFAULT_BACKEND))
+        self.draw_figure(metrics, self.ring_layout(metrics))
+        self.diagram.save(output_file, dpi=dpi, bbox_inches='tight', facecolor='white')
+
+        print(f"Thumbnail saved as: {output_file}")
+        return output_file
+
+    def generate(self, center):
+        """Render the center diagram once, straight to its weighted-sum filename"""
+        print("\n" + "="*60)
+        print(f"Creating {center}-Centered Project Affinity Diagram...")
+        print("="*60)
+
+        # Ring counts and weighted sum come first, so the PNG is drawn once under its final name
+        metrics = self.center_metrics(center)
+        if metrics is None:
+            print(f"Warning: {center} project not found in data. Cannot create {center}-centered diagram.")
+            return None
+
+        if self.cache is None:
+            self.draw_diagram(metrics, metrics['filename'])
+        else:
+            key = self.render_key(metrics)
+            if self.cache.restore(key, metrics['filename']):
+                print(f"Unchanged since last render, reused cached diagram: {metrics['filename']}")
+            else:
+                self.draw_diagram(metrics, metrics['filename'])
+                self.cache.store(key, metrics['filename'])
+
+        self.print_summary(center)
+        return metrics['filename']
+
+    def print_summary(self, center):
+        """Print the ring summary and top connections for a center project"""
+        G = self.G
+        rings, project_connection_counts = self.classify(center)
+        center_connections = self.center_connections(center)
+
+        print(f"\n{center}-CENTERED PROJECT AFFINITY ANALYSIS SUMMARY")
+        print(f"Total Projects in Dataset: {G.number_of_nodes()}")
+        print(f"{center} Total Direct Connections: {len(center_connections)}")
+        print(f"{center} Hub Connections: {len(rings['hub'])}")
+        print(f"{center} High Connections: {len(rings['high'])}")
+        print(f"{center} Medium Connections: {len(rings['medium'])}")
+        print(f"{center} Low Connections: {len(rings['low'])}")
+
+        print(f"\n{center}'s Top Connected Projects:")
+        center_neighbors = [(n, G.nodes[n]['link_count']) for n in center_connections]
+        center_neighbors.sort(key=lambda x: x[1], reverse=True)
+        for j, (project, count) in enumerate(center_neighbors[:15], 1):
+            center_to_project_links = self.pair_index.weight(center, project)
+            print(f"{j:2d}. {project:8s} - {count:2d} total connections ({center}↔{project}: {center_to_project_links} links)")
+
+def run_single_center(center, csv_file=DEFAULT_CSV_FILE, window=None, **kwargs):
+    """Render one center from the CSV, or from a time window of the detailed links"""
+    kwargs.setdefault('cache', RenderCache())
+    engine = RingDiagramEngine.load(csv_file, window, **kwargs)
+    filename = engine.generate(center)
+    engine.close()
+
+    print(f"\n{'='*60}")
+    print(f"{center} PROJECT PROCESSING COMPLETED!")
+    if filename:
+        print("Files generated: 1")
+    else:
+        print(f"Files generated: 0 ({center} not found in the data)")
+    print(f"{'='*60}")
+
+def center_main(center, csv_file=DEFAULT_CSV_FILE, **kwargs):
+    """Command line of the per-project create_<key>_diagram.py scripts"""
+    parser = argparse.ArgumentParser(description=f'Render the {center}-centered ring diagram')
+    parser.add_argument('--csv', default=csv_file, help='Project-to-project links CSV')
+    parser.add_argument('--window', help=WINDOW_HELP)
+    parser.add_argument('--backend', choices=list(RENDER_BACKENDS), default=DEFAULT_BACKEND,
+                        help='Render backend (svg or pdf write vector files to rasterize later)')
+    args = parser.parse_args()
+
+    try:
+        check_backend(args.backend)
+        window = None if args.window is None else parse_window(args.window)
+    except ValueError as e:
+        parser.error(str(e))
+
+    run_single_center(center, args.csv, window, backend=args.backend, **kwargs)
+
+def main():
+    """Render ring diagrams for one or more center projects from a single data load"""
+    parser = argparse.ArgumentParser(description='Render project ring diagrams from one data load')
+    parser.add_argument('centers', nargs='*', help='Center project keys (default: every project)')
+    parser.add_argument('--csv', default=DEFAULT_CSV_FILE, help='Project-to-project links CSV')
+    parser.add_argument('--window', help=WINDOW_HELP)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Render cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Render every diagram even if unchanged')
+    parser.add_argument('--backend', choices=list(RENDER_BACKENDS), default=DEFAULT_BACKEND,
+                        help='Render backend (svg or pdf write vector files to rasterize later)')
+    parser.add_argument('--portfolio', metavar='PDF_FILE',
+                        help='Write all centers as pages of one PDF instead of one file per center')
+    parser.add_argument('--thumbnails', action='store_true',
+                        help='Only write small PNG previews of the centers, to --thumbnail-dir')
+    parser.add_argument('--thumbnail-dir', default=DEFAULT_THUMBNAIL_DIR, help='Thumbnail directory')
+    args = parser.parse_args()
+
+    try:
+        check_backend(args.backend)
+        window = None if args.window is None else parse_window(args.window)
+    except ValueError as e:
+        parser.error(str(e))
+
+    cache = None if args.no_cache else RenderCache(args.cache_dir)
+    engine = RingDiagramEngine.load(args.csv, window, cache=cache, backend=args.backend)
+    centers = args.centers or sorted(engine.G.nodes())
+
+    if args.portfolio:
+        engine.write_portfolio(centers, args.portfolio)
+        engine.close()
+        return
+    if args.thumbnails:
+        thumbnails = [engine.write_thumbnail(center, args.thumbnail_dir) for center in centers]
+        engine.close()
+        print(f"\nThumbnails generated: {sum(1 for t in thumbnails if t)}")
+        return
+
+    generated = []
+    for i, center in enumerate(centers, 1):
+        print(f"\n[{i}/{len(centers)}] {center}")
+        filename = engine.generate(center)
+        if filename:
+            generated.append(filename)
+    engine.close()
+
+    print(f"\n{'='*60}")
+    print(f"RING DIAGRAM PROCESSING COMPLETED!")
+    print(f"Files generated: {len(generated)}")
+    if cache is not None:
+        print(cache.summary())
+    print(f"{'='*60}")
+
+if __name__ == "__main__":
+    main()
@@ -8,18 +8,19 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
+from snapshot_store import LINK_COLUMNS, load_export
 import warnings
 warnings.filterwarnings('ignore')
 
 def load_project_data(csv_file):
     """Load and process the project relationship data"""
-    df = pd.read_csv(csv_file)
+    df = load_export(csv_file, LINK_COLUMNS)
     
     # Clean up the data
     df['LinkCount'] = pd.to_numeric(df['LinkCount'], errors='coerce').fillna(0)
     
     # Create project summary (group by ProjectKey and sum LinkCount)
-    project_summary = df.groupby('ProjectKey')['LinkCount'].sum().reset_index()
+    project_summary = df.groupby('ProjectKey', observed=True)['LinkCount'].sum().reset_index()
     project_summary = project_summary.sort_values('LinkCount', ascending=False)
     
     print(f"Found {len(project_summary)} unique projects")
@@ -390,6 +391,7 @@ def create_orl_centered_diagram(df, output_file='project_affinity_diagram.png'):
         plt.savefig(output_file, dpi=150, bbox_inches='tight')
     
     plt.show()
+    plt.close()
     
     return G
 
@@ -667,6 +669,7 @@ def create_affinity_diagram(df, output_file='project_affinity_diagram.png'):
         plt.savefig(output_file, dpi=150, bbox_inches='tight')
     
     plt.show()
+    plt.close()
     
     return G
 
@@ -863,6 +866,7 @@ def create_pay_centered_diagram(df, output_file='pay_centered_diagram.png'):
         plt.savefig(output_file, dpi=150, bbox_inches='tight')
     
     plt.show()
+    plt.close()
     
     return G
 
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Simple Links Ingester
+Splits the issue-level Simple Links export into issue links and aggregates them into the project-to-project edge table
+"""
+
+import os
+import csv
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from issue_keys import ISSUE_KEY_PATTERN
+from link_table import link_table
+from snapshot_store import load_export
+from stage_trace import traced
+
+DEFAULT_SIMPLE_LINKS_FILE = '../.endpoints/Issue links/Issue Links - GET Simple Links - Anon - Hybrid.csv'
+DEFAULT_OUTPUT_FILE = 'Project_to_Project_Links_From_Simple_Links.csv'
+
+@traced()
+def issue_links(df):
+    """LinkTable of (issue, linked issue) pairs from the Key / LinkedKeys columns.
+
+    LinkedKeys holds '; '-separated issue keys; a single str.extractall pass
+    splits them and both sides are encoded into integer issue codes against
+    one project dictionary, so no row is touched from Python and no per-link
+    string is kept.
+    """
+    linked = df['LinkedKeys'].astype(str).str.extractall(f'(?P<LinkedIssueKey>{ISSUE_KEY_PATTERN})')
+    rows = linked.index.get_level_values(0)
+    return link_table(df['Key'].loc[rows].to_numpy(dtype=object), linked['LinkedIssueKey'].to_numpy(dtype=object))
+
+@traced()
+def project_links(links, exclude=(), self_links=False):
+    """ProjectKey / ConnectedProject / LinkCount edge table from a LinkTable of issue links.
+
+    Each issue link is counted from the issue that lists it, and both
+    directions of a pair land on one row keyed by the alphabetically ordered
+    projects, like the PowerShell exporters' Group-Object over sorted pairs.
+    Self-links are dropped unless self_links is set; links touching an
+    excluded project are dropped either way.
+    """
+    sources, targets = links.source_projects(), links.target_projects()
+    keep = links.valid()
+    if not self_links:
+        keep &= sources != targets
+    if len(exclude):
+        excluded = np.flatnonzero(pd.Index(links.projects).isin(list(exclude)))
+        keep &= ~(np.isin(sources, excluded) | np.isin(targets, excluded))
+
+    first, second, counts = links.take(keep).project_pairs()
+    edges = pd.DataFrame({
+        'ProjectKey': links.project_names(first),
+        'ConnectedProject': links.project_names(second),
+        'LinkCount': counts,
+    })
+    # Same row order as the exporters' Sort-Object ProjectKey, LinkCount -Descending
+    return edges.sort_values(['ProjectKey', 'LinkCount'], ascending=False, kind='stable', ignore_index=True)
+
+def load_simple_links(csv_file=DEFAULT_SIMPLE_LINKS_FILE):
+    """LinkTable of a Simple Links export (the raw rows come from its typed snapshot)"""
+    return issue_links(load_export(csv_file, ['Key', 'LinkedKeys']))
+
+def main():
+    """Aggregate the Simple Links export into a project-to-project links CSV"""
+    parser = argparse.ArgumentParser(description='Build the project-to-project edge table from the Simple Links export')
+    parser.add_argument('--csv', default=DEFAULT_SIMPLE_LINKS_FILE, help='Simple Links export (Key, LinkedKeys)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_FILE, help='Project-to-project links CSV to write')
+    parser.add_argument('--exclude', nargs='*', default=[], help='Projects to leave out')
+    parser.add_argument('--self-links', action='store_true', help='Keep links within one project')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    links = load_simple_links(args.csv)
+    edges = project_links(links, exclude=args.exclude, self_links=args.self_links)
+    edges.to_csv(args.output, index=False, quoting=csv.QUOTE_ALL)
+    elapsed = time.perf_counter() - start
+
+    cross_project = int(links.cross_project().sum())
+    print(f"{os.path.basename(args.csv)}: {len(links):,} issue links ({cross_project:,} cross-project, "
+          f"{links.nbytes / 1e6:.1f} MB)")
+    print(f"Project relationships: {len(edges):,} pairs, {edges['LinkCount'].sum():,} links, "
+          f"{len(pd.unique(edges[['ProjectKey', 'ConnectedProject']].to_numpy().ravel())):,} projects")
+    print(f"Saved: {args.output} ({elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    main()
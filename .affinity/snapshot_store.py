@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Columnar Snapshot Store for Link Exports
+Converts each CSV export once into a typed, dictionary-encoded snapshot that loaders read by column
+"""
+
+import os
+import sys
+import argparse
+import pandas as pd
+import numpy as np
+from stage_trace import traced
+
+try:
+    import pyarrow  # noqa: F401  (Parquet engine for pandas)
+except ImportError:  # Fall back to pickled frames; projection then happens after the load
+    pyarrow = None
+
+SNAPSHOT_DIR = '.snapshots'
+
+# Columns each loader family actually reads
+LINK_COLUMNS = ['ProjectKey', 'ConnectedProject', 'LinkCount']
+DETAILED_CONNECTION_COLUMNS = ['SourceProject', 'TargetProject', 'TotalLinks']
+
+# Project key columns share one sorted dictionary, so codes agree across columns
+PROJECT_KEY_COLUMNS = ('ProjectKey', 'ConnectedProject', 'SourceProject', 'TargetProject')
+CATEGORY_COLUMNS = ('SourceIssueKey', 'TargetIssueKey', 'LinkDirection', 'SourceStatus')
+COUNT_COLUMNS = ('LinkCount', 'TotalLinks', 'OutboundLinks', 'InboundLinks', 'Id')
+TIMESTAMP_FORMATS = {
+    'SourceUpdated': '%m/%d/%Y %H:%M:%S',
+    'GeneratedAt': '%Y-%m-%d %H:%M:%S',
+}
+
+def snapshot_path(csv_file):
+    """Snapshot file kept in a .snapshots folder beside the export"""
+    folder, name = os.path.split(csv_file)
+    extension = '.parquet' if pyarrow is not None else '.pkl'
+    return os.path.join(folder, SNAPSHOT_DIR, os.path.splitext(name)[0] + extension)
+
+@traced()
+def convert_export(df):
+    """Categorical keys, int32 counts and parsed timestamps for the known export columns"""
+    df = df.copy()
+
+    key_columns = [col for col in PROJECT_KEY_COLUMNS if col in df.columns]
+    if key_columns:
+        projects = sorted(pd.unique(pd.concat([df[col] for col in key_columns]).dropna().astype(str)))
+        for col in key_columns:
+            df[col] = pd.Categorical(df[col].astype(str), categories=projects)
+
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
+    for col in COUNT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(np.int32)
+
+    for col, fmt in TIMESTAMP_FORMATS.items():
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], format=fmt, errors='coerce')
+
+    return df
+
+def write_snapshot(df, snapshot_file):
+    """Write a typed frame with whichever columnar format is available"""
+    os.makedirs(os.path.dirname(snapshot_file) or '.', exist_ok=True)
+    if snapshot_file.endswith('.parquet'):
+        df.to_parquet(snapshot_file, index=False)
+    else:
+        df.to_pickle(snapshot_file)
+
+def read_snapshot(snapshot_file, columns=None):
+    """Read a snapshot, loading only the requested columns when the format allows it"""
+    if snapshot_file.endswith('.parquet'):
+        return pd.read_parquet(snapshot_file, columns=columns)
+    df = pd.read_pickle(snapshot_file)
+    return df if columns is None else df[columns]
+
+def ingest(csv_file, snapshot_file=None):
+    """Convert one CSV export into its typed snapshot and return the frame"""
+    snapshot_file = snapshot_file or snapshot_path(csv_file)
+    df = convert_export(pd.read_csv(csv_file))
+    try:
+        write_snapshot(df, snapshot_file)
+    except OSError as e:
+        print(f"Warning: could not write snapshot {snapshot_file}: {e}")
+    return df
+
+@traced()
+def load_export(csv_file, columns=None):
+    """Typed frame for an export, from its snapshot when that is at least as new as the CSV"""
+    snapshot_file = snapshot_path(csv_file)
+    if os.path.exists(snapshot_file) and os.path.getmtime(snapshot_file) >= os.path.getmtime(csv_file):
+        return read_snapshot(snapshot_file, columns)
+
+    df = ingest(csv_file, snapshot_file)
+    return df if columns is None else df[columns]
+
+def main():
+    """Convert link exports into columnar snapshots"""
+    parser = argparse.ArgumentParser(description='Convert CSV link exports into typed columnar snapshots')
+    parser.add_argument('csv_files', nargs='+', help='CSV exports to convert')
+    args = parser.parse_args()
+
+    if pyarrow is None:
+        print("pyarrow is not installed; writing pickle snapshots instead of Parquet", file=sys.stderr)
+
+    for csv_file in args.csv_files:
+        df = ingest(csv_file)
+        snapshot_file = snapshot_path(csv_file)
+        csv_size = os.path.getsize(csv_file) / 1024
+        snapshot_size = os.path.getsize(snapshot_file) / 1024 if os.path.exists(snapshot_file) else 0
+        print(f"{os.path.basename(csv_file)}: {len(df):,} rows, {csv_size:,.0f} KB -> {snapshot_size:,.0f} KB")
+        print(f"  Snapshot: {snapshot_file}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Stage Timing and Memory Trace
+Records nested pipeline spans with wall time and peak memory, written as a Chrome trace next to the outputs
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import cProfile
+import threading
+import functools
+import tracemalloc
+import multiprocessing
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; spans then carry no peak RSS
+    resource = None
+
+# AFFINITY_TRACE=1 writes <script>_trace.json in the working directory (any other value is the trace path);
+# AFFINITY_TRACE_MALLOC=1 adds tracemalloc peaks per span; AFFINITY_PROFILE=1 (or a path) dumps cProfile stats
+TRACE_ENV = 'AFFINITY_TRACE'
+MALLOC_ENV = 'AFFINITY_TRACE_MALLOC'
+PROFILE_ENV = 'AFFINITY_PROFILE'
+
+# Library calls that get their own span while tracing: (module, attribute path, span name)
+LIBRARY_STAGES = (
+    ('pandas', 'read_csv', 'pd.read_csv'),
+    ('networkx', 'draw_networkx_edges', 'nx.draw_networkx_edges'),
+    ('networkx', 'draw_networkx_nodes', 'nx.draw_networkx_nodes'),
+    ('networkx', 'draw_networkx_labels', 'nx.draw_networkx_labels'),
+    ('seaborn', 'heatmap', 'sns.heatmap'),
+    ('matplotlib.figure', 'Figure.savefig', 'savefig'),
+)
+
+_tracer = None
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB (None where resource is unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+class Tracer:
+    """Collects complete ("X") trace events for nested spans"""
+
+    def __init__(self, trace_malloc=False):
+        self.trace_malloc = trace_malloc
+        self.origin = time.perf_counter_ns()
+        self.events = []
+        self.stack = []
+        if trace_malloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def span(self, name, **args):
+        """Time the enclosed block; args are attached to the trace event"""
+        frame = {'peak': 0}
+        if self.trace_malloc:
+            # Each span resets the tracemalloc peak, so hand the peak so far to the enclosing span first
+            current, peak = tracemalloc.get_traced_memory()
+            if self.stack:
+                self.stack[-1]['peak'] = max(self.stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame['peak'] = current
+        self.stack.append(frame)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self.stack.pop()
+            rss = peak_rss_kb()
+            if rss is not None:
+                args['peak_rss_kb'] = rss
+            if self.trace_malloc:
+                peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                if self.stack:
+                    self.stack[-1]['peak'] = max(self.stack[-1]['peak'], peak)
+                args['peak_traced_kb'] = peak // 1024
+            self.events.append({
+                'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                'ts': (start - self.origin) / 1000, 'dur': (end - start) / 1000,
+                'args': {key: str(value) if not isinstance(value, (int, float)) else value
+                         for key, value in args.items()},
+            })
+
+    def trace(self, run_name):
+        """Chrome trace document (chrome://tracing, Perfetto) with one run-wide span around the stages"""
+        run = {'name': run_name, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(), 'ts': 0,
+               'dur': (time.perf_counter_ns() - self.origin) / 1000, 'args': {}}
+        rss = peak_rss_kb()
+        if rss is not None:
+            run['args']['peak_rss_kb'] = rss
+        metadata = {'name': 'process_name', 'ph': 'M', 'pid': os.getpid(), 'args': {'name': run_name}}
+        return {'traceEvents': [metadata, run] + self.events, 'displayTimeUnit': 'ms'}
+
+    def totals(self):
+        """(name, calls, total ms) per span name, slowest first"""
+        totals = {}
+        for event in self.events:
+            calls, duration = totals.get(event['name'], (0, 0.0))
+            totals[event['name']] = (calls + 1, duration + event['dur'] / 1000)
+        return sorted(((name, calls, ms) for name, (calls, ms) in totals.items()), key=lambda x: x[2], reverse=True)
+
+def span(name, **args):
+    """Context manager timing a stage when tracing is enabled (free otherwise)"""
+    return _tracer.span(name, **args) if _tracer is not None else nullcontext()
+
+def traced(name=None):
+    """Decorator running every call of a function inside a span"""
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def instrument_libraries():
+    """Wrap the expensive pandas/networkx/seaborn/matplotlib calls in spans (already imported modules only)"""
+    for module_name, attribute, span_name in LIBRARY_STAGES:
+        owner = sys.modules.get(module_name)
+        if owner is None:
+            continue
+        *parents, leaf = attribute.split('.')
+        for parent in parents:
+            owner = getattr(owner, parent)
+        func = getattr(owner, leaf)
+        if not getattr(func, '_stage_traced', False):
+            wrapper = traced(span_name)(func)
+            wrapper._stage_traced = True
+            setattr(owner, leaf, wrapper)
+
+def script_name():
+    """Name of the running entry point, used for the default trace and profile files"""
+    return os.path.splitext(os.path.basename(sys.argv[0] or ''))[0] or 'affinity'
+
+def enable(trace_file=None, trace_malloc=False, profile_file=None):
+    """Start tracing this process; the trace (and profile) are written when it exits"""
+    global _tracer
+    if _tracer is not None:
+        return _tracer
+    _tracer = Tracer(trace_malloc)
+    instrument_libraries()
+    trace_file = trace_file or f'{script_name()}_trace.json'
+
+    profiler = None
+    if profile_file:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    def finish():
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_file)
+            print(f"Profile saved: {profile_file}")
+        write_trace(trace_file)
+
+    atexit.register(finish)
+    return _tracer
+
+def write_trace(trace_file):
+    """Write the Chrome trace and print the slowest stages"""
+    if _tracer is None:
+        return
+    with open(trace_file, 'w', encoding='utf-8') as f:
+        json.dump(_tracer.trace(script_name()), f)
+
+    print(f"\nStage trace saved: {trace_file}")
+    for name, calls, ms in _tracer.totals()[:10]:
+        print(f"  {name:32s} {calls:5d} calls {ms:10.1f} ms")
+    rss = peak_rss_kb()
+    if rss is not None:
+        print(f"  Peak RSS: {rss / 1024:.1f} MB")
+
+def enable_from_environment():
+    """Turn tracing on when AFFINITY_TRACE or AFFINITY_PROFILE is set (in the main process only)"""
+    trace = os.environ.get(TRACE_ENV, '').strip()
+    profile = os.environ.get(PROFILE_ENV, '').strip()
+    trace, profile = (value if value != '0' else '' for value in (trace, profile))
+    if not (trace or profile) or multiprocessing.parent_process() is not None:
+        return
+    enable(trace_file=trace if trace not in ('', '1') else None,
+           trace_malloc=os.environ.get(MALLOC_ENV, '') not in ('', '0'),
+           profile_file=(f'{script_name()}.prof' if profile == '1' else profile) or None)
+
+enable_from_environment()